@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - Android TV ADB session
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       android.py - Persistent ppadb session for one Google Android TV
+#
+#       2026-10-18 - One session per TV with batched dumpsys power probe.
+#
+# ==============================================================================
+
+"""
+    GoogleAndroidTV().getPower() ran up to three `dumpsys` shell commands in
+    a row, each preceded by an `echo 1` health check. AdbSession() sends all
+    three in one shell command:
+
+        dumpsys input | grep -i screenOn ; echo --homa-- ;
+        dumpsys power | grep -i 'Display Power' ; echo --homa-- ;
+        dumpsys display | grep -i mScreenState
+
+    The reply is split on the separator and cached for a short time so power
+    checks from several threads within the same second share one round trip.
+
+    A shell command that succeeded recently proves the connection is alive,
+    so `echo 1` is only sent when the session has been idle.
+"""
+
+import threading  # WorkerPool() threads share one session per TV
+import time  # Health check and probe cache times
+
+from ppadb.client import Client as AdbClient  # Talks to adb server
+
+PORT = 5555  # adbd TCP port on Android TV
+SERVER_HOST = "127.0.0.1"  # adb server started by `adb devices -l`
+SERVER_PORT = 5037
+HEALTH_TIME = 10.0  # Seconds a successful shell command vouches for session
+
+SEPARATOR = "--homa--"
+PROBES = [  # (key, dumpsys command) in the order getPower() tests them
+    ("input", "dumpsys input | grep -i screenOn"),
+    ("power", "dumpsys power | grep -i 'Display Power'"),
+    ("display", "dumpsys display | grep -i mScreenState"),
+]
+PROBE_COMMAND = (" ; echo " + SEPARATOR + " ; ").join(
+    [command for _key, command in PROBES])
+
+
+class AdbError(Exception):
+    """ Android TV not connected or shell command failed """
+    pass
+
+
+class AdbSession(object):
+    """ ppadb device for one Android TV kept between commands.
+
+        ip and ports are arguments so a local adb server stub can be used.
+    """
+
+    def __init__(self, ip, port=PORT, server_host=SERVER_HOST,
+                 server_port=SERVER_PORT):
+        self.ip = ip
+        self.port = port
+        self.serial = ip + ":" + str(port)  # 192.168.0.17:5555
+        self.client = AdbClient(host=server_host, port=server_port)
+        self.dev = None  # ppadb Device when connected
+        self.last_ok = 0.0  # Time of last successful shell command
+        self.cache = None  # Last probe() result
+        self.cache_time = 0.0  # Time of last probe() result
+        self.lock = threading.Lock()  # Protect self.dev and self.last_ok
+        self.probe_lock = threading.Lock()  # One probe() at a time
+
+    def attach(self, device):
+        """ Use ppadb device found by caller. Health checked on next use. """
+        with self.lock:
+            self.dev = device
+            self.last_ok = 0.0
+
+    def detach(self):
+        """ Forget device after an error. Next use finds or connects again. """
+        with self.lock:
+            self.dev = None
+            self.last_ok = 0.0
+        self.invalidate()
+
+    def invalidate(self):
+        """ Discard cached probe() after sending a key event """
+        self.cache = None
+
+    def find(self, connect=True):
+        """ Return ppadb device for self.serial from the adb server.
+            When missing, ask adb server to connect ("adb connect <ip>").
+        """
+        try:
+            device = self.client.device(self.serial)
+            if device is None and connect:
+                self.client.remote_connect(self.ip, self.port)
+                device = self.client.device(self.serial)
+        except Exception:  # ppadb raises RuntimeError when server not running
+            return None
+        return device
+
+    def device(self, timeout=2.0):
+        """ Return healthy ppadb device or None.
+            `echo 1` only when no command succeeded in HEALTH_TIME seconds.
+        """
+        with self.lock:
+            device = self.dev
+            fresh = time.time() - self.last_ok < HEALTH_TIME
+        if device is not None and fresh:
+            return device
+
+        if device is None:
+            device = self.find()
+            if device is None:
+                return None
+            self.attach(device)
+
+        try:
+            self.shell("echo 1", timeout)
+        except AdbError:
+            return None
+        return device
+
+    def shell(self, command, timeout):
+        """ Run shell command on TV and return output string.
+            Raises AdbError and forgets device when command fails.
+        """
+        with self.lock:
+            device = self.dev
+        if device is None:
+            device = self.find()
+            if device is None:
+                raise AdbError("Not connected to: " + self.serial)
+            self.attach(device)
+
+        try:
+            reply = device.shell(command, timeout=timeout)
+        except Exception as err:  # socket.timeout, RuntimeError, etc.
+            self.detach()
+            raise AdbError(str(err) + ": " + self.serial)
+
+        with self.lock:
+            self.last_ok = time.time()
+        return reply
+
+    def probe(self, timeout, ttl):
+        """ Return {"input": str, "power": str, "display": str} grep results.
+            Reuse result less than ttl seconds old. Threads calling at the
+            same time wait for one shell command instead of sending three.
+        """
+        with self.probe_lock:
+            cache = self.cache
+            if cache is not None and time.time() - self.cache_time < ttl:
+                return cache
+
+            parts = self.shell(PROBE_COMMAND, timeout).split(SEPARATOR)
+            result = {}
+            for i, (key, _command) in enumerate(PROBES):
+                result[key] = parts[i].strip() if i < len(parts) else ""
+            self.cache = result
+            self.cache_time = time.time()
+            return result
+
+
+# End of android.py
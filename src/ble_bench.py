@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - LED light backend latency benchmark
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+from __future__ import division  # integer division results in float
+
+# ==============================================================================
+#
+#       ble_bench.py - Compare gatttool and BGAPI backends writing LED colors
+#
+#       2026-10-18 - Same write sequence through both pygatt backends.
+#
+# ==============================================================================
+
+"""
+    Measures what HomA pays on the computer for each LED light color write.
+    No Bluetooth hardware is needed:
+
+        gatttool - A stand-in `gatttool` script first in PATH answers the
+                   interactive prompt through pexpect like BlueZ does.
+        bgapi    - A stand-in BLED112 answers BGAPI packets on a pseudo
+                   terminal opened with pyserial like the USB dongle is.
+
+    Both get the same sequence of trionesControl setRGB() payloads as write
+    commands (no response) and write requests (acknowledged).
+
+        python ble_bench.py            # 500 writes each
+        python ble_bench.py -n 2000    # 2000 writes each
+
+    Wall milliseconds are the caller's wait per write. CPU milliseconds per
+    write include the backend's receiver thread parsing replies.
+"""
+
+import argparse  # --count
+import os  # Pseudo terminal, PATH, stand-in gatttool script
+import pty  # Stand-in BLED112 serial port
+import shutil  # Remove stand-in gatttool directory
+import stat  # Make stand-in gatttool executable
+import struct  # BGAPI packets
+import sys
+import tempfile  # Stand-in gatttool directory
+import threading  # Stand-in BLED112 responder
+import time  # Latency
+
+import pygatt  # Vendored pygatt with both backends
+
+MAC = "11:22:33:44:55:66"
+HANDLE = 0x0007  # LED light strip color characteristic value handle
+
+GATTTOOL = r'''#!/usr/bin/env python
+import sys
+mac = ""
+sys.stdout.write("[LE]> ")
+sys.stdout.flush()
+for line in iter(sys.stdin.readline, ""):
+    words = line.split()
+    cmd = words[0] if words else ""
+    if cmd == "exit":
+        break
+    if cmd == "connect":
+        mac = words[1]
+        sys.stdout.write("Attempting to connect to " + mac +
+                         "\r\nConnection successful\r\n")
+    elif cmd == "char-write-req":
+        sys.stdout.write("Characteristic value was written successfully\r\n")
+    sys.stdout.write("[" + mac + "][LE]> " if mac else "[LE]> ")
+    sys.stdout.flush()
+'''
+
+
+class StandInBled112(threading.Thread):
+    """ Answer BGAPI commands on the master side of a pseudo terminal.
+        self.port is the slave side passed to BGAPIBackend(serial_port=).
+    """
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.master, slave = pty.openpty()
+        self.port = os.ttyname(slave)
+        self.slave = slave  # Keep open so master reads don't fail
+
+    @staticmethod
+    def packet(event, cid, cmd, payload):
+        return struct.pack("<BBBB", 0x80 if event else 0x00, len(payload),
+                           cid, cmd) + payload
+
+    def reply(self, cid, cmd, payload):
+        """ Return response and events for one command packet """
+        ok = struct.pack("<BH", 0, 0)  # connection handle, result
+        if (cid, cmd) == (6, 3):  # gap_connect_direct
+            address = bytearray(reversed(bytearray.fromhex(MAC.replace(":", ""))))
+            status = struct.pack("<BB6BBHHHB", 0, 0x05, *(list(address) +
+                                                         [0, 60, 100, 0, 0xFF]))
+            return self.packet(False, 6, 3, struct.pack("<HB", 0, 0)) + \
+                self.packet(True, 3, 0, status)
+        if (cid, cmd) == (4, 5):  # attclient_attribute_write
+            done = struct.pack("<BHH", 0, 0, HANDLE)
+            return self.packet(False, 4, 5, ok) + self.packet(True, 4, 1, done)
+        if (cid, cmd) == (3, 0):  # connection_disconnect
+            return self.packet(False, 3, 0, ok) + self.packet(True, 3, 4, ok)
+        return self.packet(False, cid, cmd, ok)  # result 0 is first field
+
+    def run(self):
+        buffer = b""
+        while True:
+            try:
+                buffer += os.read(self.master, 4096)
+            except OSError:
+                return  # Closed
+            while len(buffer) >= 4:
+                length = 4 + ((bytearray(buffer)[0] & 0x07) << 8) + bytearray(buffer)[1]
+                if len(buffer) < length:
+                    break
+                cid, cmd = bytearray(buffer[2:4])
+                buffer = buffer[length:]
+                os.write(self.master, self.reply(cid, cmd, b""))
+
+    def close(self):
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def payloads(count):
+    """ Same color sequence for both backends. trionesControl.setRGB() bytes. """
+    colors = []
+    for i in range(count):
+        level = i % 256
+        colors.append(bytearray([0x56, level, 255 - level, 0, 0x00, 0xF0, 0xAA]))
+    return colors
+
+
+def measure(device, colors, wait_for_response):
+    """ Write all colors. Return (wall ms list, cpu ms per write). """
+    walls = []
+    cpu_start = time.process_time() if hasattr(time, "process_time") else time.clock()
+    for value in colors:
+        start = time.time()
+        device.char_write_handle(HANDLE, value, wait_for_response=wait_for_response)
+        walls.append((time.time() - start) * 1000.0)
+    time.sleep(0.2)  # Let receiver thread parse what is still arriving
+    cpu_end = time.process_time() if hasattr(time, "process_time") else time.clock()
+    return walls, (cpu_end - cpu_start) * 1000.0 / len(colors)
+
+
+def report(name, mode, walls, cpu_ms):
+    walls = sorted(walls)
+    mean = sum(walls) / len(walls)
+    p95 = walls[int(len(walls) * 0.95) - 1]
+    print("{0:<9} {1:<8} {2:>9.3f} {3:>9.3f} {4:>9.3f} {5:>9.3f}".format(
+        name, mode, mean, walls[len(walls) // 2], p95, cpu_ms))
+
+
+def benchGatttool(colors):
+    """ GATTToolBackend with stand-in gatttool first in PATH """
+    folder = tempfile.mkdtemp(prefix="ble_bench")
+    script = os.path.join(folder, "gatttool")
+    with open(script, "w") as f:
+        f.write(GATTTOOL.replace("#!/usr/bin/env python", "#!" + sys.executable, 1))
+    os.chmod(script, os.stat(script).st_mode | stat.S_IEXEC)
+    old_path = os.environ.get("PATH", "")
+    os.environ["PATH"] = folder + os.pathsep + old_path
+    adapter = pygatt.GATTToolBackend()
+    try:
+        adapter.start(reset_on_start=False)
+        device = adapter.connect(MAC)
+        for mode, wait in (("command", False), ("request", True)):
+            walls, cpu_ms = measure(device, colors, wait)
+            report("gatttool", mode, walls, cpu_ms)
+    finally:
+        adapter.stop()
+        os.environ["PATH"] = old_path
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def benchBgapi(colors):
+    """ BGAPIBackend with stand-in BLED112 on a pseudo terminal """
+    dongle = StandInBled112()
+    dongle.start()
+    adapter = pygatt.BGAPIBackend(serial_port=dongle.port)
+    try:
+        adapter.start(reset=False)
+        device = adapter.connect(MAC)
+        for mode, wait in (("command", False), ("request", True)):
+            walls, cpu_ms = measure(device, colors, wait)
+            report("bgapi", mode, walls, cpu_ms)
+    finally:
+        adapter.stop()
+        dongle.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare gatttool and BGAPI backends writing LED colors")
+    parser.add_argument("-n", "--count", type=int, default=500,
+                        help="Color writes per backend and mode")
+    args = parser.parse_args()
+    colors = payloads(args.count)
+    print("{0:<9} {1:<8} {2:>9} {3:>9} {4:>9} {5:>9}".format(
+        "backend", "write", "mean ms", "p50 ms", "p95 ms", "cpu ms"))
+    benchGatttool(colors)
+    benchBgapi(colors)
+
+
+if __name__ == "__main__":
+    main()
+
+# End of ble_bench.py
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - Sony Bravia REST API client
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       bravia.py - Sony Bravia REST API (JSON-RPC over HTTP) client
+#
+#       2026-10-18 - Keep-alive HTTP/1.1 connections replace `timeout curl`.
+#       2026-10-18 - NotificationSocket() for pushed power and volume changes.
+#
+# ==============================================================================
+
+"""
+    Every request is a POST to http://<ip>/sony/<subsystem> with headers:
+
+        Content-Type: application/json; charset=UTF-8
+        X-Auth-PSK: <GLO['SONY_PWD']>
+
+    The TV keeps the connection open so the next request skips the TCP
+    handshake. Connections are pooled by host so WorkerPool() threads can
+    make requests to the same TV at the same time.
+
+    Notifications use a WebSocket to ws://<ip>/sony/<service>. After
+    "switchNotifications" enables them the TV pushes messages such as:
+
+        {"method": "notifyPowerStatus", "params": [{"status": "standby"}],
+         "version": "1.0"}
+        {"method": "notifyVolumeInformation", "params": [{"target": "speaker",
+         "volume": 28, "mute": false}], "version": "1.0"}
+"""
+
+import base64  # WebSocket handshake key
+import hashlib  # WebSocket handshake accept
+import json  # switchNotifications and pushed notifications
+import os  # os.urandom() for WebSocket key and masks
+import socket  # Timeouts and connection errors
+import struct  # WebSocket frame lengths
+import threading  # Pool shared by WorkerPool() threads
+import time  # NotificationSocket.subscribe() deadline
+
+try:  # Python 3
+    import http.client as httplib
+except ImportError:  # Python 2
+    import httplib
+
+PORT = 80  # Sony Bravia REST API port
+TIMEOUT = 0.2  # Same as GLO['CURL_TIME'] default
+PING_SECONDS = 10.0  # NotificationSocket.keepAlive() ping interval
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"  # RFC 6455
+
+# Error codes match `timeout curl` return codes so callers don't change
+TIMED_OUT = 124  # `timeout` killed curl
+CONNECT_FAILED = 7  # curl: Failed to connect to host
+
+
+class BraviaError(Exception):
+    """ TV didn't reply. self.code is TIMED_OUT or CONNECT_FAILED """
+
+    def __init__(self, code, message):
+        Exception.__init__(self, message)
+        self.code = code
+
+
+class Connection(httplib.HTTPConnection):
+    """ HTTPConnection without Nagle delay. Headers and body are sent in
+        separate packets which otherwise wait 40 ms for a delayed ACK.
+    """
+
+    def connect(self):
+        httplib.HTTPConnection.connect(self)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class BraviaClient(object):
+    """ Pool of persistent HTTP/1.1 connections to Sony Bravia TVs.
+
+        port is an argument so a local stub HTTP server can be used.
+    """
+
+    def __init__(self, port=PORT):
+        self.port = port
+        self.idle = {}  # {host: [Connection, ...]} not in use
+        self.lock = threading.Lock()  # Protect self.idle
+
+    def getConnection(self, host, timeout):
+        """ Return idle connection to host or a new one """
+        with self.lock:
+            connections = self.idle.get(host, [])
+            conn = connections.pop() if connections else None
+        if conn is None:
+            return Connection(host, self.port, timeout=timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def putConnection(self, host, conn):
+        """ Return connection to pool for next request """
+        with self.lock:
+            self.idle.setdefault(host, []).append(conn)
+
+    def post(self, host, subsystem, JSON_str, psk, timeout=TIMEOUT):
+        """ POST JSON_str to http://host/sony/subsystem.
+            Return reply body as string. HTTP errors like 403 also have a
+            JSON body: {"error": [403, "Forbidden"], "id": 55}
+
+            Raises BraviaError when TV can't be reached or doesn't reply.
+        """
+        headers = {"Content-Type": "application/json; charset=UTF-8",
+                   "X-Auth-PSK": psk, "Connection": "keep-alive"}
+        body = JSON_str.encode("utf-8")
+        conn, reused = self.getConnection(host, timeout)
+        try:
+            try:
+                reply = self.exchange(conn, subsystem, body, headers)
+            except socket.timeout:
+                raise  # TV is off line, don't wait twice
+            except (socket.error, httplib.HTTPException):
+                if not reused:
+                    raise
+                # TV closed the kept open connection. Try once on new one
+                conn.close()
+                conn = Connection(host, self.port, timeout=timeout)
+                reply = self.exchange(conn, subsystem, body, headers)
+        except socket.timeout:
+            conn.close()
+            raise BraviaError(TIMED_OUT, "Timeout after " + str(timeout) +
+                              " seconds: " + host)
+        except (socket.error, httplib.HTTPException) as err:
+            conn.close()
+            raise BraviaError(CONNECT_FAILED, str(err) + ": " + host)
+
+        self.putConnection(host, conn)
+        return reply
+
+    @staticmethod
+    def exchange(conn, subsystem, body, headers):
+        """ Send one request on conn and read the whole reply """
+        conn.request("POST", "/sony/" + subsystem, body, headers)
+        response = conn.getresponse()
+        reply = response.read()
+        if response.getheader("connection", "").lower() == "close":
+            conn.close()  # Next request reconnects automatically
+        return reply.decode("utf-8")
+
+    def close(self):
+        """ Close all idle connections. E.G. before system suspend. """
+        with self.lock:
+            for connections in self.idle.values():
+                for conn in connections:
+                    conn.close()
+            self.idle = {}
+
+
+class NotificationSocket(object):
+    """ WebSocket to ws://host/sony/service receiving pushed notifications.
+
+        sock = NotificationSocket(ip, "system", psk, port)
+        sock.subscribe(["notifyPowerStatus"])  # Returns names TV enabled
+        message = sock.receive(1.0)  # None when nothing pushed in 1 second
+        sock.keepAlive(PING_SECONDS)  # Call often. Detects silent drops.
+
+        fileno() allows select.select() on several services at once.
+        Raises BraviaError when the TV can't be reached or closes socket.
+    """
+
+    def __init__(self, host, service, psk, port=PORT, timeout=TIMEOUT):
+        self.host = host
+        self.service = service
+        self.buffer = b""  # Bytes received but not yet a whole frame
+        self.fragments = b""  # Text of a fragmented message
+        self.next_id = 1  # JSON-RPC id for self.subscribe()
+        self.receive_time = self.ping_time = time.time()  # self.keepAlive()
+        try:
+            self.sock = socket.create_connection((host, port), timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.handshake(psk, port, timeout)
+        except socket.timeout:
+            raise BraviaError(TIMED_OUT, "Timeout after " + str(timeout) +
+                              " seconds: " + host)
+        except socket.error as err:
+            raise BraviaError(CONNECT_FAILED, str(err) + ": " + host)
+
+    def handshake(self, psk, port, timeout):
+        """ HTTP/1.1 Upgrade to WebSocket. TV must reply 101. """
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        request = "GET /sony/" + self.service + " HTTP/1.1\r\n" + \
+                  "Host: " + self.host + ":" + str(port) + "\r\n" + \
+                  "Upgrade: websocket\r\nConnection: Upgrade\r\n" + \
+                  "Sec-WebSocket-Key: " + key + "\r\n" + \
+                  "Sec-WebSocket-Version: 13\r\n" + \
+                  "X-Auth-PSK: " + psk + "\r\n\r\n"
+        self.sock.settimeout(timeout)
+        self.sock.sendall(request.encode("ascii"))
+        while b"\r\n\r\n" not in self.buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise BraviaError(CONNECT_FAILED, "Closed during WebSocket " +
+                                  "handshake: " + self.host)
+            self.buffer += chunk
+        header, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+        lines = header.split(b"\r\n")
+        status = lines[0].split()
+        if len(status) < 2 or status[1] != b"101":
+            raise BraviaError(CONNECT_FAILED, "WebSocket not supported on /sony/" +
+                              self.service + ": " + self.host)
+        fields = {}  # Lower case header name: value
+        for line in lines[1:]:
+            name, _sep, value = line.decode("latin-1").partition(":")
+            fields[name.strip().lower()] = value.strip()
+        accept = base64.b64encode(hashlib.sha1(
+            (key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        if fields.get("sec-websocket-accept") != accept:
+            raise BraviaError(CONNECT_FAILED, "Bad Sec-WebSocket-Accept on /sony/" +
+                              self.service + ": " + self.host)
+
+    def fileno(self):
+        """ For select.select() """
+        return self.sock.fileno()
+
+    def close(self):
+        """ Close WebSocket without close handshake """
+        try:
+            self.sock.close()
+        except socket.error:
+            pass
+
+    def send(self, message, opcode=0x1):
+        """ Send dictionary as masked text frame (clients must mask) """
+        data = json.dumps(message).encode("utf-8") if opcode == 0x1 else message
+        header = bytearray([0x80 | opcode])
+        if len(data) < 126:
+            header.append(0x80 | len(data))
+        elif len(data) < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack(">H", len(data))
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack(">Q", len(data))
+        mask = bytearray(os.urandom(4))
+        masked = bytearray(data)
+        for i in range(len(masked)):
+            masked[i] ^= mask[i % 4]
+        try:
+            self.sock.sendall(bytes(header + mask + masked))
+        except socket.error as err:
+            raise BraviaError(CONNECT_FAILED, str(err) + ": " + self.host)
+
+    def frame(self):
+        """ Remove one whole frame from self.buffer.
+            :returns: (opcode, fin, payload) or None when more bytes needed
+        """
+        if len(self.buffer) < 2:
+            return None
+        first, second = bytearray(self.buffer[:2])
+        length = second & 0x7F
+        offset = 2
+        if length == 126:
+            if len(self.buffer) < 4:
+                return None
+            length = struct.unpack(">H", self.buffer[2:4])[0]
+            offset = 4
+        elif length == 127:
+            if len(self.buffer) < 10:
+                return None
+            length = struct.unpack(">Q", self.buffer[2:10])[0]
+            offset = 10
+        mask = None
+        if second & 0x80:  # Servers shouldn't mask but allow it
+            mask = bytearray(self.buffer[offset:offset + 4])
+            offset += 4
+        if len(self.buffer) < offset + length:
+            return None
+        payload = bytearray(self.buffer[offset:offset + length])
+        self.buffer = self.buffer[offset + length:]
+        if mask:
+            for i in range(len(payload)):
+                payload[i] ^= mask[i % 4]
+        return first & 0x0F, bool(first & 0x80), bytes(payload)
+
+    def receive(self, timeout):
+        """ Return next message dictionary or None after timeout seconds """
+        deadline = time.time() + timeout
+        while True:
+            frame = self.frame()
+            if frame is not None:
+                opcode, fin, payload = frame
+                if opcode == 0x8:  # Close
+                    raise BraviaError(CONNECT_FAILED, "WebSocket closed by TV: " +
+                                      self.host)
+                if opcode == 0x9:  # Ping
+                    self.send(payload, opcode=0xA)  # Pong
+                    continue
+                if opcode not in (0x0, 0x1):
+                    continue  # Pong or binary
+                self.fragments += payload
+                if not fin:
+                    continue  # More fragments to come
+                text, self.fragments = self.fragments, b""
+                try:
+                    return json.loads(text.decode("utf-8"))
+                except ValueError:
+                    continue  # Not JSON, ignore it
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            self.sock.settimeout(remaining)
+            try:
+                chunk = self.sock.recv(4096)
+            except socket.timeout:
+                return None
+            except socket.error as err:
+                raise BraviaError(CONNECT_FAILED, str(err) + ": " + self.host)
+            if not chunk:
+                raise BraviaError(CONNECT_FAILED, "WebSocket closed by TV: " +
+                                  self.host)
+            self.receive_time = time.time()
+            self.buffer += chunk
+
+    def keepAlive(self, interval):
+        """ Send a ping every interval seconds. A socket dropped without a
+            close frame, E.G. TV unplugged, would otherwise wait forever.
+            Raises BraviaError when nothing, not even a pong, was received
+            since the last ping.
+        """
+        now = time.time()
+        if now - self.ping_time < interval:
+            return
+        if self.ping_time > self.receive_time:
+            raise BraviaError(TIMED_OUT, "No WebSocket pong after " +
+                              str(interval) + " seconds: " + self.host)
+        self.ping_time = now
+        self.send(b"HomA", opcode=0x9)
+
+    def subscribe(self, names, timeout=TIMEOUT * 10):
+        """ Enable notifications with switchNotifications.
+            Notifications pushed before the reply arrives are discarded.
+            :returns: list of names the TV enabled. Empty when not supported.
+        """
+        rid = self.next_id
+        self.next_id += 1
+        enabled = [{"name": name, "version": "1.0"} for name in names]
+        self.send({"method": "switchNotifications", "id": rid, "version": "1.0",
+                   "params": [{"enabled": enabled, "disabled": []}]})
+        deadline = time.time() + timeout
+        while True:
+            message = self.receive(max(deadline - time.time(), 0.0))
+            if message is None:
+                return []  # No reply. Old model without notifications.
+            if message.get("id") != rid:
+                continue  # Notification, not the reply
+            try:
+                result = message["result"][0]["enabled"]
+            except (KeyError, IndexError, TypeError):
+                return []  # {"error": [12, "No Such Method"], "id": 1}
+            return [entry.get("name") for entry in result if entry.get("name") in names]
+
+
+# End of bravia.py
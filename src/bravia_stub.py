@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - bravia.py checks against a stub Sony TV
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       bravia_stub.py - Check bravia.py without a Sony TV
+#
+#       2026-10-18 - BraviaClient() keep-alive, retry and error codes.
+#       2026-10-18 - NotificationSocket() handshake, notifications and pings.
+#
+# ==============================================================================
+
+"""
+    Starts a stub Sony Bravia REST API server on 127.0.0.1 and runs
+    bravia.BraviaClient() against it. Then a stub WebSocket server for
+    bravia.NotificationSocket():
+
+        python bravia_stub.py       # Prints each check. Exit code 1 on failure
+
+    The stub answers getPowerStatus like a KDL TV that is on. Requests
+    without the right X-Auth-PSK get the same 403 JSON body the TV sends.
+    The WebSocket stub enables notifications, pushes notifyPowerStatus and
+    answers pings unless told not to.
+"""
+
+import base64  # WebSocket accept
+import hashlib  # WebSocket accept
+import json  # REST API bodies
+import socket  # Unused port for connect error. WebSocket stub.
+import struct  # WebSocket frame lengths
+import sys
+import threading  # Stub server thread
+import time  # Stub TV slow to reply
+
+try:  # Python 3
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+import bravia
+
+PSK = "0000"  # GLO['SONY_PWD'] the stub TV accepts
+POWER_JSON = '{"method": "getPowerStatus", "id": 50, "params": [], "version": "1.0"}'
+
+failures = []  # Names of checks that failed
+
+
+def check(name, ok, detail=""):
+    """ Print check result and remember failures """
+    print("PASS" if ok else "FAIL", name, detail)
+    if not ok:
+        failures.append(name)
+
+
+class StubTV(BaseHTTPRequestHandler):
+    """ POST /sony/<subsystem> handler. server.stub holds test settings. """
+
+    protocol_version = "HTTP/1.1"  # Keep connections open like the TV
+
+    def do_POST(self):
+        stub = self.server.stub
+        stub["clients"].add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(stub["delay"])
+        if self.headers.get("X-Auth-PSK") != PSK:
+            code, reply = 403, {"error": [403, "Forbidden"], "id": body["id"]}
+        else:
+            code, reply = 200, {"result": [{"status": "active"}], "id": body["id"]}
+        data = json.dumps(reply).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        if stub["drop"]:  # TV forgets kept open connection without telling
+            self.close_connection = True
+
+    def log_message(self, *_args):
+        pass  # Quiet
+
+
+class StubServer(HTTPServer):
+    """ HTTPServer without traceback when client stops waiting on purpose """
+
+    def handle_error(self, request, client_address):
+        pass  # Broken pipe after "timeout" check
+
+
+def startStub():
+    """ Return StubServer() running in daemon thread on a free port """
+    server = StubServer(("127.0.0.1", 0), StubTV)
+    server.stub = {"clients": set(), "delay": 0.0, "drop": False}
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def unusedPort():
+    """ Port nothing listens on """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def checkClient():
+    """ BraviaClient() against stub TV """
+    server = startStub()
+    stub = server.stub
+    client = bravia.BraviaClient(server.server_address[1])
+
+    replies = [client.post("127.0.0.1", "system", POWER_JSON, PSK, 1.0)
+               for _i in range(20)]
+    check("post reply", json.loads(replies[-1])["result"][0]["status"] == "active")
+    check("keep-alive", len(stub["clients"]) == 1,
+          str(len(stub["clients"])) + " connections for 20 requests")
+
+    reply = json.loads(client.post("127.0.0.1", "system", POWER_JSON, "bad", 1.0))
+    check("403 body", reply.get("error") == [403, "Forbidden"], str(reply))
+
+    stub["drop"] = True
+    stub["clients"] = set()
+    try:
+        for _i in range(3):
+            client.post("127.0.0.1", "system", POWER_JSON, PSK, 1.0)
+        check("retry closed connection", len(stub["clients"]) == 3)
+    except bravia.BraviaError as err:
+        check("retry closed connection", False, str(err))
+    stub["drop"] = False
+
+    stub["delay"] = 0.5
+    try:
+        client.post("127.0.0.1", "system", POWER_JSON, PSK, 0.1)
+        check("timeout", False, "No error")
+    except bravia.BraviaError as err:
+        check("timeout", err.code == bravia.TIMED_OUT, str(err))
+    stub["delay"] = 0.0
+
+    try:
+        bravia.BraviaClient(unusedPort()).post("127.0.0.1", "system",
+                                               POWER_JSON, PSK, 1.0)
+        check("connect failed", False, "No error")
+    except bravia.BraviaError as err:
+        check("connect failed", err.code == bravia.CONNECT_FAILED, str(err))
+
+    client.close()
+    server.shutdown()
+
+
+def recvExact(conn, size):
+    """ Return size bytes from conn or None when closed """
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def readFrame(conn):
+    """ Return (opcode, payload) of masked client frame or None when closed """
+    header = recvExact(conn, 2)
+    if header is None:
+        return None
+    first, second = bytearray(header)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", recvExact(conn, 2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", recvExact(conn, 8))[0]
+    mask = bytearray(recvExact(conn, 4))
+    payload = bytearray(recvExact(conn, length))
+    for i in range(len(payload)):
+        payload[i] ^= mask[i % 4]
+    return first & 0x0F, bytes(payload)
+
+
+def makeFrame(opcode, payload):
+    """ Unmasked server frame. payload is bytes under 126 long. """
+    return bytes(bytearray([0x80 | opcode, len(payload)])) + payload
+
+
+def serveWebSocket(conn, stub):
+    """ One NotificationSocket() connection to stub TV """
+    request = b""
+    while b"\r\n\r\n" not in request:
+        chunk = conn.recv(1024)
+        if not chunk:
+            return
+        request += chunk
+    key = ""
+    for line in request.decode("latin-1").split("\r\n"):
+        if line.lower().startswith("sec-websocket-key:"):
+            key = line.split(":", 1)[1].strip()
+    accept = base64.b64encode(hashlib.sha1(
+        (key + bravia.WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+    if stub["bad_accept"]:
+        accept = base64.b64encode(b"not the right key!!!").decode("ascii")
+    conn.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                  "Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept +
+                  "\r\n\r\n").encode("ascii"))
+    while True:
+        frame = readFrame(conn)
+        if frame is None:
+            break
+        opcode, payload = frame
+        if opcode == 0x9:  # Ping
+            stub["pings"] += 1
+            if stub["pong"]:
+                conn.sendall(makeFrame(0xA, payload))
+        elif opcode == 0x1:  # switchNotifications
+            message = json.loads(payload.decode("utf-8"))
+            enabled = message["params"][0]["enabled"]
+            conn.sendall(makeFrame(0x1, json.dumps(
+                {"result": [{"enabled": enabled, "disabled": []}],
+                 "id": message["id"]}).encode("utf-8")))
+            conn.sendall(makeFrame(0x1, json.dumps(
+                {"method": "notifyPowerStatus", "params": [{"status": "standby"}],
+                 "version": "1.0"}).encode("utf-8")))
+    conn.close()
+
+
+def startWebSocketStub():
+    """ Return (listening socket, settings) of stub accepting in a thread """
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(5)
+    stub = {"bad_accept": False, "pong": True, "pings": 0}
+
+    def accept():
+        while True:
+            try:
+                conn = server.accept()[0]
+            except socket.error:
+                return  # Closed by checkNotifications()
+            thread = threading.Thread(target=serveWebSocket, args=(conn, stub))
+            thread.daemon = True
+            thread.start()
+
+    thread = threading.Thread(target=accept)
+    thread.daemon = True
+    thread.start()
+    return server, stub
+
+
+def checkNotifications():
+    """ NotificationSocket() against stub TV """
+    server, stub = startWebSocketStub()
+    port = server.getsockname()[1]
+
+    sock = bravia.NotificationSocket("127.0.0.1", "system", PSK, port, 1.0)
+    names = sock.subscribe(["notifyPowerStatus"], 1.0)
+    check("subscribe", names == ["notifyPowerStatus"], str(names))
+    message = sock.receive(1.0)
+    check("notification", message is not None and
+          message["params"][0]["status"] == "standby", str(message))
+
+    try:
+        for _i in range(3):
+            time.sleep(0.25)
+            sock.keepAlive(0.2)  # Ping
+            sock.receive(0.2)  # Pong
+        check("ping answered", stub["pings"] == 3, str(stub["pings"]) + " pings")
+    except bravia.BraviaError as err:
+        check("ping answered", False, str(err))
+    sock.close()
+
+    stub["pong"] = False
+    sock = bravia.NotificationSocket("127.0.0.1", "system", PSK, port, 1.0)
+    try:
+        time.sleep(0.25)
+        sock.keepAlive(0.2)  # Ping
+        sock.receive(0.2)  # No pong
+        time.sleep(0.25)
+        sock.keepAlive(0.2)
+        check("silent drop", False, "No error")
+    except bravia.BraviaError as err:
+        check("silent drop", err.code == bravia.TIMED_OUT, str(err))
+    sock.close()
+
+    stub["bad_accept"] = True
+    try:
+        bravia.NotificationSocket("127.0.0.1", "system", PSK, port, 1.0).close()
+        check("bad accept", False, "No error")
+    except bravia.BraviaError as err:
+        check("bad accept", err.code == bravia.CONNECT_FAILED, str(err))
+
+    server.close()
+
+
+def main():
+    checkClient()
+    checkNotifications()
+    print(len(failures), "failed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# End of bravia_stub.py
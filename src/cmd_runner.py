@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - Command runner helper process
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       cmd_runner.py - Small process that runs commands for HomA
+#
+#       2026-10-18 - Spawn commands without forking the large HomA process.
+#
+# ==============================================================================
+
+"""
+    Forking HomA to run `sensors`, `timeout 1 curl ...` etc. copies page
+    tables for Tk, PIL and numpy before exec. The helper is started once at
+    launch. It is a fresh Python with no GUI imports, so each command is
+    spawned from a small process instead. os.posix_spawnp() is used when
+    Python has it (3.8+). Otherwise the helper uses subprocess.
+
+    Python 3.10+ subprocess uses vfork() and doesn't copy HomA's memory, so
+    homa_common.startRunner() only starts the helper for older Pythons.
+    See spawn_bench.py.
+
+        runner = Runner()  # Starts `python cmd_runner.py` helper
+        pipe = runner.popen(["sensors"])  # Raises OSError like sp.Popen()
+        text, err = pipe.communicate()  # bytes, same as sp.Popen()
+        print(pipe.returncode)
+        runner.close()
+
+    Messages on the helper's stdin and stdout are a 4 byte big-endian length
+    then JSON. Command output is base64 so it survives JSON unchanged:
+
+        {"op": "run", "id": 7, "args": ["sensors"]}       HomA -> helper
+        {"op": "kill", "id": 7}                           HomA -> helper
+        {"id": 7, "pid": 1234}                            helper -> HomA
+        {"id": 7, "errno": 2, "strerror": "No such..."}   helper -> HomA
+        {"id": 7, "out": "...", "err": "...", "rc": 0,
+         "start": 9.99, "duration": 9.99}                 helper -> HomA
+
+    The helper exits when HomA closes its stdin, including when HomA dies.
+"""
+
+import base64  # Command output in JSON
+import json  # Messages
+import os
+import signal  # Kill command
+import struct  # Message length
+import subprocess as sp  # Start helper. Helper spawns when no posix_spawnp
+import sys
+import threading  # Concurrent commands. Reply reader.
+import time  # Command timing
+
+HEADER = struct.Struct(">I")  # Message length
+
+
+class RunnerError(Exception):
+    """ Helper process isn't running. Caller should fork instead. """
+    pass
+
+
+def readMessage(stream):
+    """ Return message dictionary or None at end of file """
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    size = HEADER.unpack(header)[0]
+    data = stream.read(size)
+    if len(data) < size:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def writeMessage(stream, message):
+    """ Write message dictionary and flush """
+    data = json.dumps(message).encode("utf-8")
+    stream.write(HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def encode(data):
+    """ bytes to JSON string """
+    return base64.b64encode(data).decode("ascii")
+
+
+def decode(text):
+    """ JSON string to bytes """
+    return base64.b64decode(text.encode("ascii"))
+
+
+# ==============================================================================
+#
+#       Helper process side
+#
+# ==============================================================================
+
+class Spawned(object):
+    """ One command started by the helper with stdout and stderr pipes """
+
+    def __init__(self, args):
+        self.start = time.time()
+        self.proc = None  # sp.Popen() when no os.posix_spawnp()
+        if hasattr(os, "posix_spawnp"):
+            out_r, out_w = os.pipe()
+            err_r, err_w = os.pipe()
+            actions = [(os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                       (os.POSIX_SPAWN_DUP2, out_w, 1),
+                       (os.POSIX_SPAWN_DUP2, err_w, 2)]
+            try:
+                self.pid = os.posix_spawnp(args[0], args, os.environ,
+                                           file_actions=actions)
+            except OSError:
+                for fd in (out_r, out_w, err_r, err_w):
+                    os.close(fd)
+                raise
+            os.close(out_w)
+            os.close(err_w)
+            self.out = os.fdopen(out_r, "rb")
+            self.err = os.fdopen(err_r, "rb")
+        else:
+            self.proc = sp.Popen(args, stdin=open(os.devnull), stdout=sp.PIPE,
+                                 stderr=sp.PIPE, close_fds=True)
+            self.pid = self.proc.pid
+            self.out = self.proc.stdout
+            self.err = self.proc.stderr
+
+    def read(self):
+        """ Return (stdout bytes, stderr bytes) when command closes them """
+        errors = []
+        reader = threading.Thread(target=lambda: errors.append(self.err.read()))
+        reader.start()
+        text = self.out.read()
+        reader.join()
+        self.out.close()
+        self.err.close()
+        return text, errors[0]
+
+    def reap(self):
+        """ Wait for command to end and return returncode """
+        if self.proc is not None:
+            return self.proc.wait()
+        status = os.waitpid(self.pid, 0)[1]
+        if os.WIFSIGNALED(status):
+            return -os.WTERMSIG(status)  # Same as sp.Popen()
+        return os.WEXITSTATUS(status)
+
+
+def serve(stdin, stdout):
+    """ Helper main loop. Run commands until stdin is closed. """
+    write_lock = threading.Lock()
+    running = {}  # Spawned() by id
+    running_lock = threading.Lock()  # Never kill a pid after it is reaped
+
+    def reply(message):
+        with write_lock:
+            writeMessage(stdout, message)
+
+    def finish(ident, spawned):
+        text, err = spawned.read()
+        with running_lock:
+            running.pop(ident, None)
+        returncode = spawned.reap()
+        reply({"id": ident, "out": encode(text), "err": encode(err),
+               "rc": returncode, "start": spawned.start,
+               "duration": time.time() - spawned.start})
+
+    while True:
+        message = readMessage(stdin)
+        if message is None:
+            break  # HomA closed pipe or died
+        ident = message.get("id")
+        if message["op"] == "run":
+            try:
+                spawned = Spawned(message["args"])
+            except OSError as err:
+                reply({"id": ident, "errno": err.errno, "strerror": err.strerror})
+                continue
+            with running_lock:
+                running[ident] = spawned
+            reply({"id": ident, "pid": spawned.pid})
+            thread = threading.Thread(target=finish, args=(ident, spawned))
+            thread.daemon = True
+            thread.start()
+        elif message["op"] == "kill":
+            with running_lock:
+                spawned = running.get(ident)
+                if spawned is not None:
+                    try:
+                        os.kill(spawned.pid, signal.SIGKILL)
+                    except OSError:
+                        pass  # Already ended
+
+
+# ==============================================================================
+#
+#       HomA side
+#
+# ==============================================================================
+
+class RunnerProcess(object):
+    """ Command running in helper. Has what runCommand() uses of sp.Popen() """
+
+    def __init__(self, runner, ident):
+        self.runner = runner
+        self.id = ident
+        self.pid = None
+        self.returncode = None
+        self.start = 0.0  # time.time() helper started command
+        self.duration = 0.0  # Seconds helper measured
+        self.started = threading.Event()  # Helper replied with pid or errno
+        self.finished = threading.Event()  # Helper replied with output
+        self.error = None  # OSError when command couldn't start
+        self.text = b""
+        self.err = b""
+
+    def communicate(self):
+        """ Wait for command to end. Return (stdout bytes, stderr bytes).
+            When helper ends first, returncode is -1 with an error message.
+        """
+        self.finished.wait()  # Runner().receive() sets when helper ends
+        if self.returncode is None:
+            self.returncode = -1
+            self.err = b"Command runner ended while command was running."
+        return self.text, self.err
+
+    def kill(self):
+        """ Kill command. Already ended is ok. """
+        if not self.finished.is_set():
+            try:
+                self.runner.send({"op": "kill", "id": self.id})
+            except RunnerError:
+                pass  # Helper ended. Command ended with it.
+
+
+class Runner(object):
+    """ Start helper process and send it commands from any thread """
+
+    def __init__(self, python=None):
+        self.proc = sp.Popen([python or sys.executable, "-S", os.path.abspath(__file__)],
+                             stdin=sp.PIPE, stdout=sp.PIPE, close_fds=True)
+        self.lock = threading.Lock()  # self.pending and self.next_id
+        self.send_lock = threading.Lock()  # One message written at a time
+        self.pending = {}  # RunnerProcess() by id
+        self.next_id = 0
+        self.dead = False
+        self.reader = threading.Thread(target=self.receive, name="cmd-runner")
+        self.reader.daemon = True
+        self.reader.start()
+
+    def alive(self):
+        """ Return False after helper ended """
+        return not self.dead
+
+    def send(self, message):
+        """ Write message to helper. Raises RunnerError if helper ended.
+            popen() and RunnerProcess().kill() call from any thread.
+        """
+        with self.send_lock:
+            try:
+                writeMessage(self.proc.stdin, message)
+            except (IOError, OSError, ValueError):  # ValueError = closed file
+                self.dead = True
+                raise RunnerError("Command runner isn't running")
+
+    def popen(self, args):
+        """ Start command in helper and return RunnerProcess().
+            Raises OSError like sp.Popen() when command can't start.
+            Raises RunnerError when helper isn't running.
+        """
+        if self.dead:
+            raise RunnerError("Command runner isn't running")
+        with self.lock:
+            self.next_id += 1
+            process = RunnerProcess(self, self.next_id)
+            self.pending[process.id] = process
+            try:
+                self.send({"op": "run", "id": process.id, "args": list(args)})
+            except RunnerError:
+                del self.pending[process.id]
+                raise
+
+        process.started.wait()  # Runner().receive() sets when helper ends
+        if process.error:
+            raise process.error
+        if process.pid is None:
+            raise RunnerError("Command runner ended starting: " + args[0])
+        return process
+
+    def receive(self):
+        """ Reader thread. Hand helper replies to waiting RunnerProcess(). """
+        while True:
+            try:
+                message = readMessage(self.proc.stdout)
+            except (IOError, OSError, ValueError):
+                message = None
+            if message is None:
+                break
+            with self.lock:
+                process = self.pending.get(message["id"])
+                if process is not None and "rc" in message:
+                    del self.pending[message["id"]]
+            if process is None:
+                continue
+            if "pid" in message:
+                process.pid = message["pid"]
+                process.started.set()
+            elif "errno" in message:
+                process.error = OSError(message["errno"], message["strerror"])
+                with self.lock:
+                    self.pending.pop(message["id"], None)
+                process.started.set()
+                process.finished.set()
+            else:
+                process.text = decode(message["out"])
+                process.err = decode(message["err"])
+                process.returncode = message["rc"]
+                process.start = message["start"]
+                process.duration = message["duration"]
+                process.finished.set()
+
+        self.dead = True
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for process in pending.values():
+            process.started.set()  # Waiters see self.dead
+            process.finished.set()
+
+    def close(self):
+        """ Close helper's stdin. Helper exits after running commands end. """
+        self.dead = True
+        try:
+            self.proc.stdin.close()
+        except (IOError, OSError):
+            pass
+        self.proc.wait()
+
+
+if __name__ == "__main__":
+    if sys.version_info[0] >= 3:
+        serve(sys.stdin.buffer, sys.stdout.buffer)
+    else:
+        serve(sys.stdin, sys.stdout)
+
+# End of cmd_runner.py
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - LED light strip effect frame tables
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+from __future__ import division  # integer division results in float
+
+# ==============================================================================
+#
+#       frames.py - Precomputed RGB frames for Bluetooth LED light effects
+#
+#       2026-10-18 - Breathing colors cycle built once instead of every step.
+#
+# ==============================================================================
+
+"""
+    An effect is a FrameTable(): one brightness, color mask and hold time in
+    milliseconds for each frame of one cycle. The engine plays frames in
+    order and starts over at frame 0 when the cycle ends.
+
+        table = breathe(low=3, high=50, span=6.0, step=0.275, bots=1.5, tops=0.5)
+        table.boost(sunlight_percent)  # Only recalculates when percent changes
+        (red, green, blue), hold_ms, monitor_color = table.frame(ndx)
+
+    Brightness is split over the colors in the mask. When the mask is red and
+    green, red+green adjust (GLO['LED_RED+GREEN_ADJ']) halves the green so
+    the color looks yellow instead of olive.
+
+    The sunlight boost is applied to every brightness in one pass by boost().
+    It never runs inside the step loop unless the sunlight percent changed.
+"""
+
+from array import array  # Compact frame storage
+
+RED, GREEN, BLUE = 4, 2, 1  # Color mask bits
+CYCLE = (  # Breathing colors: (R, R+G, G, G+B, B, B+R)
+    RED, RED | GREEN, GREEN, GREEN | BLUE, BLUE, BLUE | RED
+)
+
+
+def split(brightness, mask, red_green_adj=False):
+    """ Return (red, green, blue) sharing brightness between mask colors """
+    tr, tg, tb = mask & RED, mask & GREEN, mask & BLUE
+    num_colors = bool(tr) + bool(tg) + bool(tb)
+    if num_colors == 0:
+        return 0, 0, 0
+
+    # When two colors, each color gets half brightness. Integer rounding can
+    # make half_bright 1 less than true half.
+    half_bright = int(brightness / num_colors)
+    red = half_bright if tr else 0
+    half_bright = brightness - half_bright if red > 0 else half_bright
+    green = half_bright if tg else 0
+    half_bright = brightness - half_bright if green > 0 else half_bright
+    blue = half_bright if tb else 0
+
+    if red_green_adj and red and green:
+        green = int(green / 2)  # turns olive into yellow
+        red = int(brightness - green)
+        if green == 1 and red > 2:  # Value of 1 is LED light off.
+            green += 1  # Green becomes 2, the dimmest possible color.
+            red -= 1  # Red decremented to compensate for Green increment.
+    return red, green, blue
+
+
+def monitorColor(me, other1, other2):
+    """ Monitor color for one LED color to display facsimile of LED lights.
+        low color is very dark. E.G Dark Red (80, 0, 0).
+        As color percentage increases gradually add color.
+
+        'me' is my color percentage. 'other1' and 'other2' are the other two.
+        Percentage is fraction E.G. 1.0 = 100%, 0.5 = 50% and 0.25 = 25%
+    """
+    all_percent = min(me + other1 + other2, 100.0)
+    if me == 0.0:
+        return int(all_percent * .25)
+    return max(0, min(int(75 + me * 180), 255))
+
+
+class FrameTable(object):
+    """ One cycle of an LED effect. Frames are appended by builders below. """
+
+    def __init__(self, red_green_adj=False):
+        self.red_green_adj = red_green_adj
+        self.levels = array('H')  # Brightness before sunlight boost
+        self.masks = array('B')  # RED | GREEN | BLUE bits
+        self.holds = array('H')  # Milliseconds to hold frame
+        self.percent = None  # Sunlight percent self.rgb was built with
+        self.rgb = array('H')  # red, green, blue triplets after boost
+        self.monitor = []  # "#rrggbb" facsimile after boost
+
+    def __len__(self):
+        return len(self.levels)
+
+    def append(self, level, mask, hold_ms):
+        """ Add frame. Boosted colors are rebuilt on next boost(). """
+        self.levels.append(int(level))
+        self.masks.append(mask)
+        self.holds.append(int(hold_ms))
+        self.percent = None
+
+    def boost(self, percent):
+        """ Add sunlight percent to every frame's brightness.
+            Does nothing when percent is the same as last time.
+        """
+        if percent == self.percent:
+            return
+        add = float(percent) if percent > 0 else 0.0
+        high = max(self.levels) if self.levels else 1
+        new_high = float(max(high + int(high * add / 100.0), 1))
+        rgb = array('H')
+        monitor = []
+        for level, mask in zip(self.levels, self.masks):
+            # Same rounding as old int((float(brightness) * percent) / 100.0)
+            red, green, blue = split(level + int(level * add / 100.0), mask,
+                                     self.red_green_adj)
+            rgb.extend((red, green, blue))
+            rp, gp, bp = red / new_high, green / new_high, blue / new_high
+            monitor.append("#%02x%02x%02x" % (monitorColor(rp, gp, bp),
+                                              monitorColor(gp, rp, bp),
+                                              monitorColor(bp, rp, gp)))
+        self.rgb, self.monitor, self.percent = rgb, monitor, percent
+
+    def frame(self, ndx):
+        """ Return ((red, green, blue), hold_ms, monitor_color).
+            boost() must have been called once.
+        """
+        i = ndx * 3
+        return (tuple(self.rgb[i:i + 3]), self.holds[ndx], self.monitor[ndx])
+
+
+def breathe(low, high, span, step, bots, tops, colors=CYCLE, red_green_adj=False):
+    """ Each color turns up from low to high over span seconds, holds for
+        tops seconds, turns down to low and holds for bots seconds.
+        step is seconds between brightness changes.
+    """
+    table = FrameTable(red_green_adj)
+    step_count = int(float(span) / float(step))
+    step_amount = float(high - low) / float(step_count)
+    step_ms = int(float(step) * 1000.0)
+    for mask in colors:
+        for turning_up in (True, False):
+            for ndx in range(step_count):
+                if ndx == 0:
+                    level = low if turning_up else high
+                elif ndx == step_count - 1:  # Last index in range?
+                    level = high if turning_up else low
+                elif turning_up:
+                    level = low + int(ndx * step_amount)
+                else:
+                    level = high - int(ndx * step_amount)
+                level = max(low, min(level, high))
+                hold_ms = step_ms
+                if ndx == step_count - 1:  # At high hold for tops, at low bots
+                    hold_ms = int(tops * 1000.0) if turning_up else int(bots * 1000.0)
+                table.append(level, mask, hold_ms)
+    return table
+
+
+def fade(mask, low, high, span, step, red_green_adj=False):
+    """ One color fades from low to high then snaps back to low """
+    table = FrameTable(red_green_adj)
+    step_count = max(int(float(span) / float(step)), 1)
+    for ndx in range(step_count):
+        table.append(low + (high - low) * ndx // max(step_count - 1, 1),
+                     mask, step * 1000.0)
+    return table
+
+
+def strobe(mask, level, on, off, red_green_adj=False):
+    """ One color flashes on for on seconds and off for off seconds """
+    table = FrameTable(red_green_adj)
+    table.append(level, mask, on * 1000.0)
+    table.append(0, mask, off * 1000.0)
+    return table
+
+
+def chase(level, hold, colors=CYCLE, red_green_adj=False):
+    """ Each color in turn at level for hold seconds """
+    table = FrameTable(red_green_adj)
+    for mask in colors:
+        table.append(level, mask, hold * 1000.0)
+    return table
+
+
+# End of frames.py
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - GATTToolReceiver replay benchmark
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+from __future__ import division  # integer division results in float
+
+# ==============================================================================
+#
+#       gatttool_bench.py - Events per second parsing recorded gatttool output
+#
+#       2026-10-18 - Compare pexpect.expect() receiver with compiled dispatcher.
+#
+# ==============================================================================
+
+"""
+    Replays the same recorded gatttool interactive session through:
+
+        expect   - GATTToolReceiver.run() before 2026-10-18. pexpect.expect()
+                   searches the buffer once per pattern for every event.
+        compiled - GATTToolReceiver.run() now. One combined regex finds every
+                   event in each chunk read.
+
+    Both must report the same events in the same order.
+
+        python gatttool_bench.py            # 2000 color writes recorded
+        python gatttool_bench.py -n 20000
+
+    No Bluetooth hardware is needed. The recording is a list of the pieces
+    gatttool writes to its pseudo terminal. Replay() returns one piece for
+    each read, like a terminal does when gatttool output arrives over time.
+"""
+
+import argparse  # --count
+import itertools  # Flatten event patterns
+import threading  # Receiver aliveness
+import time  # Events per second
+
+import pexpect
+import pexpect.spawnbase  # Replay() is a pexpect spawn without a process
+
+from pygatt.backends.gatttool.gatttool import GATTToolReceiver
+
+MAC = "C0:79:82:41:2F:1F"
+
+
+class Replay(pexpect.spawnbase.SpawnBase):
+    """ pexpect spawn returning one recorded piece of output for each read """
+
+    def __init__(self, pieces):
+        pexpect.spawnbase.SpawnBase.__init__(self, timeout=.5)
+        self.pieces = iter(pieces)
+
+    def read_nonblocking(self, size=1, timeout=None):
+        try:
+            return next(self.pieces)
+        except StopIteration:
+            self.flag_eof = True
+            raise pexpect.EOF("End of recording")
+
+
+def recording(count):
+    """ Return list of gatttool output pieces for a session writing count colors.
+        Every tenth write is a request, the rest are commands. The LED
+        controller sends a notification after every fifth write.
+    """
+    prompt = "[" + MAC + "][LE]> "
+    lines = ["[LE]> sec-level low\r\n", "[LE]> connect " + MAC + " public\r\n",
+             "Attempting to connect to " + MAC + "\r\n",
+             "Connection successful\r\n" + prompt, "characteristics\r\n"]
+    for i in range(1, 10):
+        lines.append("handle: 0x%04x, char properties: 0x1a, char value handle: "
+                     "0x%04x, uuid: 0000ff%02x-0000-1000-8000-00805f9b34fb\r\n"
+                     % (i * 3, i * 3 + 1, 0xd0 + i))
+    for i in range(count):
+        level = i % 256
+        if i % 10 == 0:
+            lines.append(prompt + "char-write-req 0x0007 56%02x%02x0000f0aa\r\n"
+                         % (level, 255 - level))
+            lines.append("Characteristic value was written successfully\r\n")
+        else:
+            lines.append(prompt + "char-write-cmd 0x0007 56%02x%02x0000f0aa\r\n"
+                         % (level, 255 - level))
+        if i % 5 == 4:
+            lines.append("Notification handle = 0x0012 value: 66 04 24 41 "
+                         "%02x %02x 00 00 99 \r\n" % (level, 255 - level))
+        if i % 100 == 99:
+            lines.append(prompt + "char-read-hnd 0x0012\r\n")
+            lines.append("Characteristic value/descriptor: 66 04 24 41 \r\n")
+    lines.append(prompt + "disconnect\r\n")
+    lines.append("\r\n(gatttool:31): GLib-WARNING **: Invalid file descriptor.\r\n")
+    return [line.encode("ascii") for line in lines]
+
+
+class ExpectReceiver(GATTToolReceiver):
+    """ GATTToolReceiver.run() as it was before the compiled dispatcher """
+
+    def run(self):
+        items = sorted(itertools.chain.from_iterable(
+            [[(pattern, event)
+              for pattern in event["patterns"]]
+             for event in self._event_vector.values()]),
+            key=lambda item: item[0]
+        )
+        patterns = [item[0] for item in items]
+        events = [item[1] for item in items]
+
+        while self._parent_aliveness.is_set():
+            try:
+                event_index = self._connection.expect(patterns, timeout=.5)
+            except pexpect.TIMEOUT:
+                continue
+            except pexpect.EOF:
+                self._event_vector["disconnected"]["event"].set()
+                break
+            event = events[event_index]
+            event["before"] = self._connection.before
+            event["after"] = self._connection.after
+            event["match"] = self._connection.match
+            event["event"].set()
+            for clb in event["callback"]:
+                clb(event)
+
+
+def replay(receiver_class, pieces):
+    """ Feed recording to receiver. Return (seconds, [(event, text), ...]) """
+    connection = Replay(pieces)
+    aliveness = threading.Event()
+    aliveness.set()
+    receiver = receiver_class(connection, aliveness)
+    found = []
+    for name in receiver._event_vector:
+        def callback(event, name=name):
+            found.append((name, event["after"]))
+        receiver.register_callback(name, callback)
+    start = time.time()
+    receiver.run()  # Returns at end of recording
+    seconds = time.time() - start
+    return seconds, found
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Events per second parsing recorded gatttool output")
+    parser.add_argument("-n", "--count", type=int, default=2000,
+                        help="Color writes in recording")
+    args = parser.parse_args()
+
+    pieces = recording(args.count)
+    results = {}
+    for name, receiver_class in (("expect", ExpectReceiver),
+                                 ("compiled", GATTToolReceiver)):
+        seconds, found = replay(receiver_class, pieces)
+        results[name] = found
+        print("{0:<9} {1:>7,} events {2:>8.3f} seconds {3:>12,.0f} events/second"
+              .format(name, len(found), seconds, len(found) / max(seconds, 1e-9)))
+    if results["expect"] != results["compiled"]:
+        print("MISMATCH: receivers reported different events")
+
+
+if __name__ == "__main__":
+    main()
+
+# End of gatttool_bench.py
@@ -37,6 +37,30 @@ warnings.filterwarnings("ignore", "ResourceWarning")  # PIL python 3 unclosed fi
 #       2026-05-16 - Device Layout with moving/resizing and shared context menu.
 #       2026-05-24 - Select custom images for Treeview & Device Layout by MAC.
 #       2026-05-29 - Toggle Android TV "audio only" (picture on/off) using adb.
+#       2026-10-18 - Test arp devices for device type in parallel threads.
+#       2026-10-18 - Remember device types tested by MAC in fingerprints.json.
+#       2026-10-18 - Read /proc/net/arp and /etc/hosts instead of arp and getent.
+#       2026-10-18 - DeviceRegistry() hash indexes replace MAC linear searches.
+#       2026-10-18 - Rediscover() in background thread. Enable auto-rediscovery.
+#       2026-10-18 - refreshAllPowerStatuses() polls network devices in threads.
+#       2026-10-18 - turnAllPower() switches devices in parallel stages.
+#       2026-10-18 - SmartPlugHS100() uses kasa.py instead of hs100.sh.
+#       2026-10-18 - Discover Kasa smart plugs with one UDP broadcast.
+#       2026-10-18 - EmeterCollector() HS110 power history in emeter.db.
+#       2026-10-18 - Sony REST API uses bravia.py instead of curl.
+#       2026-10-18 - Sony TV events checked in monitorWorker() thread.
+#       2026-10-18 - Sony TV pushes power and volume notifications to HomA.
+#       2026-10-18 - GoogleAndroidTV() power probe uses android.AdbSession().
+#       2026-10-18 - wol.py magic packets replace `wakeonlan` for Android TV.
+#       2026-10-18 - Breathing colors runs in breatheWorker() thread.
+#       2026-10-18 - Breathing colors sent with tc.ColorQueue() write commands.
+#       2026-10-18 - Breathing colors played from precomputed frames.breathe().
+#       2026-10-18 - LED lights GLO['LED_BACKEND'] "gatttool" or "bgapi" (BLED112).
+#       2026-10-18 - refreshApp() runs hc.Scheduler() jobs only when they are due.
+#       2026-10-18 - View "Loop performance" and --profile-loop hc.LoopProfile().
+#       2026-10-18 - `sensors` and timer alarm run with self.runCommandAsync().
+#       2026-10-18 - hc.startRunner() so commands don't fork large HomA process.
+#       2026-10-18 - Discovery errors and timings query hc.events (library.db).
 #
 # ==============================================================================
 
@@ -176,9 +200,23 @@ import datetime as dt  # For dt.datetime.now().strftime('%I:%M %p')
 import random  # Temporary filenames
 import string  # Temporary filenames
 import base64  # Required for Cryptology
+import select  # Sony TV notification sockets
+import socket  # Reverse DNS names in read_arp()
+import sqlite3  # EmeterCollector() power history
+import threading  # Parallel device discovery, etc.
 from cryptography.fernet import Fernet  # To encrypt sudo password
 from collections import OrderedDict, namedtuple
 
+try:  # Python 3
+    import queue as Queue
+except ImportError:  # Python 2
+    import Queue
+
+try:  # Python 3.3+ clock for breatheWorker() steps
+    monotonic = time.monotonic
+except AttributeError:  # Python 2
+    monotonic = time.time
+
 try:
     reload(sys)  # June 25, 2023 - Without utf8 sys reload, os.popen() fails on OS
     sys.setdefaultencoding('utf8')  # filenames that contain unicode characters
@@ -196,7 +234,6 @@ except ImportError:
 import pygatt  # Bluetooth Low Energy (BLE) low-level communication
 import pygatt.exceptions  # pygatt error messages also used by trionesControl
 import trionesControl.trionesControl as tc  # Bluetooth LED Light pygatt wrapper
-from ppadb.client import Client as AdbClient  # Android TV ADB optimized shell
 
 # Pippim libraries
 import sql  # For color options - Lots of irrelevant mserve.py code though
@@ -206,6 +243,11 @@ import message  # For dtb (Delayed Text Box)
 import image as img  # Image processing. E.G. Create Taskbar icon
 import timefmt as tmf  # Time formatting, ago(), days(), mm_ss(), etc.
 import external as ext  # Call external functions, programs, etc.
+import kasa  # TP-Link Kasa Smart Plug protocol replaces hs100.sh
+import bravia  # Sony Bravia REST API keep-alive client replaces curl
+import android  # Android TV persistent ADB session and batched power probe
+import wol  # Wake-on-LAN magic packets replace `wakeonlan`
+import frames  # Precomputed LED light effect frame tables
 import homa_common as hc  # hc.ValidateSudoPassword()
 from homa_common import DeviceCommonSelf, glo, GLO, Globals, AudioControl
 from homa_common import p_args, v0_print, v1_print, v2_print, v3_print
@@ -405,6 +447,165 @@ SHAW-8298B0-5G      bfce8167-18fc-4646-bec3-868c097a3f4a  802-11-wireless  -- ''
         self.powerStatus = status
 
 
+class IndexedList(list):
+    """ list with hash index on dictionary key (or on item when key=None).
+        Index is kept consistent by every list method that changes the list.
+        json.dumps() sees a regular list so file formats are unchanged.
+
+        NOTE: Changing key value inside a dictionary already in the list
+              (E.G. mac_dict['ip'] = new_ip) requires calling .reindex().
+              'mac' key values never change.
+    """
+
+    def __init__(self, items=(), key="mac"):
+        list.__init__(self, items)
+        self.key = key  # Dictionary key to index. None = index item itself
+        self._by_key = {}  # key value: first item with that key value
+        self.version = 0  # Incremented on every change for DeviceRegistry()
+        self.reindex()
+
+    def keyOf(self, item):
+        """ Return key value for item """
+        if self.key is None:
+            return item
+        try:
+            return item.get(self.key)
+        except AttributeError:
+            return None  # Not a dictionary
+
+    def reindex(self):
+        """ Rebuild index. First item wins, same as linear search. """
+        self._by_key = {}
+        for item in self:
+            self._by_key.setdefault(self.keyOf(item), item)
+        self.version += 1
+
+    def find(self, value, default=None):
+        """ Return first item with key value. O(1) instead of O(n). """
+        return self._by_key.get(value, default)
+
+    def __contains__(self, item):
+        if self.key is None:
+            return item in self._by_key
+        return list.__contains__(self, item)
+
+    def append(self, item):
+        list.append(self, item)
+        self._by_key.setdefault(self.keyOf(item), item)
+        self.version += 1
+
+    def extend(self, items):
+        list.extend(self, items)
+        self.reindex()
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def insert(self, i, item):
+        list.insert(self, i, item)
+        self.reindex()
+
+    def remove(self, item):
+        list.remove(self, item)
+        self.reindex()
+
+    def pop(self, *args):
+        item = list.pop(self, *args)
+        self.reindex()
+        return item
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self.reindex()
+
+    def reverse(self):
+        list.reverse(self)
+        self.reindex()
+
+    def __setitem__(self, i, item):
+        list.__setitem__(self, i, item)
+        self.reindex()
+
+    def __delitem__(self, i):
+        list.__delitem__(self, i)
+        self.reindex()
+
+    def __setslice__(self, i, j, items):  # Python 2 only
+        list.__setslice__(self, i, j, items)
+        self.reindex()
+
+    def __delslice__(self, i, j):  # Python 2 only
+        list.__delslice__(self, i, j)
+        self.reindex()
+
+
+class DeviceRegistry(object):
+    """ Owns NetworkInfo() lists with hash indexes by MAC, IP and type_code.
+
+        self.mac_dicts   [{"mac", "ip", "name", "alias", "type_code"}, ...]
+        self.instances   [{"mac", "instance"}, ...]
+        self.layouts     [{"mac", "name", "coords_pct", ...}, ...]
+        self.view_order  [mac, mac, ...]
+
+        Lists are IndexedList() and still saved by json.dumps() into
+        devices.json, view_order.json and layout.json unchanged.
+    """
+
+    LISTS = {"mac_dicts": "mac", "instances": "mac", "layouts": "mac",
+             "view_order": None}  # List name: indexed dictionary key
+
+    def __init__(self):
+        for name, key in self.LISTS.items():
+            setattr(self, name, IndexedList(key=key))
+        self.ip_index = {}  # mac_dicts by IP. Rebuilt when stale.
+        self.ip_version = -1  # mac_dicts.version when ip_index built
+        self.type_index = {}  # instances by inst.type_code
+        self.type_version = -1  # instances.version when type_index built
+
+    def assign(self, name, items):
+        """ Replace list, E.G. ni.view_order = json.loads(...) """
+        if not isinstance(items, IndexedList):
+            items = IndexedList(items, key=self.LISTS[name])
+        setattr(self, name, items)
+
+    def macDict(self, mac):
+        """ Return mac_dict for mac or None """
+        return self.mac_dicts.find(mac)
+
+    def instance(self, mac):
+        """ Return {"mac", "instance"} for mac or None """
+        return self.instances.find(mac)
+
+    def layout(self, mac):
+        """ Return layout dictionary for mac or None """
+        return self.layouts.find(mac)
+
+    def macDictForIp(self, ip):
+        """ Return mac_dict for IP address or None """
+        mac_dict = None
+        if self.ip_version == self.mac_dicts.version:
+            mac_dict = self.ip_index.get(ip)
+        if mac_dict is None or mac_dict.get('ip') != ip:
+            # Stale after mac_dict['ip'] changed in place by Rediscover()
+            self.ip_index = {}
+            for md in self.mac_dicts:
+                self.ip_index.setdefault(md.get('ip'), md)
+            self.ip_version = self.mac_dicts.version
+            mac_dict = self.ip_index.get(ip)
+        return mac_dict
+
+    def instancesForTypeCode(self, type_code):
+        """ Return list of {"mac", "instance"} for type_code """
+        if self.type_version != self.instances.version:
+            self.type_index = {}
+            for instance in self.instances:
+                code = instance['instance'].type_code
+                self.type_index.setdefault(code, []).append(instance)
+            self.type_version = self.instances.version
+        return self.type_index.get(type_code, [])
+
+
 class NetworkInfo(DeviceCommonSelf):
     """ Network Information from arp and getent (/etc/hosts)
 
@@ -412,14 +613,15 @@ class NetworkInfo(DeviceCommonSelf):
         rd = NetworkInfo() rediscovery called every minute
 
         LISTS
-        self.arp_results Devices from `arp -a`
-        self.hosts       Devices from `getent hosts`
+        self.arp_results Devices from /proc/net/arp in `arp -a` format
+        self.hosts       Devices from /etc/hosts in `getent hosts` format
         self.host_macs   Optional MAC addresses at end of /etc/hosts
         self.view_order  Treeview list of MAC addresses
 
-        LISTS of DICTIONARIES
+        LISTS of DICTIONARIES - Owned by self.registry = DeviceRegistry()
         self.mac_dicts  First time discovered, thereafter read from disk
         self.instances  GoogleAndroidTV, SonyBraviaKdlTV, etc. instances
+        self.layouts    Network Devices Layout (Canvas) details by MAC
 
         # Miscellaneous - nmap takes 10 seconds so call on demand with wait cursor
         # nmap 192.168.0.0/24
@@ -431,15 +633,24 @@ class NetworkInfo(DeviceCommonSelf):
         # https://stackoverflow.com/q/51131812/6929343
     """
 
-    def __init__(self):
-        """ DeviceCommonSelf(): Variables used by all classes """
+    last_neighbours = None  # self.neighbours of last instance for neighbour_diff()
+    kasa_plugs = {}  # kasa.discover() results of last instance for test_for_instance()
+    dns_names = {}  # Reverse DNS host names by IP for read_arp()
+    sony_rest = bravia.BraviaClient()  # Keep-alive connections shared by ni & rd
+
+    def __init__(self, computer=None):
+        """ DeviceCommonSelf(): Variables used by all classes
+            :param computer: copy.copy(cp) from Rediscover() so its thread
+                never changes cp while tkinter is using it. None = cp
+        """
+        self.__dict__['registry'] = DeviceRegistry()  # Before __setattr__ is used
         DeviceCommonSelf.__init__(self, "NetworkInfo().")  # Define self.who
 
-        global cp  # cp = Computer() instance
-        cp.Interface()  # Get current WiFi and Ethernet settings.
+        comp = computer if computer is not None else cp  # Computer() instance
+        comp.Interface()  # Get current WiFi and Ethernet settings.
         _who = self.who + "__init__():"  # Long-winded debug string not used.
 
-        self.requires = ['arp', 'getent', 'timeout', 'curl', 'adb']
+        self.requires = ['timeout', 'adb']  # arp & getent only fallback
         self.installed = []
         self.checkDependencies(self.requires, self.installed)
         v2_print(self.who, "Dependencies:", self.requires)
@@ -447,36 +658,24 @@ class NetworkInfo(DeviceCommonSelf):
 
         self.last_row = ""  # used by rediscovery processing one row at a time
 
+        # Create self.hosts from /etc/hosts
+        v3_print("\n========================  getent hosts  ========================")
+        # Format: '192.168.0.19    SONY.LAN Sony Bravia KDL TV Ethernet  ac:9b:0a:df:3f:d9'
+        self.hosts = []
+        for host in self.read_hosts():
+            self.hosts.append(host)
+            v3_print(host, end="")
+
         # Create self.arp_results from arp
         v3_print("\n===========================  arp -a  ===========================")
         # Format: 'SONY.LAN (192.168.0.19) at ac:9b:0a:df:3f:d9 [ether] on enp59s0'
         self.arp_results = []
-        command_line_list = ["arp", "-a"]
-        event = self.runCommand(command_line_list, _who)
-
-        if event['returncode'] != 0:
-            devices = []  # Empty list for now
-        else:
-            devices = event['output'].split("\n")
-
-        for device in devices:
+        for device in self.read_arp():
             self.arp_results.append(device)
             v3_print(device, end="")
 
-        # Create self.hosts from /etc/hosts
-        v3_print("\n========================  getent hosts  ========================")
-        # Format: '192.168.0.19    SONY.LAN Sony Bravia KDL TV Ethernet  ac:9b:0a:df:3f:d9'
-        self.hosts = []
-        command_line_list = ["getent", "hosts"]
-        event = self.runCommand(command_line_list, _who)
-
-        if event['returncode'] != 0:
-            hosts = []  # Empty list for now
-        else:
-            hosts = event['output'].split("\n")
-        for host in hosts:
-            self.hosts.append(host)
-            v3_print(host, end="")
+        # Neighbours added, removed or changed since last NetworkInfo() instance
+        self.arp_diff = self.neighbour_diff()
 
         # Read self.hosts (/etc/hosts) to get alias to assign device/arps
         v3_print("\n=========================  host MACs  ==========================")
@@ -485,6 +684,7 @@ class NetworkInfo(DeviceCommonSelf):
         import re
         p = re.compile(r'(?:[0-9a-fA-F]:?){12}')  # regex MAC Address
         self.host_macs = []
+        self.host_aliases = {}  # MAC: alias for get_alias()
         for host in self.hosts:
             # 192.168.0.16    SONY.WiFi android-47cdabb50f83a5ee 18:4F:32:8D:AA:97
             parts = host.split()
@@ -498,29 +698,30 @@ class NetworkInfo(DeviceCommonSelf):
                 mac = str(result[-1])  # Last entry = '18:4F:32:8D:AA:97'
 
                 # Assign cp = Computer() instance attributes
-                if mac == cp.ether_mac or mac == cp.wifi_mac:
-                    cp.name = name  # computer name
-                    cp.alias = alias  # computer alias
-                    if mac == cp.ether_mac and cp.ether_ip == "":
+                if mac == comp.ether_mac or mac == comp.wifi_mac:
+                    comp.name = name  # computer name
+                    comp.alias = alias  # computer alias
+                    if mac == comp.ether_mac and comp.ether_ip == "":
                         v3_print("Assigning cp.ether_ip:", ip)
-                        cp.ether_ip = ip
-                    if mac == cp.wifi_mac and cp.wifi_ip == "":
+                        comp.ether_ip = ip
+                    if mac == comp.wifi_mac and comp.wifi_ip == "":
                         v3_print("Assigning cp.wifi_ip:", ip)
-                        cp.wifi_ip = ip
+                        comp.wifi_ip = ip
 
             else:  # No MAC (result = None)
                 mac = "No MAC for: " + ip
 
                 # Assign cp = Computer() instance attributes
-                if ip == cp.ether_ip or ip == cp.wifi_ip:
-                    cp.name = name  # computer name
-                    cp.alias = alias  # computer alias
-                    if cp.ether_ip == "":
-                        cp.ether_ip = ip  # Can be overridden by MAC later
-                    if cp.wifi_ip == "":
-                        cp.wifi_ip = ip  # Can be overridden by MAC later
+                if ip == comp.ether_ip or ip == comp.wifi_ip:
+                    comp.name = name  # computer name
+                    comp.alias = alias  # computer alias
+                    if comp.ether_ip == "":
+                        comp.ether_ip = ip  # Can be overridden by MAC later
+                    if comp.wifi_ip == "":
+                        comp.wifi_ip = ip  # Can be overridden by MAC later
 
             host_mac = mac + "  " + ip.ljust(15) + name.ljust(16) + alias
+            self.host_aliases.setdefault(mac, alias)  # get_alias() first match
             v3_print(host_mac)
             #host_dict = {"mac": mac, "ip": ip, "name": name, "alias": alias}
             # 2024-10-14 - Future conversion from host_mac to host_dict
@@ -536,23 +737,23 @@ class NetworkInfo(DeviceCommonSelf):
 
         # Add mandatory computer platform ethernet that arp never reports
         # Format: 'SONY.LAN (192.168.0.19) at ac:9b:0a:df:3f:d9 [ether] on enp59s0'
-        ip = cp.ether_ip
+        ip = comp.ether_ip
         if not ip:
             ip = "Unknown"
-        device = cp.name + " (" + ip + ") at "
-        device += cp.ether_mac + " [ether] on " + cp.ether_name
+        device = comp.name + " (" + ip + ") at "
+        device += comp.ether_mac + " [ether] on " + comp.ether_name
         # TODO change device when connected to WiFi
         self.arp_results.append(device)
         v3_print(device, end="")
         #print(device)
 
         # Add optional laptop WiFi that arp never reports when Wired connection
-        if cp.chassis == "laptop":
-            ip = cp.wifi_ip
+        if comp.chassis == "laptop":
+            ip = comp.wifi_ip
             if not ip:
                 ip = "Unknown"
-            device = cp.name + " (" + ip + ") at "
-            device += cp.wifi_mac + " [ether] on " + cp.wifi_name
+            device = comp.name + " (" + ip + ") at "
+            device += comp.wifi_mac + " [ether] on " + comp.wifi_name
             # TODO change device when connected to WiFi
             self.arp_results.append(device)
             v3_print("\n" + device, end="")
@@ -599,13 +800,165 @@ class NetworkInfo(DeviceCommonSelf):
         v2_print(_who, "mac_dicts:", self.mac_dicts)  # 2024-11-09 now has Computer()
         v2_print(_who, "instances:", self.instances)  # Empty list until discovery
         v2_print(_who, "view_order:", self.view_order)  # Empty list until discovery
-        v2_print(_who, "cp.ether_name:", cp.ether_name,  " | cp.ether_mac:",
-                 cp.ether_mac,  " | cp.ether_ip:", cp.ether_ip)
+        v2_print(_who, "cp.ether_name:", comp.ether_name,  " | cp.ether_mac:",
+                 comp.ether_mac,  " | cp.ether_ip:", comp.ether_ip)
         # name: enp59s0  | mac: 28:f1:0e:2a:1a:ed  | ip: 192.168.0.12
-        v2_print(_who, "cp.wifi_name :", cp.wifi_name, " | cp.wifi_mac :",
-                 cp.wifi_mac, " | cp.wifi_ip :", cp.wifi_ip)
+        v2_print(_who, "cp.wifi_name :", comp.wifi_name, " | cp.wifi_mac :",
+                 comp.wifi_mac, " | cp.wifi_ip :", comp.wifi_ip)
         # name : wlp60s0  | mac : 9c:b6:d0:10:37:f7  | ip : 192.168.0.10
 
+    def __getattr__(self, name):
+        """ self.mac_dicts, etc. are owned by self.registry """
+        if name in DeviceRegistry.LISTS:
+            return getattr(self.__dict__['registry'], name)
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        """ ni.mac_dicts = json.loads(...) replaces list inside self.registry
+            Python 2 old style class can't use @property setters.
+        """
+        if name in DeviceRegistry.LISTS:
+            self.__dict__['registry'].assign(name, value)
+        else:
+            self.__dict__[name] = value
+
+    def read_hosts(self):
+        """ Read /etc/hosts directly instead of running `getent hosts`.
+            Comments and blank lines are removed. Same format as getent:
+                '192.168.0.19    SONY.LAN Sony Bravia KDL TV Ethernet ac:9b:...'
+
+            Falls back to `getent hosts` when /etc/hosts can't be read.
+            :returns: list of host strings
+        """
+        _who = self.who + "read_hosts():"
+        hosts = []
+        try:
+            with open("/etc/hosts", "r") as f:
+                lines = f.read().splitlines()
+        except (IOError, OSError) as err:
+            v1_print(_who, "/etc/hosts error:", err, "Using `getent hosts`.")
+            event = self.runCommand(["getent", "hosts"], _who)
+            if event['returncode'] != 0:
+                return hosts  # Empty list for now
+            return event['output'].split("\n")
+
+        self.host_names = {}  # IPv4 address to first host name for read_arp()
+        for line in lines:
+            parts = line.split("#", 1)[0].split()
+            if len(parts) < 2:
+                continue  # Blank line, comment or IP without a host name
+            hosts.append(parts[0].ljust(15) + " " + " ".join(parts[1:]))
+            if "." in parts[0] and parts[0] not in self.host_names:
+                self.host_names[parts[0]] = parts[1]
+
+        return hosts
+
+    def read_arp(self):
+        """ Read kernel neighbour table /proc/net/arp instead of running `arp -a`.
+
+            /proc/net/arp format:
+IP address       HW type     Flags       HW address            Mask     Device
+192.168.0.19     0x1         0x2         ac:9b:0a:df:3f:d9     *        enp59s0
+192.168.0.17     0x1         0x0         00:00:00:00:00:00     *        enp59s0
+
+            Flags 0x0 is an incomplete entry. Returned in `arp -a` format:
+                'SONY.LAN (192.168.0.19) at ac:9b:0a:df:3f:d9 [ether] on enp59s0'
+                'TCL.LAN (192.168.0.17) at <incomplete> on enp59s0'
+
+            Names come from read_hosts(), otherwise a reverse DNS lookup
+            like `arp -a` does, otherwise "?". Falls back to `arp -a` when
+            /proc/net/arp can't be read (not Linux?).
+
+            self.neighbours = {mac: {"ip": ip, "name": name, "device": dev}}
+                None when neither /proc/net/arp nor `arp -a` could be read.
+            :returns: list of `arp -a` formatted strings
+        """
+        _who = self.who + "read_arp():"
+        self.neighbours = {}
+        try:
+            with open("/proc/net/arp", "r") as f:
+                lines = f.read().splitlines()[1:]  # Skip heading line
+        except (IOError, OSError) as err:
+            v1_print(_who, "/proc/net/arp error:", err, "Using `arp -a`.")
+            event = self.runCommand(["arp", "-a"], _who)
+            if event['returncode'] != 0:
+                self.neighbours = None  # neighbour_diff() doesn't know removed
+                return []  # Empty list for now
+            devices = event['output'].split("\n")
+            for device in devices:
+                # 'SONY.LAN (192.168.0.19) at ac:9b:0a:df:3f:d9 [ether] on enp59s0'
+                parts = device.split()
+                if len(parts) < 7 or parts[4] != "[ether]":
+                    continue  # <incomplete> or blank line
+                self.neighbours[parts[3]] = {"ip": parts[1][1:-1],
+                                             "name": parts[0], "device": parts[6]}
+            return devices
+
+        try:
+            host_names = self.host_names  # Built by read_hosts()
+        except AttributeError:
+            host_names = {}
+
+        devices = []
+        for line in lines:
+            parts = line.split()
+            if len(parts) < 6:
+                continue
+            ip, flags, mac, dev = parts[0], parts[2], parts[3], parts[5]
+            name = host_names.get(ip, "?")
+            if int(flags, 16) & 0x2 == 0:  # ATF_COM flag off = incomplete
+                devices.append(name + " (" + ip + ") at <incomplete> on " + dev)
+                continue
+            if name == "?":
+                name = self.reverse_name(ip)  # E.G. "SONY.LAN" from router DNS
+            devices.append(name + " (" + ip + ") at " + mac + " [ether] on " + dev)
+            self.neighbours[mac] = {"ip": ip, "name": name, "device": dev}
+
+        return devices
+
+    def reverse_name(self, ip):
+        """ Return host name from reverse DNS lookup, else "?".
+            Names found are remembered for every NetworkInfo() instance.
+        """
+        name = NetworkInfo.dns_names.get(ip)
+        if name is None:
+            try:
+                name = socket.gethostbyaddr(ip)[0]
+            except socket.error:  # socket.herror no name, no DNS server, etc.
+                return "?"  # Try again next read_arp()
+            NetworkInfo.dns_names[ip] = name
+        return name
+
+    def neighbour_diff(self):
+        """ Compare self.neighbours with previous NetworkInfo() instance.
+            First instance (ni at startup) reports every neighbour as added.
+
+            :returns: {"added": [mac...], "removed": [mac...],
+                       "changed": [mac...], "unchanged": [mac...]}
+                None when read_arp() couldn't read a neighbour table.
+        """
+        _who = self.who + "neighbour_diff():"
+        if self.neighbours is None:
+            v1_print(_who, "No neighbour table. Keeping last neighbours.")
+            return None
+        last = NetworkInfo.last_neighbours  # Class variable shared by ni & rd
+        if last is None:
+            last = {}
+        diff = {"added": [], "removed": [], "changed": [], "unchanged": []}
+        for mac, neighbour in self.neighbours.items():
+            if mac not in last:
+                diff["added"].append(mac)
+            elif last[mac] != neighbour:
+                diff["changed"].append(mac)
+            else:
+                diff["unchanged"].append(mac)
+        diff["removed"] = [mac for mac in last if mac not in self.neighbours]
+        NetworkInfo.last_neighbours = self.neighbours
+
+        v2_print(_who, "added:", diff["added"], "removed:", diff["removed"],
+                 "changed:", diff["changed"])
+        return diff
+
     def adb_reset(self, background=False):
         """ Kill and restart ADB server. Takes 3 seconds so run in background 
             TV may give a message like:
@@ -634,17 +987,61 @@ class NetworkInfo(DeviceCommonSelf):
         # Subprocess run external command
         self.runCommand(command_line_list, _who)
 
+    def kasa_discover(self):
+        """ Broadcast Kasa get_sysinfo once and add plugs that aren't in
+            self.arp_results using `arp -a` format:
+                'SONY.Light (192.168.0.15) at 50:d4:f7:eb:41:35 [ether] on kasa'
+            A mac_dict with type_code GLO['HS1_SP'] is appended for each one.
+
+            Called by discover() and rediscoverWorker(), not __init__(), so
+            the global ni created at import doesn't wait for the broadcast.
+            Results saved in NetworkInfo.kasa_plugs shared by ni & rd so
+            test_for_instance() doesn't need to test plugs again.
+            GLO['KASA_DISCOVER_TIME'] of 0 turns off broadcast.
+
+            :returns: {mac: {"ip", "mac", "alias", "relay_state", "sysinfo"}}
+        """
+        _who = self.who + "kasa_discover():"
+        window = float(GLO['KASA_DISCOVER_TIME'])
+        if window <= 0.0:
+            NetworkInfo.kasa_plugs = {}
+            return NetworkInfo.kasa_plugs
+
+        _start = time.time()
+        plugs = kasa.discover(window)
+        try:
+            host_names = self.host_names  # Built by read_hosts()
+        except AttributeError:
+            host_names = {}
+
+        arp_macs = [device.split()[3] for device in self.arp_results
+                    if len(device.split()) > 3]
+        for mac, plug in plugs.items():
+            v2_print(_who, mac, plug['ip'], "'" + plug['alias'] + "'",
+                     "relay_state:", plug['relay_state'])
+            if mac in arp_macs or self.mac_dicts.find(mac) is not None:
+                continue  # arp or devices.json already knows the plug
+            name = host_names.get(plug['ip'], "?")
+            device = name + " (" + plug['ip'] + ") at " + mac + " [ether] on kasa"
+            self.arp_results.append(device)
+            self.mac_dicts.append({"mac": mac, "ip": plug['ip'], "name": name,
+                                   "alias": self.get_alias(mac),
+                                   "type_code": GLO['HS1_SP']})
+            v1_print(_who, "Smart plug not in arp cache:", device)
+
+        NetworkInfo.kasa_plugs = plugs
+        v1_print(_who, "Found", len(plugs), "smart plugs in",
+                 round(time.time() - _start, 3), "seconds.")
+        return plugs
+
     def get_alias(self, mac):
         """ Get Alias from self.hosts matching mac address
             host_mac = mac + "  " + ip.ljust(15) + name.ljust(16) + alias
         """
         _who = self.who + "get_alias():"
 
-        for host_mac in self.host_macs:
-            if mac in host_mac:
-                return host_mac[50:]
-
-        return "No Alias"
+        # 2026-10-18 dictionary lookup instead of searching every host_mac
+        return self.host_aliases.get(mac, "No Alias")
 
     def make_temp_file(self, stuff=None):
         """ Make temporary file with optional text. - NOT USED
@@ -677,109 +1074,77 @@ class NetworkInfo(DeviceCommonSelf):
 
         return temp_fname
 
-    def curl(self, JSON_str, subsystem, ip, rid="0", forgive=False):
-        """ Use sub-process curl to communicate with REST API
+    def curl(self, JSON_str, subsystem, ip, rid="0", forgive=False, log=True):
+        """ Communicate with Sony REST API.
             2024-10-21 - Broken for Sony Picture On/Off and Sony On/Off.
                 Use os_curl instead to prevent error message:
                      {'error': [403, 'Forbidden']}
+            2026-10-18 - bravia.py replaces `timeout curl` subprocess. The 403
+                was quotes inside Popen header arguments so curl() now works.
         """
         # noinspection PyProtectedMember
         _who = self.who + sys._getframe(1).f_code.co_name + "().curl():"
-        if not self.dependencies_installed:
-            v1_print(_who, "curl dependencies are not installed. Aborting...")
-            return None
-
-        command_line_list = ["timeout", GLO['CURL_TIME'], "curl", "-s",  # -s=Silent
-                             "-H", '"Content-Type: application/json; charset=UTF-8"',
-                             "-H", '"X-Auth-PSK: ' + GLO['SONY_PWD'] + '"',
-                             "--data", JSON_str,  # err: is unknown
-                             "http://" + ip + "/sony/" + subsystem]
-
-        event = self.runCommand(command_line_list, _who, forgive=forgive)
-
-        if event['returncode'] != 0:
-            # 2025-04-12 - Missing key/value: {"id": 99}
-            if forgive:
-                v1_print(_who, "event['returncode']:", event['returncode'])
-            else:
-                v0_print(_who, "event['returncode']:", event['returncode'])
-            return {"result": [{"status": event['returncode'], 'id': rid}]}
-
-        try:
-            reply_dict = json.loads(str(event['output']))  # str to convert from bytes
-        except ValueError:
-            v0_print(_who, "Invalid 'output':", event['output'])
-            # 2025-05-28 Add 'id' dictionary expected by checkReply() method.
-            reply_dict = {"result": [{'status': '"' + _who +
-                                                ' json.loads(event[output]) failed!"',
-                                     'id': rid}]}
-
-        v3_print(_who, "reply_dict:", reply_dict)
-        return reply_dict
+        return self.sonyRest(JSON_str, subsystem, ip, rid, forgive, _who, log)
 
     def os_curl(self, JSON_str, subsystem, ip, rid="0", forgive=False):
-        """ Use os.popen curl to communicate with REST API
+        """ Communicate with Sony REST API.
             2024-10-21 - os_curl supports Sony Picture On/Off using os.popen(). When
                 using regular ni.curl() Sony REST API returns {"error": 403}
+            2026-10-18 - bravia.py replaces os.popen() shell and curl.
         """
         # noinspection PyProtectedMember
         _who = self.who + sys._getframe(1).f_code.co_name + "().os_curl():"
+        return self.sonyRest(JSON_str, subsystem, ip, rid, forgive, _who)
 
-        self.cmdCaller = _who  # self.cmdXxx vars in DeviceCommonSelf() class
-        self.cmdStart = time.time()
-        self.cmdCommand = [
-            'timeout', str(GLO['CURL_TIME']), 'curl',
-            '-s', '-H', '"Content-Type: application/json; charset=UTF-8"',
-            '-H', '"X-Auth-PSK: ' + GLO['SONY_PWD'] + '"', '--data', "'" + JSON_str + "'",
-            'http://' + ip + '/sony/' + subsystem
-        ]
-        self.cmdString = ' '.join(self.cmdCommand)  # 2025-05-28 shorter
-        #self.cmdString = 'timeout ' + str(GLO['CURL_TIME']) + ' curl' +\
-        #    ' -s -H "Content-Type: application/json; charset=UTF-8" ' +\
-        #    ' -H "X-Auth-PSK: ' + GLO['SONY_PWD'] + '" --data ' + "'" + JSON_str + "'" +\
-        #    ' http://' + ip + '/sony/' + subsystem
+    def sonyRest(self, JSON_str, subsystem, ip, rid, forgive, _who, log=True):
+        """ POST to Sony REST API with NetworkInfo.sony_rest keep-alive pool.
+            Event logged the same as `timeout curl` so Discovery Errors and
+            Discovery Timings are unchanged. Same reply shapes as curl:
 
-        ''' run command with os.popen() because sp.Popen() fails on ">" '''
-        f = os.popen(self.cmdString + " 2>&1")
-        text = f.read().splitlines()
-        returncode = f.close()  # https://stackoverflow.com/a/70693068/6929343
-        returncode = 0 if returncode is None else returncode  # Added 2025-05-28
-        v3_print(_who, "text:", text)
+                {"result": [{"status": "active"}], "id": 50}  # Reply from TV
+                {"result": [{"status": 124, "id": "50"}]}  # Timeout (7 = refused)
 
-        ''' log event and v3_print debug lines '''
-        self.cmdOutput = "" if returncode != 0 else text
-        self.cmdError = "" if returncode == 0 else text
-        self.cmdReturncode = returncode
-        self.cmdDuration = time.time() - self.cmdStart
-        who = self.cmdCaller + " logEvent():"
-        self.logEvent(who, forgive=forgive, log=True)
-
-        #if returncode is not None:  # Changed 2025-05-28
-        if returncode:  # Added 2025-05-28
+            Socket timeout is GLO['CURL_TIME'] for connect and each read.
+        """
+        start = time.time()
+        returncode = 0
+        try:
+            text = NetworkInfo.sony_rest.post(ip, subsystem, JSON_str, GLO['SONY_PWD'],
+                                              float(GLO['CURL_TIME']))
+        except bravia.BraviaError as err:
+            returncode = err.code
+            text = str(err)
+
+        # log event and v3_print debug lines
+        with self.cmdLock:
+            self.cmdCaller = _who  # self.cmdXxx vars in DeviceCommonSelf() class
+            self.cmdStart = start
+            self.cmdCommand = ["POST", "http://" + ip + "/sony/" + subsystem, JSON_str]
+            self.cmdString = ' '.join(self.cmdCommand)
+            self.cmdOutput = text if returncode == 0 else ""
+            self.cmdError = "" if returncode == 0 else text
+            self.cmdReturncode = returncode
+            self.cmdDuration = time.time() - start
+            self.logEvent(_who, forgive=forgive, log=log)
+
+        if returncode != 0:
+            # 2025-04-12 - Missing key/value: {"id": 99}
             if forgive:
-                v1_print(_who, "text:")
-                v1_print(" ", text)  # string, list
-                v1_print(_who, "returncode:", returncode)
+                v1_print(_who, "returncode:", returncode, text)
             else:
-                v0_print(_who, "text:")
-                v0_print(" ", text)  # string, list
-                v0_print(_who, "returncode:", returncode)
-            # 2025-05-28 Add 'id' dictionary expected by checkReply() method.
-            return {'result': [{'status': '"' + _who + ' returncode: ' +
-                                          str(returncode) + '"', 'id': rid}]}
+                v0_print(_who, "returncode:", returncode, text)
+            return {"result": [{"status": returncode, 'id': rid}]}
 
         try:
-            reply_dict = json.loads(text[0])
+            reply_dict = json.loads(text)
         except ValueError:
-            v0_print(_who, "Invalid 'text':", text)  # Sample below on 2024-10-08
+            v0_print(_who, "Invalid 'text':", text)
             # 2025-05-28 Add 'id' dictionary expected by checkReply() method.
             reply_dict = {"result": [{'status': '"' + _who +
                                                 ' json.loads(text) failed!"',
                                      'id': rid}]}
 
         v3_print(_who, "reply_dict:", reply_dict)
-        # NetworkInfo().turnPictureOn().os_curl(): reply_dict:
-        #   {'result': [], 'id': 52}
         return reply_dict
 
     def get_mac_dict(self, mac):
@@ -792,10 +1157,10 @@ class NetworkInfo(DeviceCommonSelf):
         """
         _who = self.who + "get_mac_dict():"
 
-        for mac_dict in self.mac_dicts:
-            if mac_dict['mac'] == mac:
-                v2_print(_who, "Found existing ni.mac_dict:", mac_dict['name'])
-                return mac_dict
+        mac_dict = self.registry.macDict(mac)
+        if mac_dict is not None:
+            v2_print(_who, "Found existing ni.mac_dict:", mac_dict['name'])
+            return mac_dict
 
         v0_print(_who, "mac address unknown: '" + str(mac) + "'")
 
@@ -810,9 +1175,9 @@ class NetworkInfo(DeviceCommonSelf):
         """
         _who = self.who + "inst_for_mac():"
 
-        for instance in self.instances:
-            if instance['mac'] == mac:
-                return instance
+        instance = self.registry.instance(mac)
+        if instance is not None:
+            return instance
 
         if not_found_error:
             v2_print(_who, "mac address unknown:  '" + str(mac) + "'")
@@ -828,9 +1193,9 @@ class NetworkInfo(DeviceCommonSelf):
         """
         _who = self.who + "layout_for_mac():"
 
-        for layout in self.layouts:
-            if layout['mac'] == mac:
-                return layout
+        layout = self.registry.layout(mac)
+        if layout is not None:
+            return layout
         # {"mac": "", "name": "", "coords_pct": (),  <--- REQUIRED for DeviceCanvas()
         #  "short_name": "", "long_name": "", "tree_images": [], "layout_images": []}
         #   ^^^ ---| key_value pairs maintained in "Details" context menu.
@@ -841,10 +1206,18 @@ class NetworkInfo(DeviceCommonSelf):
         layout = {}  # before using test with `if bool(layout):`
         return layout
 
-    def test_for_instance(self, arp):
+    def test_for_instance(self, arp, deadline=None):
         """ Test if arp dictionary is a known device type and create
             an instance for the device.
+
+            2026-10-18 All device types are tested at the same time in pool
+                threads. The first class in test order to match wins, so a
+                fast Router() match waits for SmartPlugHS100() to fail first.
+                Each call has its own pool with a thread for every device
+                type, so no test waits for a free thread past the deadline.
+
         :param arp: dictionary {mac: ip: name: alias: type_code:}
+        :param deadline: time.time() to stop waiting. None = DISCOVER_HOST_TIME
         :returns: {mac: "xx:xx...", instance: <object>}
         """
         _who = self.who + "test_for_instance():"
@@ -861,62 +1234,417 @@ class NetworkInfo(DeviceCommonSelf):
             v2_print(_who, "Invalid IP: '" + str(ip) + "'.")
             return {}
 
-        instance = {}
+        # 2026-10-18 Smart plug replied to kasa_discover() broadcast. No test.
+        plug = NetworkInfo.kasa_plugs.get(mac)
+        if plug is not None and plug['ip'] == ip:
+            inst = SmartPlugHS100(mac, ip, arp['name'], arp['alias'])
+            inst.powerStatus = "ON" if plug['relay_state'] == 1 else "OFF"
+            fp.recordMatch(mac, "SmartPlugHS100")
+            v1_print(mac, " # ", ip.ljust(15),
+                     "##  is a " + inst.type + " code =", inst.type_code)
+            return {"mac": mac, "instance": inst}
+
+        if deadline is None:
+            deadline = time.time() + float(GLO['DISCOVER_HOST_TIME'])
+
+        # Test smart plug first because they seem most "fragile"
+        test_order = [SmartPlugHS100, Router, hc.Computer, LaptopDisplay,
+                      SonyBraviaKdlTV, GoogleAndroidTV, BluetoothLedLightStrip]
+        # Device type last found is tested first. Recent failures are skipped.
+        test_order = fp.testOrder(mac, test_order)
 
         def test_one(cname):
-            """ Test if hs100, SonyTV, GoogleTV, Bluetooth LED, Laptop, etc. """
+            """ Test if hs100, SonyTV, GoogleTV, Bluetooth LED, Laptop, etc.
+                Runs in pool thread. Returns instance or None.
+            """
             inst = cname(arp['mac'], arp['ip'], arp['name'], arp['alias'])
             if not inst.dependencies_installed:
                 # 2025-06-18 TODO: How to prevent instance init more than once to
                 #   check if dependencies are installed? Global supported variables
                 # v0_print("Missing Dependencies:", cname.required)
-                return False
+                return None
             if not inst.isDevice(forgive=True):
-                return False
+                return None
+            return inst
 
-            v1_print(arp['mac'], " # ", arp['ip'].ljust(15),
-                     "##  is a " + inst.type + " code =", inst.type_code)
+        pool = hc.WorkerPool(len(test_order), "test_for_instance")
 
-            ''' 2025-01-13 Caller must do this:
-            arp['type_code'] = inst.type_code  # Assign 10, 20, 30...
-            instances.append({"mac": arp['mac'], "instance": inst})
-            view_order.append(arp['mac'])
-            if update:
-                ni.mac_dicts[i] = arp  # Update arp list
-            '''
-            instance["mac"] = arp['mac']
-            instance["instance"] = inst
+        finished = Queue.Queue()  # Wake up below when any test finishes
+        jobs = [pool.submit(test_one, (cname,), callback=finished.put)
+                for cname in test_order]
 
-            return True  # Grab next type
+        def first_match(all_done=True):
+            """ Return (decided, inst). Earlier class in test_order wins.
+                :param all_done: When False (deadline passed), skip tests
+                    still running and take first finished match.
+            """
+            for job in jobs:
+                if not job.done():
+                    if all_done:
+                        return False, None  # Earlier class still testing
+                    continue
+                if job.result is not None:
+                    return True, job.result
+            return True, None  # No device type matched
 
-        # Test smart plug first because they seem most "fragile"
-        if test_one(SmartPlugHS100):
-            return instance
+        while True:
+            decided, inst = first_match()
+            if decided:
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                _decided, inst = first_match(all_done=False)
+                v1_print(_who, arp['ip'], "exceeded DISCOVER_HOST_TIME:",
+                         GLO['DISCOVER_HOST_TIME'], "found:", inst)
+                break
+            try:
+                finished.get(timeout=remaining)
+            except Queue.Empty:
+                pass  # Deadline passed
+
+        for job in jobs:
+            job.cancel()  # Early stop. Tests not started yet are skipped.
+        pool.close()
+
+        for cname, job in zip(test_order, jobs):
+            if not job.done() or job.cancelled or job.error is not None:
+                continue  # Unknown result. Test again next time.
+            if job.result is None:
+                fp.recordMiss(mac, cname.__name__)
+            elif job.result is inst:
+                fp.recordMatch(mac, cname.__name__)
+
+        if inst is None:
+            if arp['ip'] == "192.168.0.17":  # "devices", "-l"
+                # Special testing. android.isDevice was failing without extra time.
+                v0_print(_who, "Android TV failed!:", arp['ip'])
+            return {}
 
-        if test_one(Router):
-            return instance
+        v1_print(arp['mac'], " # ", arp['ip'].ljust(15),
+                 "##  is a " + inst.type + " code =", inst.type_code)
 
-        if test_one(Computer):
-            return instance
+        ''' 2025-01-13 Caller must do this:
+        arp['type_code'] = inst.type_code  # Assign 10, 20, 30...
+        instances.append({"mac": arp['mac'], "instance": inst})
+        view_order.append(arp['mac'])
+        if update:
+            ni.mac_dicts[i] = arp  # Update arp list
+        '''
+        instance = {"mac": arp['mac'], "instance": inst}
+        if inst.type_code == GLO['ADB_TV']:
+            v0_print(_who, "Android TV found:", arp['ip'])
+            v0_print("instance:", instance, "\n")
 
-        if test_one(LaptopDisplay):
-            return instance
+        return instance
 
-        if test_one(SonyBraviaKdlTV):
-            return instance
 
-        if test_one(GoogleAndroidTV):
-            v0_print(_who, "Android TV found:", arp['ip'])
-            v0_print("instance:", instance, "\n")
-            return instance
-        elif arp['ip'] == "192.168.0.17":  # "devices", "-l"
-            # Special testing. android.isDevice was failing without extra time.
-            v0_print(_who, "Android TV failed!:", arp['ip'])
+class DeviceFingerprints(DeviceCommonSelf):
+    """ Device types tested for each MAC address. Saved in fingerprints.json
+        beside devices.json so rediscovery only tests new arp devices fully.
 
-        if test_one(BluetoothLedLightStrip):
-            return instance
+        fp = DeviceFingerprints() created on startup. fp.openFile() called by
+        open_files(). fp.saveFile() called by save_files() and discover().
 
-        return {}
+        self.prints = {mac: {"match": "SmartPlugHS100", "match_time": 9.99,
+                             "match_misses": 0,
+                             "misses": {"Router": 9.99, "Computer": 9.99}}}
+
+        Matches expire after GLO['FINGERPRINT_HIT_DAYS'] and misses expire
+        after GLO['FINGERPRINT_MISS_DAYS'] so a replaced device is found again.
+        The matched class is never skipped. A TV that is off fails one test,
+        so the match is only forgotten after MATCH_MISSES failures in a row.
+    """
+
+    MATCH_MISSES = 3  # Failures in a row before matched class is forgotten
+
+    def __init__(self):
+        """ DeviceCommonSelf(): Variables used by all classes """
+        DeviceCommonSelf.__init__(self, "DeviceFingerprints().")  # Define self.who
+
+        self.prints = {}  # Device type tests by MAC address
+        self.lock = threading.Lock()  # test_for_instance() runs in threads
+        self.changed = False  # Only write file when something changed
+
+    def fname(self):
+        """ Return fingerprints.json full path in user data directory """
+        return g.USER_DATA_DIR + os.sep + GLO['FINGERPRINT_FNAME']
+
+    def openFile(self):
+        """ Read fingerprints.json if it exists """
+        _who = self.who + "openFile():"
+        fname = self.fname()
+        if not os.path.isfile(fname):
+            return
+        with open(fname, "r") as f:
+            v2_print(_who, "Opening device fingerprints file:", fname)
+            try:
+                self.prints = json.loads(f.read())
+            except ValueError:
+                v0_print(_who, "Invalid JSON. Fingerprints discarded:", fname)
+                self.prints = {}
+        self.changed = False
+
+    def saveFile(self):
+        """ Write fingerprints.json when changes were recorded """
+        if not self.changed:
+            return
+        with self.lock:
+            with open(self.fname(), "w") as f:
+                f.write(json.dumps(self.prints))
+            self.changed = False
+
+    def testOrder(self, mac, test_order):
+        """ Reorder device type classes for test_for_instance().
+            :param mac: MAC address from arp dictionary
+            :param test_order: list of device type classes in default order
+            :returns: New list. Last match first. Recent misses removed.
+        """
+        _who = self.who + "testOrder():"
+        now = time.time()
+        hit_secs = float(GLO['FINGERPRINT_HIT_DAYS']) * 86400.0
+        miss_secs = float(GLO['FINGERPRINT_MISS_DAYS']) * 86400.0
+        with self.lock:
+            fingerprint = self.prints.get(mac, {})
+            match = fingerprint.get("match")
+            if match and now - fingerprint.get("match_time", 0.0) > hit_secs:
+                match = None  # Expired. Test in default order.
+            misses = fingerprint.get("misses", {})
+            skip = [name for name in misses if now - misses[name] <= miss_secs]
+
+        new_order = []
+        for cname in test_order:
+            if cname.__name__ == match:
+                new_order.insert(0, cname)
+            elif cname.__name__ not in skip:
+                new_order.append(cname)
+
+        if len(new_order) != len(test_order):
+            v2_print(_who, mac, "skipping:", skip)
+        return new_order
+
+    def recordMatch(self, mac, name):
+        """ Device type class name matched mac """
+        with self.lock:
+            fingerprint = self.prints.setdefault(mac, {"misses": {}})
+            fingerprint["match"] = name
+            fingerprint["match_time"] = time.time()
+            fingerprint["match_misses"] = 0
+            fingerprint.setdefault("misses", {}).pop(name, None)
+            self.changed = True
+
+    def recordMiss(self, mac, name):
+        """ Device type class name did not match mac """
+        with self.lock:
+            fingerprint = self.prints.setdefault(mac, {"misses": {}})
+            if fingerprint.get("match") == name:  # Off or slow? Never skipped
+                misses = fingerprint.get("match_misses", 0) + 1
+                fingerprint["match_misses"] = misses
+                if misses >= self.MATCH_MISSES:
+                    fingerprint["match"] = None  # Device was replaced?
+                    fingerprint["match_misses"] = 0
+            else:
+                fingerprint.setdefault("misses", {})[name] = time.time()
+            self.changed = True
+
+    def forget(self, mac):
+        """ Forget mac so all device types are tested next time """
+        with self.lock:
+            if self.prints.pop(mac, None) is not None:
+                self.changed = True
+
+
+class EmeterCollector(DeviceCommonSelf):
+    """ HS110 Smart Plug power draw history saved in emeter.db beside
+        devices.json. em = EmeterCollector() created on startup. em.start()
+        called by main() after open_files(). em.stop() called by exitApp().
+
+        Thread polls emeter get_realtime every GLO['EMETER_SECONDS'] for
+        smart plugs with "ENE" in get_sysinfo "feature". Polling is paused
+        while HomA is suspending or exiting.
+
+        Three tiers. Minute and Hour are updated as each sample is stored:
+            Raw    - Every sample. Kept GLO['EMETER_RAW_DAYS']
+            Minute - Count, sum, min & max power. Kept GLO['EMETER_MINUTE_DAYS']
+            Hour   - Count, sum, min & max power. Kept forever
+
+        Integers only: Time in seconds, power in mW, voltage in mV, current
+        in mA and total in Wh. Tables are WITHOUT ROWID keyed by (PlugId, Time).
+
+        em.query(mac, start, end) picks the tier so a month is about 720 rows.
+    """
+
+    TIERS = (("Raw", 1), ("Minute", 60), ("Hour", 3600))  # Table, seconds
+
+    def __init__(self):
+        """ DeviceCommonSelf(): Variables used by all classes """
+        DeviceCommonSelf.__init__(self, "EmeterCollector().")  # Define self.who
+
+        self.con = None  # sqlite3 connection shared by thread and query()
+        self.lock = threading.Lock()  # One thread at a time uses self.con
+        self.plug_ids = {}  # {mac: Plug.Id}
+        self.supported = {}  # {mac: True/False} emeter in get_sysinfo feature
+        self.thread = None  # self.worker() thread
+        self.stop_event = threading.Event()  # Set by self.stop()
+        self.last_prune = 0.0  # Old Raw and Minute rows deleted every hour
+
+    def fname(self):
+        """ Return emeter.db full path in user data directory """
+        return g.USER_DATA_DIR + os.sep + GLO['EMETER_FNAME']
+
+    def openFile(self):
+        """ Open emeter.db and create tables if they don't exist """
+        _who = self.who + "openFile():"
+        v2_print(_who, "Opening emeter database:", self.fname())
+        self.con = sqlite3.connect(self.fname(), check_same_thread=False)
+        self.con.execute("CREATE TABLE IF NOT EXISTS Plug(" +
+                         "Id INTEGER PRIMARY KEY, Mac TEXT UNIQUE)")
+        self.con.execute("CREATE TABLE IF NOT EXISTS Raw(" +
+                         "PlugId INTEGER, Time INTEGER, Power INTEGER, " +
+                         "Voltage INTEGER, Current INTEGER, Total INTEGER, " +
+                         "PRIMARY KEY(PlugId, Time)) WITHOUT ROWID")
+        for table in ("Minute", "Hour"):
+            self.con.execute("CREATE TABLE IF NOT EXISTS " + table + "(" +
+                             "PlugId INTEGER, Time INTEGER, Count INTEGER, " +
+                             "Sum INTEGER, Min INTEGER, Max INTEGER, " +
+                             "Total INTEGER, PRIMARY KEY(PlugId, Time)) " +
+                             "WITHOUT ROWID")
+        self.con.commit()
+        for Id, mac in self.con.execute("SELECT Id, Mac FROM Plug"):
+            self.plug_ids[mac] = Id
+
+    def closeFile(self):
+        """ Close emeter.db """
+        with self.lock:
+            if self.con:
+                self.con.close()
+                self.con = None
+
+    def start(self):
+        """ Open emeter.db and start self.worker() thread """
+        if self.thread is not None or float(GLO['EMETER_SECONDS']) <= 0.0:
+            return  # Already running or turned off
+        if self.con is None:
+            self.openFile()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.worker, name="emeter")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """ Stop self.worker() thread and close emeter.db """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(float(GLO['PLUG_TIME']) + 1.0)
+            self.thread = None
+        self.closeFile()
+
+    def worker(self):
+        """ Thread polling every HS110 Smart Plug. Never touches tkinter. """
+        _who = self.who + "worker():"
+        while not self.stop_event.wait(float(GLO['EMETER_SECONDS'])):
+            if app is not None and not app.isActive:
+                continue  # Suspending or exiting
+            plugs = [instance['instance'] for instance in list(ni.instances)
+                     if instance['instance'].type_code == GLO['HS1_SP']]
+            for inst in plugs:
+                if self.stop_event.is_set():
+                    break
+                try:
+                    if inst.mac not in self.supported:
+                        feature = inst.kasaClient().getSysinfo().get("feature", "")
+                        self.supported[inst.mac] = "ENE" in feature
+                        v1_print(_who, inst.name, "emeter:", self.supported[inst.mac])
+                    if self.supported[inst.mac]:
+                        self.record(inst.mac, inst.kasaClient().getRealtime())
+                except kasa.KasaError as err:
+                    v2_print(_who, inst.name, err)
+            self.prune()
+
+    def record(self, mac, realtime, now=None):
+        """ Store one get_realtime sample in Raw and update Minute and Hour.
+            Firmware v1 uses W, V, A, kWh. Firmware v2 uses mW, mV, mA, Wh.
+        """
+        def value(v2_key, v1_key, scale):
+            """ Integer milli units from either firmware """
+            if v2_key in realtime:
+                return int(round(realtime[v2_key]))
+            return int(round(float(realtime.get(v1_key, 0.0)) * scale))
+
+        now = int(time.time()) if now is None else int(now)
+        power = value("power_mw", "power", 1000)
+        voltage = value("voltage_mv", "voltage", 1000)
+        current = value("current_ma", "current", 1000)
+        total = value("total_wh", "total", 1000)
+
+        with self.lock:
+            if self.con is None:
+                return  # Closed by self.stop()
+            plug_id = self.plugId(mac)
+            self.con.execute("INSERT OR REPLACE INTO Raw VALUES(?, ?, ?, ?, ?, ?)",
+                             (plug_id, now, power, voltage, current, total))
+            for table, seconds in self.TIERS[1:]:
+                bucket = now - now % seconds
+                self.con.execute(
+                    "INSERT OR IGNORE INTO " + table + " VALUES(?, ?, 0, 0, ?, ?, ?)",
+                    (plug_id, bucket, power, power, total))
+                self.con.execute(
+                    "UPDATE " + table + " SET Count = Count + 1, Sum = Sum + ?, " +
+                    "Min = MIN(Min, ?), Max = MAX(Max, ?), Total = ? " +
+                    "WHERE PlugId = ? AND Time = ?",
+                    (power, power, power, total, plug_id, bucket))
+            self.con.commit()
+
+    def plugId(self, mac):
+        """ Return Plug.Id for mac. Caller holds self.lock. """
+        if mac not in self.plug_ids:
+            self.con.execute("INSERT OR IGNORE INTO Plug(Mac) VALUES(?)", (mac,))
+            self.plug_ids[mac] = self.con.execute(
+                "SELECT Id FROM Plug WHERE Mac = ?", (mac,)).fetchone()[0]
+        return self.plug_ids[mac]
+
+    def prune(self):
+        """ Delete Raw and Minute rows older than retention days every hour """
+        now = time.time()
+        if now - self.last_prune < 3600.0:
+            return
+        self.last_prune = now
+        with self.lock:
+            if self.con is None:
+                return
+            self.con.execute("DELETE FROM Raw WHERE Time < ?", (int(
+                now - float(GLO['EMETER_RAW_DAYS']) * 86400.0),))
+            self.con.execute("DELETE FROM Minute WHERE Time < ?", (int(
+                now - float(GLO['EMETER_MINUTE_DAYS']) * 86400.0),))
+            self.con.commit()
+
+    def query(self, mac, start, end=None, tier=None):
+        """ Return power history for mac between start and end times.
+
+            :param tier: "Raw", "Minute" or "Hour". None = Raw up to 6 hours,
+                Minute up to 2 days, otherwise Hour (720 rows for a month).
+            :returns: [(time, average mW, min mW, max mW, total Wh), ...]
+        """
+        end = time.time() if end is None else end
+        if tier is None:
+            span = end - start
+            tier = "Raw" if span <= 6 * 3600 else "Minute" if span <= 2 * 86400 \
+                else "Hour"
+        seconds = dict(self.TIERS).get(tier)
+        if seconds is None:
+            raise ValueError("Invalid tier: " + str(tier))
+        start = int(start) - int(start) % seconds  # Include bucket start is in
+
+        if tier == "Raw":
+            sql_text = "SELECT Time, Power, Power, Power, Total FROM Raw "
+        else:
+            sql_text = "SELECT Time, Sum / Count, Min, Max, Total FROM " + tier + " "
+        sql_text += "WHERE PlugId = ? AND Time >= ? AND Time <= ? ORDER BY Time"
+
+        with self.lock:
+            if self.con is None or mac not in self.plug_ids:
+                return []
+            return self.con.execute(
+                sql_text, (self.plug_ids[mac], int(start), int(end))).fetchall()
 
 
 class TreeviewRow(DeviceCommonSelf):
@@ -1008,6 +1736,9 @@ class TreeviewRow(DeviceCommonSelf):
             return  # Shutting down
 
         for iid in self.tree.get_children():
+            # 2026-10-18 Check hidden MAC column before calling self.Get()
+            if self.tree.item(iid)['values'][2] != inst.mac:
+                continue
             self.Get(iid)
             if self.inst.mac == inst.mac and self.inst.type == inst.type:
                 return iid
@@ -2232,6 +2963,7 @@ class SystemMonitor(DeviceCommonSelf):
         self.last_sensor_check = 0.0  # check every x seconds
         self.last_sensor_log = 0.0  # log every x seconds
         self.skipped_checks = 0  # Skipped check when last check < x seconds
+        self.sensors_job = None  # hc.CommandJob() running `sensors`
         self.number_checks = 0  # Number of checks
         self.skipped_fan_same = 0  # Don't log when fan speed the same
         self.skipped_fan_diff = 0  # Don't log when fan speed different by < x RPM
@@ -2278,13 +3010,26 @@ class SystemMonitor(DeviceCommonSelf):
         if now - self.last_sensor_check < GLO['SENSOR_CHECK']:
             self.skipped_checks += 1
             return
+        if self.sensors_job and not self.sensors_job.done():
+            self.skipped_checks += 1
+            return  # Last `sensors` is still running
         self.last_sensor_check = now
 
         # Run `sensors` command every GLO['SENSOR_CHECK'] seconds
+        # 2026-10-18 In hc.executor thread. Was blocking tkinter thread.
         self.number_checks += 1
         log = True if len(self.sensors_log) == 0 else False
-        event = self.runCommand(['sensors'], _who, log=log)
-        result = event['output']
+        self.sensors_job = self.runCommandAsync(
+            ['sensors'], _who, log=log, timeout=float(GLO['SENSOR_CHECK']),
+            callback=self.applySensors)
+
+    def applySensors(self, job):
+        """ Parse `sensors` output from self.Sensors() on tkinter thread """
+        _who = self.who + "applySensors():"
+        if job.result is None:
+            return  # Cancelled or `sensors` couldn't start
+        now = job.queued_time  # When self.Sensors() ran `sensors`
+        result = job.result['output']
 
         # Parse `sensors` output to dictionary key/value pairs
         dell_found = False
@@ -2810,9 +3555,13 @@ class LaptopDisplay(DeviceCommonSelf):
 
 
 class SmartPlugHS100(DeviceCommonSelf):
-    """ TP-Link Kasa Smart Plug HS100/HS103/HS110 using hs100.sh
+    """ TP-Link Kasa Smart Plug HS100/HS103/HS110 using kasa.py
         https://github.com/branning/hs100
         TPlink is the manufacturing brand. Kasa, Deco, and Tapo are all product lines produced by TPlink.
+
+        2026-10-18 hs100.sh forked nc, base64 and od for every command and
+            turnOn() / turnOff() ran it twice. kasa.KasaClient() keeps the
+            connection open and sets the power with one exchange.
     """
 
     def __init__(self, mac, ip, name, alias):
@@ -2828,19 +3577,19 @@ class SmartPlugHS100(DeviceCommonSelf):
 
         self.type = "TP-Link HS100 Smart Plug"
         self.type_code = GLO['HS1_SP']
-        self.requires = ['hs100.sh', 'nc', 'base64', 'od', 'nmap', 'shasum', 'arp']
+        self.requires = []  # kasa.py only uses Python sockets
         self.installed = []
         self.checkDependencies(self.requires, self.installed)
+        self.port = kasa.PORT  # Can be changed for a local fake plug server
+        self.kasa = kasa.KasaClient(ip, self.port, float(GLO['PLUG_TIME']))
 
         _who = self.who + "__init__():"
         v3_print(_who, "Dependencies:", self.requires)
         v3_print(_who, "Installed?  :", self.installed)
-        if not self.dependencies_installed:
-            v1_print(_who, "Smart Plug hs100.sh dependencies are not installed.")
 
     def isDevice(self, forgive=False):
         """ Return True if "On" or "Off", False if no communication
-            If forgive=True then don't report pipe.returncode != 0
+            If forgive=True then don't report communication errors
         """
         _who = self.who + "isDevice():"
         v2_print(_who, "Test if device is a TP-Link Kasa HS100 Smart Plug:", self.ip)
@@ -2860,50 +3609,38 @@ class SmartPlugHS100(DeviceCommonSelf):
         return False
 
     def turnOn(self, forgive=False):
-        """ Turn on TP-Link Smart Plug using hs100.sh script.
-            If forgive=True then don't report pipe.returncode != 0
+        """ Turn on TP-Link Smart Plug.
+            If forgive=True then don't report communication errors
         """
         _who = self.who + "turnOn():"
         v2_print(_who, "Turn On TP-Link Kasa HS100 Smart Plug:", self.ip)
 
-        Reply = self.getPower(forgive=forgive)  # Get current power status
-
+        Reply = self.setPower("ON", forgive=forgive)
         if Reply == "?":
             v2_print(_who, self.ip, "- Not a Smart Plug!")
             return "?"
 
-        if Reply == "ON":
-            v2_print(_who, self.ip, "- is already turned on. Skipping")
-            return "ON"
-
-        self.setPower("ON")
         v2_print(_who, self.ip, "- Smart Plug turned 'ON'")
         return "ON"
 
     def turnOff(self, forgive=False):
-        """ Turn off TP-Link Smart Plug using hs100.sh script.
-            If forgive=True then don't report pipe.returncode != 0
+        """ Turn off TP-Link Smart Plug.
+            If forgive=True then don't report communication errors
         """
-        _who = self.who + "turnOn():"
+        _who = self.who + "turnOff():"
         v2_print(_who, "Turn Off TP-Link Kasa HS100 Smart Plug:", self.ip)
 
-        Reply = self.getPower(forgive=forgive)
-
+        Reply = self.setPower("OFF", forgive=forgive)
         if Reply == "?":
             v2_print(_who, self.ip, "- Not a Smart Plug!")
             return "?"
 
-        if Reply == "OFF":
-            v2_print(_who, self.ip, "- is already turned off. Skipping")
-            return "OFF"
-
-        self.setPower("OFF")
         v2_print(_who, self.ip, "- Smart Plug turned 'OFF'")
         return "OFF"
 
     def getPower(self, forgive=False):
-        """ Return True if "On" or "Off", False if no communication
-            If forgive=True then don't report pipe.returncode != 0
+        """ Return "ON" or "OFF", "ERROR" if no communication
+            If forgive=True then don't report communication errors
 
             NOTE1: Occasionally a HS103 smart plug stops reporting status.
             First try unplugging and replugging into wall outlet.
@@ -2912,49 +3649,87 @@ class SmartPlugHS100(DeviceCommonSelf):
                           "hs100.sh on -i <IP>"
             Then rerun "homa.py -v" to see it if shows up in device list
 
-            NOTE2: It takes 0.035-0.51 seconds to discover something NOT a plug
-                   It usually takes .259 to 2.0 seconds to discover it is a plug
+            NOTE2: hs100.sh took 0.035-0.51 seconds to discover something NOT
+                   a plug and .259 to 2.0 seconds to discover it is a plug.
+                   kasa.py takes a few milliseconds on the LAN.
         """
 
         _who = self.who + "getPower():"
         v2_print(_who, "Test TP-Link Kasa HS100 Smart Plug Power Status:", self.ip)
 
-        command_line_list = ["hs100.sh", "check", "-i", self.ip]
-        event = self.runCommand(command_line_list, _who, forgive=forgive)
-        if not event['returncode'] == 0:
+        state = self.kasaCommand("check", self.kasa.getRelayState, forgive=forgive)
+        if state is None:
             return "ERROR"
 
-        Reply = event['output']
-        parts = Reply.split()
-        if len(parts) != 2:
-            v2_print(_who, self.ip, "- Not a Smart Plug!", parts)
-            return "N/A"
-
-        if parts[1] == "ON" or parts[1] == "OFF":
-            v2_print(_who, self.ip, "Smart Plug is", "'" + parts[1] + "'")
-            self.powerStatus = parts[1]  # Can be "ON", "OFF" or "?"
+        if state not in (0, 1):
+            v2_print(_who, self.ip, "- Not a Smart Plug! (or powered off)")
+            self.powerStatus = "?"  # Can be "ON", "OFF" or "?"
             return self.powerStatus
 
-        v2_print(_who, self.ip, "- Not a Smart Plug! (or powered off)")
-        self.powerStatus = "?"  # Can be "ON", "OFF" or "?"
+        self.powerStatus = "ON" if state == 1 else "OFF"
+        v2_print(_who, self.ip, "Smart Plug is", "'" + self.powerStatus + "'")
         return self.powerStatus
 
-    def setPower(self, status):
+    def setPower(self, status, forgive=False):
         """ Set Power to status, 'OFF' or 'ON'
-            Note hs100.sh requires lower() case
-            If forgive=True then don't report pipe.returncode != 0
+            If forgive=True then don't report communication errors
+            Return status or "?" if plug didn't reply
         """
 
         _who = self.who + "setPower(" + status + "):"
         v2_print(_who, "Turn TP-Link Kasa HS100 Smart Plug '" + status + "'")
 
-        command_line_list = \
-            ["timeout", GLO['PLUG_TIME'], "hs100.sh", status.lower(), "-i", self.ip]
+        state = 1 if status == "ON" else 0
+        reply = self.kasaCommand(status.lower(), self.kasa.setRelayState,
+                                 (state,), forgive=forgive)
+        self.powerStatus = "?" if reply is None else status  # "ON", "OFF" or "?"
+        return self.powerStatus
 
-        _event = self.runCommand(command_line_list, _who)
-        # Return code is always 0, even if plug doesn't exist. No text returned
+    def kasaClient(self):
+        """ Return self.kasa with current self.ip and GLO['PLUG_TIME'].
+            Called by self.kasaCommand() and EmeterCollector().worker() thread
+            so self.kasa.lock is held while a request could be using it.
+        """
+        timeout = float(GLO['PLUG_TIME'])  # Can be changed in Preferences
+        with self.kasa.lock:
+            if self.kasa.host != self.ip or self.kasa.port != self.port:
+                self.kasa.close()  # Rediscover found new IP address
+                self.kasa.host, self.kasa.port = self.ip, self.port
+            if self.kasa.timeout != timeout:
+                self.kasa.timeout = timeout
+                if self.kasa.sock is not None:
+                    self.kasa.sock.settimeout(timeout)  # Kept open connection
+        return self.kasa
+
+    def kasaCommand(self, command, method, args=(), forgive=False):
+        """ Call self.kasa method and log event the same as self.runCommand().
+            Return method result or None when plug didn't reply.
+
+            :param command: "check", "on" or "off" same as hs100.sh
+        """
+        _who = self.who + "kasaCommand():"
+        self.kasaClient()  # Current IP address and GLO['PLUG_TIME']
+
+        start = time.time()
+        result = None
+        error = ""
+        try:
+            result = method(*args)
+        except kasa.KasaError as err:
+            error = str(err)
 
-        self.powerStatus = status  # Can be "ON", "OFF" or "?"
+        with self.cmdLock:
+            self.cmdCaller = _who
+            self.cmdCommand = ["kasa", command, self.ip]
+            self.cmdString = ' '.join(self.cmdCommand)
+            self.cmdStart = start
+            self.cmdOutput = "" if result is None else str(result)
+            self.cmdError = error
+            self.cmdReturncode = 1 if error else 0
+            self.cmdDuration = time.time() - start
+            self.logEvent(_who, forgive=forgive)
+
+        return result
 
 
 class SonyBraviaKdlTV(DeviceCommonSelf):
@@ -2986,7 +3761,10 @@ https://stackoverflow.com/questions/2829613/how-do-you-tell-if-a-string-contains
         self.type_code = GLO['KDL_TV']
 
         self.powerSavingMode = "?"  # set with getPowerSavingMode()
-        self.lastEventTime = 0.0  # Last time checkEvents() called
+        self.lastEventTime = 0.0  # Last time monitorWorker() checked power
+        self.monitor_thread = None  # self.monitorWorker() thread
+        self.monitor_queue = Queue.Queue()  # State changes for checkSonyEvents()
+        self.monitor_stop = threading.Event()  # Set by self.stopMonitor()
         self.lastVolumeChange = 0.0  # Last checkVolumeChange() using TV remote
         self.hasVolumeSet = False  # On Startup check quiet/normal volume
         self.volume = "?"  # Set with getVolume()  # 28
@@ -3000,7 +3778,7 @@ https://stackoverflow.com/questions/2829613/how-do-you-tell-if-a-string-contains
         self.subwooferPhase = "?"  # Set with getSpeakerSettings()  # normal
         self.subwooferPower = "?"  # Set with getSpeakerSettings()  # on
 
-        self.requires = ['curl', 'notify-send']
+        self.requires = ['notify-send']  # bravia.py replaces curl
         self.installed = []
         self.checkDependencies(self.requires, self.installed)
         _who = self.who + "__init__():"
@@ -3056,56 +3834,275 @@ https://stackoverflow.com/questions/2829613/how-do-you-tell-if-a-string-contains
 
             2025-06-01 Originally in Application() moved to SonyBraviaKdlTV()
             2026-04-26 Limit checks to 1 per second unless spamming volume.
+            2026-10-18 Checks moved to self.monitorWorker() thread. Only the
+                state changes it posts are applied here. Never waits on TV.
 
         """
         _who = self.who + "checkSonyEvents():"
-        _delta = time.time() - self.lastEventTime
-
-        if self.powerStatus == "?" and _delta > 1.0:
-            v1_print(_who, "old self.powerStatus:", self.powerStatus)
-            self.getPower()  # "?" when network down or resuming
-            v1_print(_who, "new self.powerStatus:", self.powerStatus)
-            # 2025-05-31 TODO: If "ON" update treeview and dropdown menu
-
-        # Note "Rediscover now" resets APP_RESTART_TIME
-        life_span = time.time() - GLO['APP_RESTART_TIME'] \
-            if self.powerStatus == "ON" else 0.0
+        if self.monitor_thread is None or not self.monitor_thread.is_alive():
+            self.startMonitor()  # First time or after resume
 
-        if life_span < 2.0:
-            return  # TV has to be turned on for at least 2 seconds
-
-        log_status = GLO['LOG_EVENTS']  # Current event logging status
-        GLO['LOG_EVENTS'] = False  # Turn off logging during Sony checks
+        while True:
+            try:
+                event = self.monitor_queue.get_nowait()
+            except Queue.Empty:
+                return  # No state changes
 
-        ''' Sony TV monitored for TV Remote power off suspends system? '''
-        if GLO['ALLOW_REMOTE_TO_SUSPEND'] and _delta > 1.0:
-            self.lastEventTime = time.time()  # reset for another second
-            self.powerStatus = "?"  # Default if network down
-            if self.checkPowerOffSuspend(forgive=True):  # check "OFF"
+            if event[0] == "power_off":
+                v1_print(_who, "Sony TV Remote powered off TV.")
                 self.app.sony_suspended_system = True  # Sony TV initiated suspend
                 return
                 # self.Suspend(sony_remote_powered_off=True)  # Turns on event logging
                 # Will not return until Suspend finishes and resume finishes
+            elif event[0] == "volume":
+                self.app.last_rediscover_time = time.time()  # 2025-05-27 review need
 
-        ''' Sony TV audio channel monitored for volume up/down display? '''
-        # If less than 3 seconds since last volume change with TV remote
-        _spam = time.time() - self.lastVolumeChange  # Set in checkVolumeChange()
+    def startMonitor(self):
+        """ Start self.monitorWorker() thread with new queue and stop event
+            so a thread from before suspend can't post stale state changes.
+        """
+        self.monitor_queue = Queue.Queue()
+        self.monitor_stop = threading.Event()
+        self.monitor_thread = threading.Thread(
+            target=self.monitorWorker, name="sony-monitor",
+            args=(self.monitor_queue, self.monitor_stop))
+        self.monitor_thread.daemon = True
+        self.monitor_thread.start()
+
+    def stopMonitor(self):
+        """ Stop self.monitorWorker() thread before suspend or exit """
+        _who = self.who + "stopMonitor():"
+        self.monitor_stop.set()
+        if self.monitor_thread is not None:
+            self.monitor_thread.join(float(GLO['CURL_TIME']) + 1.0)
+            if self.monitor_thread.is_alive():
+                v0_print(_who, "Sony monitor thread still running. Ignoring it.")
+        self.monitor_thread = None
+
+    def monitorWorker(self, post_queue, stop_event):
+        """ Thread started by self.startMonitor(). Never touches tkinter.
+
+            getPowerStatus and getVolumeInformation are requested at the same
+            time. When the TV is slow, a request still in flight is waited on
+            again instead of sending a duplicate. Power is checked every
+            second while it is "?" or "ON", every 30 seconds while "OFF".
+            self.app.refreshAllPowerStatuses() also finds the TV turned on.
+            Volume is checked every second or every 0.1 second when the
+            volume changed in the last 3 seconds.
+
+            When GLO['SONY_NOTIFICATIONS'] is True and the TV is on, the TV
+            pushes power and volume changes instead. Polling resumes when the
+            model doesn't support notifications or the TV closes the sockets.
+            Subscribing is retried every minute. Sockets are pinged every
+            bravia.PING_SECONDS and power is still polled every 30 seconds
+            in case a notification was lost.
+
+            State changes put into post_queue for self.checkSonyEvents():
+                ("power_off",) - TV Remote powered off TV. Thread ends.
+                ("volume", volume) - TV Remote changed volume
+        """
+        _who = self.who + "monitorWorker():"
+        pool = hc.WorkerPool(2, "sony-monitor")
+        inflight = {}  # {"power": PoolJob, "volume": PoolJob} being requested
+        quiet_args = (True, False)  # forgive=True, log=False
+        sockets = {}  # {"system": NotificationSocket, "audio": ...} when pushed
+        subscribe_time = 0.0  # Next time to try subscribing to notifications
+        resync_time = 0.0  # Next time to poll power while pushed or TV "OFF"
+
+        def request(key, func):
+            """ Submit func unless the same request is still in flight """
+            job = inflight.get(key)
+            if job is None or job.done():
+                job = inflight[key] = pool.submit(func, quiet_args)
+            return job
 
-        if GLO['ALLOW_VOLUME_CONTROL'] and (_delta > 1.0 or _spam < 3.0):
-            self.lastEventTime = time.time()  # reset for another second
-            if self.checkVolumeChange(forgive=True):
-                self.app.last_rediscover_time = time.time()  # 2025-05-27 review need
+        try:
+            while not stop_event.is_set():
+                if not sockets and GLO['SONY_NOTIFICATIONS'] and \
+                        self.powerStatus == "ON" and time.time() >= subscribe_time:
+                    subscribe_time = time.time() + 60.0
+                    sockets = self.openNotifications()  # {} = keep polling
+
+                if sockets:
+                    try:
+                        messages = self.readNotifications(sockets, 0.5)
+                    except bravia.BraviaError as err:
+                        v1_print(_who, "Notifications stopped:", err)
+                        self.closeNotifications(sockets)
+                        sockets = {}  # Poll until subscribed again
+                        continue
+                    if self.app and self.app.suspending:
+                        continue  # Sony TV may be powering off for suspend
+                    for message in messages:
+                        if self.applyNotification(message, post_queue):
+                            return  # app.refreshApp will suspend system now
+                    life_span = time.time() - GLO['APP_RESTART_TIME']
+                    if time.time() >= resync_time:  # Power off notification lost?
+                        resync_time = time.time() + 30.0
+                        suspend = life_span >= 2.0 and GLO['ALLOW_REMOTE_TO_SUSPEND']
+                        job = request("power", self.checkPowerOffSuspend
+                                      if suspend else self.getPower)
+                        job.wait(float(GLO['CURL_TIME']) + 0.5)  # Late job coalesced
+                        if suspend and job.done() and job.result is True:
+                            post_queue.put(("power_off",))
+                            return  # app.refreshApp will suspend system now
+                    if self.powerStatus != "ON":
+                        self.closeNotifications(sockets)
+                        sockets = {}  # Poll for TV power on
+                        continue
+                    if life_span >= 2.0 and GLO['ALLOW_VOLUME_CONTROL'] and \
+                            not self.hasVolumeSet:
+                        self.setStartupVolume()  # 9am - 10pm normal, else quiet volume
+                        self.hasVolumeSet = True  # Don't check again
+                    continue
+
+                spam = time.time() - self.lastVolumeChange < 3.0  # Set in checkVolumeChange()
+                if stop_event.wait(0.1 if spam else 1.0):
+                    break  # self.stopMonitor()
+                if self.app and self.app.suspending:
+                    continue  # Sony TV may be powering off for suspend
 
-            ''' One-time set volume to quiet or normal on startup and resume. '''
-            if not self.hasVolumeSet:
-                self.setStartupVolume()  # 9am - 10pm normal, else quiet volume
-                self.hasVolumeSet = True  # Don't check again
+                jobs = {}
+                now = time.time()
+                # Note "Rediscover now" resets APP_RESTART_TIME
+                life_span = now - GLO['APP_RESTART_TIME'] \
+                    if self.powerStatus == "ON" else 0.0
+                if now - self.lastEventTime >= 1.0:
+                    self.lastEventTime = now  # reset for another second
+                    if self.powerStatus == "?" or \
+                            self.powerStatus != "ON" and now >= resync_time:
+                        resync_time = now + 30.0  # Idle TV isn't asked every second
+                        jobs["power"] = request("power", self.getPower)  # "?" or "OFF"
+                    elif life_span >= 2.0 and GLO['ALLOW_REMOTE_TO_SUSPEND']:
+                        jobs["power"] = request("power", self.checkPowerOffSuspend)
+
+                ''' Sony TV audio channel monitored for volume up/down display? '''
+                if life_span >= 2.0 and GLO['ALLOW_VOLUME_CONTROL']:
+                    jobs["volume"] = request("volume", self.checkVolumeChange)
+
+                for job in jobs.values():
+                    job.wait(float(GLO['CURL_TIME']) + 0.5)  # Late job coalesced
+
+                job = jobs.get("power")
+                if job and job.done() and job.result is True and \
+                        job.func == self.checkPowerOffSuspend:
+                    post_queue.put(("power_off",))
+                    return  # app.refreshApp will suspend system now
+
+                job = jobs.get("volume")
+                if job and job.done() and job.result is True:
+                    post_queue.put(("volume", self.volume))
+
+                ''' One-time set volume to quiet or normal on startup and resume. '''
+                if life_span >= 2.0 and GLO['ALLOW_VOLUME_CONTROL'] and \
+                        not self.hasVolumeSet:
+                    self.setStartupVolume()  # 9am - 10pm normal, else quiet volume
+                    self.hasVolumeSet = True  # Don't check again
+        except Exception as err:  # Thread must not die silently
+            v0_print(_who, "Sony monitor failed:", err)
+        finally:
+            self.closeNotifications(sockets)
+            pool.close()
+
+    def openNotifications(self):
+        """ Subscribe to notifyPowerStatus on the "system" service and to
+            notifyVolumeInformation on the "audio" service.
+
+            :returns: {service: bravia.NotificationSocket} or {} when the TV
+                can't be reached or the model doesn't push notifications.
+        """
+        _who = self.who + "openNotifications():"
+        wanted = {"system": ["notifyPowerStatus"]}
+        if GLO['ALLOW_VOLUME_CONTROL']:
+            wanted["audio"] = ["notifyVolumeInformation"]
 
-        GLO['LOG_EVENTS'] = True if log_status else False  # Sony done, restore logging
+        sockets = {}
+        try:
+            for service, names in wanted.items():
+                sockets[service] = bravia.NotificationSocket(
+                    self.ip, service, GLO['SONY_PWD'], NetworkInfo.sony_rest.port,
+                    float(GLO['CURL_TIME']) * 5)
+                enabled = sockets[service].subscribe(names)
+                if enabled != names:
+                    v1_print(_who, "Notifications not supported:", names,
+                             "Polling", self.ip, "instead.")
+                    self.closeNotifications(sockets)
+                    return {}
+        except bravia.BraviaError as err:
+            v1_print(_who, "Notifications unavailable:", err)
+            self.closeNotifications(sockets)
+            return {}
 
-    def checkPowerOffSuspend(self, forgive=False):
+        v1_print(_who, "Sony TV pushes notifications:", list(wanted.keys()))
+        return sockets
+
+    @staticmethod
+    def closeNotifications(sockets):
+        """ Close sockets opened by self.openNotifications() """
+        for sock in sockets.values():
+            sock.close()
+
+    @staticmethod
+    def readNotifications(sockets, timeout):
+        """ Wait up to timeout seconds for notifications on any socket.
+            Raises bravia.BraviaError when the TV closes a socket or stops
+            answering pings.
+        """
+        for sock in sockets.values():
+            sock.keepAlive(bravia.PING_SECONDS)
+        ready = select.select(list(sockets.values()), [], [], timeout)[0]
+        messages = []
+        for sock in ready:
+            message = sock.receive(float(GLO['CURL_TIME']))  # Rest of frame
+            while message is not None:
+                messages.append(message)
+                message = sock.receive(0.0)  # Frames already received
+        return messages
+
+    def applyNotification(self, message, post_queue):
+        """ Apply notification pushed by TV the same way polling would.
+            Return True when TV Remote powered off TV to suspend system.
+
+            {"method": "notifyPowerStatus", "params": [{"status": "standby"}]}
+            {"method": "notifyVolumeInformation", "params": [{"target":
+                "speaker", "volume": 28, "mute": false}]}
+        """
+        _who = self.who + "applyNotification():"
+        v2_print(_who, "Notification:", message)
+        try:
+            method = message["method"]
+            params = message["params"][0]
+        except (KeyError, IndexError, TypeError):
+            return False  # Reply to switchNotifications or unknown
+
+        if method == "notifyPowerStatus":
+            life_span = time.time() - GLO['APP_RESTART_TIME'] \
+                if self.powerStatus == "ON" else 0.0
+            if params.get("status") == "active":
+                self.powerStatus = "ON"
+                return False
+            if params.get("status") != "standby":
+                return False
+            self.powerStatus = "OFF"
+            if self.menuPowerOff or life_span < 2.0 or \
+                    not GLO['ALLOW_REMOTE_TO_SUSPEND']:
+                return False  # Powered off by HomA Right Click doesn't count
+            v1_print(_who, "Suspending due to Sony TV powerStatus:", self.powerStatus)
+            post_queue.put(("power_off",))
+            return True
+
+        if method == "notifyVolumeInformation" and \
+                params.get("target") == "speaker" and "volume" in params:
+            self.volumeSpeaker = self.volume = params["volume"]
+            if GLO['ALLOW_VOLUME_CONTROL'] and \
+                    self.volumeChanged(forgive=True, log=False):
+                post_queue.put(("volume", self.volume))
+
+        return False
+
+    def checkPowerOffSuspend(self, forgive=False, log=True):
         """ If TV powered off with remote control. If so suspend system.
-            Called from app.refreshApp() every 16 to 33 milliseconds
+            Called from self.monitorWorker() thread every second.
             Copied from /mnt/e/bin/tvpowered
 
             Normally event logging would be turned off to prevent large dictionary.
@@ -3115,16 +4112,17 @@ https://stackoverflow.com/questions/2829613/how-do-you-tell-if-a-string-contains
         if self.menuPowerOff:  # Only sony tv remote control power off counts.
             return False  # Powered off by HomA Right Click doesn't count
 
-        self.getPower(forgive=forgive)
+        self.getPower(forgive=forgive, log=log)
         if self.powerStatus != "OFF":
             return False  # Sony power status is "ON" or "?" or "Error:"
         v1_print(_who, "Suspending due to Sony TV powerStatus:", self.powerStatus)
 
         return True  # app.refreshApp will suspend system now
 
-    def checkVolumeChange(self, forgive=False):
+    def checkVolumeChange(self, forgive=False, log=True):
         """ If current volume is different than last volume spam notify-send
-            Called from app.refreshApp() every 16 to 33 milliseconds (60 to 30 fps)
+            Called from self.monitorWorker() thread every 1 second or 0.1
+            second when volume changed in the last 3 seconds.
             DO NOT use event logging because each volume display is separate entry
 
             Normally event logging would be turned off to prevent large dictionary.
@@ -3134,7 +4132,14 @@ https://stackoverflow.com/questions/2829613/how-do-you-tell-if-a-string-contains
         if self.powerStatus != "ON":
             return False  # TV isn't powered on, can't check current volume
 
-        self.getVolume(forgive=forgive)  # Occasionally get curl error 124 timeout
+        self.getVolume(forgive=forgive, log=log)  # Occasionally timeout error 124
+        return self.volumeChanged(forgive=forgive, log=log)
+
+    def volumeChanged(self, forgive=False, log=True):
+        """ Display notify-send when self.volume isn't self.volumeLast.
+            Called by self.checkVolumeChange() and self.applyNotification().
+        """
+        _who = self.who + "volumeChanged():"
         if self.volume == self.volumeLast:
             return False
 
@@ -3155,7 +4160,7 @@ https://stackoverflow.com/questions/2829613/how-do-you-tell-if-a-string-contains
             "-h", "string:x-canonical-private-synchronous:volume",
             "--icon=/usr/share/icons/gnome/48x48/devices/audio-speakers.png",
             "Volume: {} {}".format(self.volume, percentBar)]
-        event = self.runCommand(command_line_list, _who, forgive=forgive)
+        event = self.runCommand(command_line_list, _who, forgive=forgive, log=log)
 
         # Average command time is 0.025 seconds but never logged
         if event['returncode'] != 0:  # Was there an error?
@@ -3165,7 +4170,7 @@ https://stackoverflow.com/questions/2829613/how-do-you-tell-if-a-string-contains
 
         return True  # Parent will delay rediscovery 1 minute
 
-    def getPower(self, forgive=False):
+    def getPower(self, forgive=False, log=True):
         """ Return "ON", "OFF" or "?" if error.
             Called by self.app.getPower() and self.isDevice().
 
@@ -3175,9 +4180,10 @@ https://pro-bravia.sony.net/develop/integrate/rest-api/spec/service/system/v1_0/
 
         RESTid = "50"
         _who, JSON_str = self.makeCommon("getPowerStatus", RESTid, '[]')
-        reply_dict = ni.curl(JSON_str, "system", self.ip, RESTid, forgive=forgive)
-        self.powerStatus = "?"  # Can be "ON", "OFF" or "?"
+        reply_dict = ni.curl(JSON_str, "system", self.ip, RESTid, forgive=forgive,
+                             log=log)
         if not forgive and not self.checkReply(reply_dict, RESTid):
+            self.powerStatus = "?"  # Can be "ON", "OFF" or "?"
             return self.powerStatus
 
         try:
@@ -3185,15 +4191,18 @@ https://pro-bravia.sony.net/develop/integrate/rest-api/spec/service/system/v1_0/
         except (KeyError, IndexError):
             reply = reply_dict  # Probably "7" for not a Sony TV
 
+        # 2026-10-18 Assign self.powerStatus once. Other threads read it.
+        status = "?"  # Can be "ON", "OFF" or "?"
         #print("reply:", reply, " | type(reply):", type(reply))
         if isinstance(reply, int):
             v3_print(_who, "Integer reply:", reply)  # 7
         elif u"active" == reply:
-            self.powerStatus = "ON"  # Can be "ON", "OFF" or "?"
+            status = "ON"
         elif u"standby" == reply:
-            self.powerStatus = "OFF"  # Can be "ON", "OFF" or "?"
+            status = "OFF"
         else:
             v3_print(_who, "Something weird: ?")  # Router
+        self.powerStatus = status
 
         # 2024-12-04 - Some tests
         #self.getSoundSettings()
@@ -3436,16 +4445,17 @@ https://pro-bravia.sony.net/develop/integrate/rest-api/spec/service/audio/v1_0/g
 
         return reply
 
-    def setStartupVolume(self, target="speaker", forgive=False):
-        """ Set volume to normal between 9am - 10pm or quiet 10pm - 9 am """
+    def setStartupVolume(self, target="speaker", forgive=False, log=False):
+        """ Set volume to normal between 9am - 10pm or quiet 10pm - 9 am
+            2026-10-18 - Called from monitorWorker() thread. log=False instead of
+                changing GLO['LOG_EVENTS'] that other threads are reading.
+        """
         _who = self.who + "setStartupVolume():"
         if self.powerStatus != "ON":
             v0_print(_who, "Sony 'powerStatus' != 'ON': '" + self.powerStatus + "'.")
             return
 
-        isEventLogging = GLO['LOG_EVENTS']  # Log all suspend events
-        GLO['LOG_EVENTS'] = True  # Log volume command events
-        self.getVolume()
+        self.getVolume(log=log)
 
         curr_volume = int(self.volumeSpeaker)  # Could be self.volumeHeadphone. Not supported.
         hour = dt.datetime.today().hour
@@ -3463,16 +4473,16 @@ https://pro-bravia.sony.net/develop/integrate/rest-api/spec/service/audio/v1_0/g
 
         if volume_str:
             self.setVolume(volume_str, target=target, forgive=forgive)
-        GLO['LOG_EVENTS'] = True if isEventLogging else False
 
-    def getVolume(self, target="speaker", forgive=False):
+    def getVolume(self, target="speaker", forgive=False, log=True):
         """ Get Sony Bravia KDL TV volume
             Currently just speaker volume, but headphone volume can be returned too.
         """
 
         RESTid = "33"
         _who, JSON_str = self.makeCommon("getVolumeInformation", RESTid, '[]')
-        reply_dict = ni.curl(JSON_str, "audio", self.ip, RESTid, forgive=forgive)
+        reply_dict = ni.curl(JSON_str, "audio", self.ip, RESTid, forgive=forgive,
+                             log=log)
         v2_print(_who, "curl reply_dict:", reply_dict)
         # SonyBraviaKdlTV().getVolume(): curl reply_dict: {'result': [[
         # {'volume': 28, 'maxVolume': 100, 'minVolume': 0, 'target': 'speaker', 'mute': False},
@@ -3611,7 +4621,7 @@ List of devices attached
         Methods:
 
             isDevice() - timeout 0.1 adb connect <ip>
-            Connect() - Call isDevice followed by wakeonlan up to 60 times
+            Connect() - Wake on Lan Magic Packets while reconnecting ppadb
             turnOn() - timeout 0.5 adb shell input key event KEYCODE_WAKEUP
             turnOff() - timeout 0.5 adb shell input key event KEYCODE_SLEEP
 
@@ -3655,10 +4665,11 @@ List of devices attached
 
         self.AdbClient = self.AdbDevices = self.AdbDevice = None
         self.AdbFound = False
+        self.adb = None  # android.AdbSession() kept alive between commands
 
         self.type = "GoogleAndroidTV"
         self.type_code = GLO['ADB_TV']
-        self.requires = ['wakeonlan', 'adb', 'ppadb']
+        self.requires = ['adb', 'ppadb']  # wol.py replaces wakeonlan
         self.installed = []
         self.checkDependencies(self.requires, self.installed)
         _who = self.who + "__init__():"
@@ -3679,7 +4690,8 @@ List of devices attached
         # Will not connect any devices. Devices must be connected manually
 
         # Default is "127.0.0.1" and 5037
-        self.AdbClient = AdbClient(host="127.0.0.1", port=5037)
+        self.adb = android.AdbSession(self.ip)
+        self.AdbClient = self.adb.client
         self.AdbDevices = self.AdbClient.devices()
 
         for self.AdbDevice in self.AdbDevices:
@@ -3718,35 +4730,41 @@ List of devices attached
         _who = self.who + "getAdbDeviceByIP():"
 
         for self.AdbDevice in self.AdbDevices:
+            _ip = self.AdbDevice.serial.split(":")[0]
+            if _ip != self.ip:
+                continue  # 2026-10-18 Don't `echo 1` to other devices
+            self.adb.attach(self.AdbDevice)
             if not self.recheckConnection():
                 continue
-            _ip = self.AdbDevice.serial.split(":")[0]
-            if _ip == self.ip:
-                self.AdbFound = True
-                return True
+            self.AdbFound = True
+            return True
 
         self.AdbDevice = None
         self.AdbFound = False
 
     def recheckConnection(self):
-        """ Quick check to see if device is still connected in ppadb. """
+        """ Quick check to see if device is still connected in ppadb.
+            2026-10-18 self.adb finds or reconnects the device when missing.
+                `echo 1` is skipped when a command succeeded recently.
+        """
         _who = self.who + "recheckConnection():"
 
-        if self.AdbDevice is None:
-            v0_print(_who, "AdbDevice is None for IP:", self.ip)
-            return False  # 2026-04-26 hasn't happened yet...
+        if self.adb is None:
+            v0_print(_who, "No ADB session for IP:", self.ip)
+            return False  # Dependencies not installed
 
         # Check responsiveness with a quick command
-        try:
-            _start = time.time()
-            self.AdbDevice.shell("echo 1", timeout=2)
-            v1_print(_who, "No error using ppadb after seconds:",
-                     round(time.time() - _start, 2))
-            return True
-        except Exception as _e:
-            v1_print(_who, "Device frozen or inaccessible:\n ", _e)
+        _start = time.time()
+        device = self.adb.device(timeout=2)
+        if device is None:
+            v1_print(_who, "Device frozen or inaccessible:", self.ip)
             return False
 
+        self.AdbDevice = device
+        v2_print(_who, "No error using ppadb after seconds:",
+                 round(time.time() - _start, 2))
+        return True
+
     def Connect(self, forgive=False):
         """ Wakeonlan and Connect to Google Android TV in a loop until
                 isDevice() returns True.
@@ -3796,36 +4814,54 @@ Application().Rediscover(): FOUND NEW INSTANCE or REDISCOVERED LOST INSTANCE:
         command_line_list = ["adb", "devices", "-l"]
         self.runCommand(command_line_list, _who)  # Will force 'adb' daemon to run
 
+        # 2026-10-18 Magic packets are sent on GLO['WOL_SCHEDULE_LIST'] in a
+        #   thread while the adb server reconnects. Stop as soon as TV answers
+        #   instead of `wakeonlan` and `adb connect` taking turns 10 times.
+        try:
+            waker = wol.WakeOnLan(self.mac, GLO['WOL_SCHEDULE_LIST'],
+                                  int(GLO['WOL_BURST']))
+        except ValueError as err:
+            v0_print(_who, err)
+            return False
+
+        _start = time.time()
+        waker.start()
+        # Tkinter thread, E.G. menu Turn On, only waits GLO['ADB_KEY_TIME'].
+        #   Magic packets are still sent so TV wakes up for next refresh.
+        on_tk = threading.current_thread().name == "MainThread"
+        wait = 0.0 if on_tk else waker.duration()
+        deadline = _start + wait + float(GLO['ADB_KEY_TIME'])
+        self.AdbFound = False
         cnt = 1
         while not self.AdbFound:
-
-            _start = time.time()
-            v1_print(_who, "Attempt #:", cnt, "Call 'wakeonlan' for MAC:", self.mac)
-            command_line_list = ["wakeonlan", self.mac]  # 0.2 seconds
-            event = self.runCommand(command_line_list, _who, forgive=forgive)
-            v1_print(_who, "wakeonlan time:", round(time.time() - _start, 2))
-            if event['returncode'] != 0:
-                return False
-
-            # 2025-01-13 Added because isDevice timeout is now too short.
-            _start = time.time()
-            command_line_list = ["adb", "connect", self.ip]  # can take 6 seconds
-            _event = self.runCommand(command_line_list, _who, forgive=forgive)
-            v1_print(_who, "`adb connect` time:", round(time.time() - _start, 2))
-
+            v1_print(_who, "Attempt #:", cnt, "Reconnect to IP:", self.ip)
             # Reply = "connected to 192.168.0.17:5555"
-            # Reply = "already connected to 192.168.0.17:5555"
             # Reply = "unable to connect to 192.168.0.17:5555"
-            # Reply = "error: device offline"
-
-            self.AdbDevices = self.AdbClient.devices()  # Reread after connect
-            v1_print(_who, "Number of devices connected:", len(self.AdbDevices))
-            self.getAdbDeviceByIP()
-
+            self.AdbFound = self.recheckConnection()  # adb server `adb connect`
+            if self.AdbFound or time.time() >= deadline:
+                break
+            time.sleep(float(GLO['ADB_MAGIC_TIME']))  # Wait between reconnects
             cnt += 1
-            if cnt > 10:
-                v0_print(_who, "Timeout after", cnt, "attempts")
-                return False
+        if self.AdbFound or not on_tk:
+            waker.stop()  # Else thread ends after GLO['WOL_SCHEDULE_LIST']
+
+        with self.cmdLock:
+            self.cmdCaller = _who
+            self.cmdCommand = ["wakeonlan", self.mac]
+            self.cmdString = ' '.join(self.cmdCommand)
+            self.cmdStart = _start
+            self.cmdOutput = "Sent " + str(waker.sent) + " magic packets. " + \
+                "Reconnect attempts: " + str(cnt)
+            self.cmdError = "" if self.AdbFound else \
+                "unable to connect to " + self.ip
+            self.cmdReturncode = 0 if self.AdbFound else 1
+            self.cmdDuration = time.time() - _start
+            self.logEvent(_who, forgive=forgive)
+
+        v1_print(_who, "Wake and reconnect time:", round(time.time() - _start, 2))
+        if not self.AdbFound:
+            v0_print(_who, "Timeout after", cnt, "attempts")
+            return False
         '''
         For Python ppadb (pure-python-adb) in a loop on Android TVs, a suitable, 
         stable polling rate is 1 to 2 seconds for responsive automation (like 
@@ -3854,15 +4890,21 @@ Application().Rediscover(): FOUND NEW INSTANCE or REDISCOVERED LOST INSTANCE:
         return True
 
     def getPower(self, forgive=False):
-        """ Set self.powerStatus to "ON", "OFF" or "?" using ppadb. """
+        """ Set self.powerStatus to "ON", "OFF" or "?" using ppadb.
+
+            2026-10-18 All three dumpsys commands are sent in one shell
+                command by self.adb.probe(). Result is reused for
+                GLO['ADB_CACHE_TIME'] seconds. A failed probe forgets the
+                session so the next call reconnects.
+        """
 
         _who = self.who + "getPower():"
-        self.powerStatus = "?"  # Can be "ON", "OFF" or "?"
-        if not self.checkInstalled('ppadb'):
+        if not self.checkInstalled('ppadb') or self.adb is None:
             v3_print(_who, "`ppadb.py` not installed.")
+            self.powerStatus = "?"  # Can be "ON", "OFF" or "?"
             return self.powerStatus
 
-        if self.AdbDevice is None or not self.recheckConnection():
+        if self.adb.dev is None and not self.recheckConnection():
             v1_print(_who, "No connection to:", self.ip)
             if self.Connect(forgive=forgive):  # TODO else: error message
                 self.getAdbDeviceByIP()
@@ -3874,45 +4916,42 @@ Application().Rediscover(): FOUND NEW INSTANCE or REDISCOVERED LOST INSTANCE:
                 return self.powerStatus
 
         v2_print("\n" + _who, "Get Power Status for:", self.ip)
-        _txt1 = "dumpsys input | grep -i screenOn"
-        _txt2 = "dumpsys power | grep -i 'Display Power'"
-        _txt3 = "dumpsys display | grep -i mScreenState"
-
-        def checkOnOff(_txt, _on, _off, _set_power=True):
-            """ Check results from ppadb.shell for _on or _off or None.
-            :param _txt: ppadb.shell command to execute
-            :param _on: check string of "ON" or "true"
-            :param _off: check string of "OFF" or "false"
-            :param _set_power: Set self.powerStatus to found value.
-            :return: "ON" or "OFF" or None
-            """
-            _res = None  # Make pyCharm happy :)
-            try:  # dumpsys: input / power / display
-                _res = self.AdbDevice.shell(_txt, timeout=2)
-            except Exception as e:
-                v0_print(_who, _txt, "ERROR:", "\n ", e)
+        try:
+            probe = self.adb.probe(float(GLO['ADB_PWR_TIME']),
+                                   float(GLO['ADB_CACHE_TIME']))
+        except android.AdbError as e:
+            if not forgive:
+                v0_print(_who, "dumpsys probe ERROR:", "\n ", e)
+            self.powerStatus = "?"  # Can be "ON", "OFF" or "?"
+            return self.powerStatus
 
-            if _res is None:
+        def checkOnOff(_key, _on, _off):
+            """ Check dumpsys result for _on or _off or None.
+            :param _key: android.PROBES key "input", "power" or "display"
+            :param _on: check string of "ON" or "true"
+            :param _off: check string of "OFF" or "false"
+            :return: "ON" or "OFF" or None
+            """
+            _res = probe.get(_key)
+            if not _res:
                 return None  # Nothing found, skip to next test
 
-            v1_print("{} {}: '{}'.".format(_who, _txt, _res))
+            v1_print("{} {}: '{}'.".format(_who, _key, _res))
             _return = None  # Neither "ON" nor "OFF"
             _return = "ON" if _on in _res else _return
             _return = "OFF" if _off in _res else _return
-
-            if _set_power and _return:  # if _return is None do NOT set powerStatus
-                self.powerStatus = _return  # Set status to "ON" or "OFF"
             return _return  # Return "ON" or "OFF"
 
-        if checkOnOff(_txt1, "true", "false"):
-            return self.powerStatus  # dumpsys input = "screenOn = true" or "false"
-        if checkOnOff(_txt2, "ON", "OFF"):
-            return self.powerStatus  # dumpsys power = Display Power: state=ON or OFF
-        if checkOnOff(_txt3, "ON", "OFF"):
-            return self.powerStatus  # dumpsys display = "mScreenState=ON" or "OFF"
+        # dumpsys input = "screenOn = true" or "false"
+        # dumpsys power = Display Power: state=ON or OFF
+        # dumpsys display = "mScreenState=ON" or "OFF"
+        status = checkOnOff("input", "true", "false") or \
+            checkOnOff("power", "ON", "OFF") or \
+            checkOnOff("display", "ON", "OFF")
 
-        self.powerStatus = "?"  # Already set to "?" but purchase extra insurance
-        if not forgive:
+        # 2026-10-18 Assign self.powerStatus once. Other threads read it.
+        self.powerStatus = status if status else "?"
+        if not status and not forgive:
             v0_print(_who, "Power status unknown.")
         return self.powerStatus
 
@@ -3928,12 +4967,14 @@ Application().Rediscover(): FOUND NEW INSTANCE or REDISCOVERED LOST INSTANCE:
             return False
         v2_print("\n" + _who, "Send KEYCODE_WAKEUP to:", self.ip)
 
-        # Connect() will try 60 times with wakeonlan and isDevice check.
+        # Connect() sends magic packets while reconnecting.
         if self.AdbDevice is None or not self.recheckConnection():
             v1_print(_who, "ppadb not connected to IP:", self.ip)
             if not self.Connect(forgive=forgive):  # TODO else: error message
                 v0_print(_who, "ADB unable to connect to IP:", self.ip)
                 return self.getPower()
+            if self.getPower(forgive=True) == "ON":
+                return self.powerStatus  # Magic packet woke TV. No keyevent.
 
         cnt = 1
         self.powerStatus = "?"
@@ -3951,6 +4992,8 @@ Application().Rediscover(): FOUND NEW INSTANCE or REDISCOVERED LOST INSTANCE:
                 # 'NoneType' object has no attribute 'shell'
                 v1_print(_who, round(time.time() - _start, 2),
                          "seconds for input keyevent ERROR:\n ", e)
+            if self.adb:
+                self.adb.invalidate()  # Power probe before key event is stale
 
             self.getPower()
             if self.powerStatus == "ON" or cnt >= 5:
@@ -3977,6 +5020,8 @@ Application().Rediscover(): FOUND NEW INSTANCE or REDISCOVERED LOST INSTANCE:
                      round(time.time() - _start, 2))
         except Exception as e:
             v0_print(_who, "input keyevent ERROR:\n ", e)
+        if self.adb:
+            self.adb.invalidate()  # Power probe before key event is stale
 
         time.sleep(0.5)  # Required to get "OFF" into treeview
         return self.getPower(forgive=forgive)
@@ -4288,8 +5333,11 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
         self.connect_errors = 0  # Count sequential times auto-reconnect failed.
         # When changing here, change in breatheColors() as well
         self.parm = {}  # breatheColors() parameters
-        self.stat = {}  # breatheColors() statistics
-        self.FAST_MS = 5  # Global for breatheColors() and monitorBreatheColors()
+        self.stat = {}  # breatheWorker() statistics
+        self.snapshot = None  # breatheWorker() statistics and colors for display
+        self.breathe_thread = None  # breatheWorker() thread
+        self.breathe_stop = None  # threading.Event() set by stopBreathing()
+        self.breathe_error = None  # GATT error for finishBreathing() to show
         self.MAX_FAIL = 18  # Allow 18 connection failures before giving up
         self.red = self.green = self.blue = 0  # Current breathing colors
         self.stepNdx = 0  # Current step index (0-based) within stepping range
@@ -4623,7 +5671,7 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
             return "ON"  # Cancel button
         GLO['LED_LIGHTS_COLOR'] = new
         v2_print(_who, "GLO['LED_LIGHTS_COLOR']:", GLO['LED_LIGHTS_COLOR'])
-        self.already_breathing_colors = False  # Turn it off, just in case on
+        self.stopBreathing()  # Turn it off, just in case on
         try:
             tc.setRGB(red, green, blue, self.device, wait_for_response=False)
             # wait_for_response takes 10 seconds when device not connected
@@ -4639,7 +5687,7 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
             defaults to "White" which is really "light green" on Happy Lighting LEDs.
         """
         _who = self.who + "setNight():"
-        self.already_breathing_colors = False  # Turn it off, just in case on
+        self.stopBreathing()  # Turn it off, just in case on
         if self.device is None:
             self.showMessage()  # self.device = None & self.powerStatus = "?"
             return self.powerStatus
@@ -4668,11 +5716,11 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
             Right Click in Network Devices Treeview menu for LED light strip.
 
             OVERVIEW:
-            Suspends self.refreshApp() running in self.App.__init__() loop.
-            Calls cr.inst.breatheColors() which loops forever and:
-                Exit if app.isActive is False
-                Exit if self.already_breathing_colors is False
-                Calls app.refreshApp after each LED set color as time permits
+            2026-10-18 Starts self.breatheWorker() thread and returns. The
+                thread never calls app.refreshApp() or tkinter. It ends when:
+                    app.isActive is False
+                    self.stopBreathing() called by Nighttime, Set Color, etc.
+                    GATT failed self.MAX_FAIL consecutive times
 
         :param low: Low value (darkest) E.G. 4 (Too low and lights might turn off)
         :param high: High value (brightest) E.G. 30 (Max is 255 which is too bright)
@@ -4680,43 +5728,115 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
         :param step: Float seconds to hold each step E.G. 0.275 = 21 steps if span is 6
         :param bots: Float seconds to hold bottom step E.G. 1.5 = hold dimmest 1.5 secs
         :param tops: Float seconds to hold top step E.G. 0.5 = hold brightest .5 seconds
+        :returns: self.powerStatus
         """
         _who = self.who + "breatheColors():"
         if self.already_breathing_colors:  # Should not happen but check anyway
             v0_print("\n" + ext.ch(), _who, "Already running breathing colors.")
-            return
+            return self.powerStatus
         if self.device is None:
             # 2025-02-11 Resuming from suspend when device not connected.
             err = "Cannot start 'Breathe Colors'. Turn on first."
             self.showMessage(err=err, count=0)  # Bluetooth device not connected to computer
             return self.powerStatus
 
-        # Parameters, Statistics and Color controls
+        # Parameters used by breatheWorker() and DisplayBreathing()
         self.parm = {"low": low, "high": high, "span": span, "step": step,
                      "bots": bots, "tops": tops}  # breatheColors() parameters
-        self.stat = {
-            "gatt_ms": 0, "gatt_cnt": 0, "gatt_low": 0, "gatt_high": 0, 
-            "sleep_ms": 0, "sleep_cnt": 0, "sleep_low": 0, "sleep_high": 0, 
-            "fast_ms": 0, "fast_cnt": 0, "norm_ms": 0, "norm_cnt": 0, 
-            "fail_ms": 0, "fail_cnt": 0
+        self.snapshot = None  # Published by breatheWorker() after each step
+        self.breathe_error = None
+
+        self.already_breathing_colors = True
+        self.breathe_stop = threading.Event()
+        self.breathe_thread = threading.Thread(
+            target=self.breatheWorker, name="breathe-colors",
+            args=(self.breathe_stop,))
+        self.breathe_thread.daemon = True
+        self.breathe_thread.start()
+        self.app.updateDropdown()  # Allow View dropdown menu option "Breathing stats".
+        v1_print("\n" + ext.ch(), _who, "Breathing colors - Starting up.")
+        return self.powerStatus
+
+    def stopBreathing(self):
+        """ Stop self.breatheWorker() thread and wait for its last GATT command
+            so the caller can send its own. Called on tkinter thread only.
+        """
+        _who = self.who + "stopBreathing():"
+        self.already_breathing_colors = False
+        if self.breathe_stop is not None:
+            self.breathe_stop.set()
+        if self.breathe_thread is not None:
+            self.breathe_thread.join(2.0)  # setRGB() waits 1 second when no reply
+            if self.breathe_thread.is_alive():
+                v0_print(_who, "Breathing colors thread still running. Ignoring it.")
+        self.finishBreathing()
+
+    def checkBreathing(self):
+        """ Called by app.refreshApp(). Finish up when self.breatheWorker()
+            ended by itself. E.G. Lost connection to LED lights.
+        """
+        if self.breathe_thread is not None and not self.breathe_thread.is_alive():
+            self.finishBreathing()
+
+    def finishBreathing(self):
+        """ tkinter work self.breatheWorker() thread can't do """
+        if self.breathe_thread is None:
+            return  # Already finished
+        self.breathe_thread = None
+        self.already_breathing_colors = False
+        if self.breathe_error is not None:
+            # Failed to connect self.MAX_FAIL consecutive times.
+            err, self.breathe_error = self.breathe_error, None
+            self.showMessage(err, count=self.MAX_FAIL)
+        if self.app:
+            self.app.updateDropdown()  # Disable "View" dropdown menu option "Breathing stats".
+
+    def breatheWorker(self, stop_event):
+        """ Thread started by self.breatheColors(). Never touches tkinter.
+
+            Each step is due at a time on a monotonic clock. The time the GATT
+            command took is subtracted from the sleep so steps don't drift.
+            When a GATT command takes longer than the whole step the schedule
+            restarts from now instead of rushing the following steps.
+
+            Statistics are published in self.snapshot after each step. The
+            dictionary is replaced, never changed, so DisplayBreathing() can
+            read it without a lock.
+
+            Colors are put in tc.ColorQueue() which sends GATT write commands
+            without waiting for a reply. A color still waiting when the next
+            one arrives is dropped. Every few seconds a write request is sent
+            instead so a lost connection is still noticed.
+
+            Every color of the cycle is calculated once by frames.breathe().
+            Each step only looks up its frame. The sunlight boost is applied
+            to the whole table when cp.sunlight_percent changes.
+        """
+        _who = self.who + "breatheWorker():"
+        low, high = self.parm["low"], self.parm["high"]
+        span, step = self.parm["span"], self.parm["step"]
+        bots, tops = self.parm["bots"], self.parm["tops"]
+
+        # Statistics and Color controls
+        stat = {
+            "gatt_ms": 0, "gatt_cnt": 0, "gatt_low": 0, "gatt_high": 0,
+            "sleep_ms": 0, "sleep_cnt": 0, "sleep_low": 0, "sleep_high": 0,
+            "late_ms": 0, "late_cnt": 0, "fail_ms": 0, "fail_cnt": 0,
+            "ack_cnt": 0, "drop_cnt": 0
         }
-        colors = (  # Cycle colors R=Red, G=Green, B=Blue: (R, R+G, G, G+B, B, B+R)
-            (True, False, False), (True, True, False), (False, True, False),
-            (False, True, True), (False, False, True), (True, False, True)
-        )
-        color_ndx = 0
-        color_max = len(colors) - 1
-        turning_up = True  # False = turning down
         step_count = int(float(span) / float(step))
         step_amount = float(high - low) / float(step_count)
         step_ms = int(float(step) * 1000.0)  # E.G. 0.333 = 333ms = 3 times / second
+        table = frames.breathe(low, high, span, step, bots, tops,
+                               red_green_adj=GLO['LED_RED+GREEN_ADJ'] is True)
         bots = int(bots * 1000.0)  # Milliseconds to sleep at Dimmest (bottom)
         tops = int(tops * 1000.0)  # Milliseconds to sleep at Brightest (top)
-        fast_sleep = float(self.FAST_MS) / 1000.0  # When not enough time for refresh
+        queue = tc.ColorQueue(self.device)  # Latest-wins write commands
 
-        self.already_breathing_colors = True
-        self.app.updateDropdown()  # Allow View dropdown menu option "Breathing stats".
-        v1_print("\n" + ext.ch(), _who, "Breathing colors - Starting up.")
+        def running():
+            """ False when app closing or self.stopBreathing() called """
+            return self.app.isActive and self.already_breathing_colors and \
+                not stop_event.is_set()
 
         def sendCommand():
             # noinspection SpellCheckingInspection
@@ -4735,330 +5855,206 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
                          7387 Wed Jul 23 19:40:52 2025  0.3 /usr/bin/gatttool
 
                     In above, self.connect_errors = 3. Delete the first 3 lines.
+
+                2026-10-18 Colors are queued and never wait for a response.
+                    A write that failed in queue is handled on the next step.
             """
-            if not self.app.isActive or not self.already_breathing_colors:
+            if not running():
                 return False
-            try:
-                tc.setRGB(self.red, self.green, self.blue,
-                          self.device, wait_for_response=True)
-                # wait_for_response takes 1 second when device not connected
-                # If not waiting, the GATT cmd used results in 100% CPU core
+            gatt_err = queue.take_error()
+            if gatt_err is None and self.device is not None:
+                queue.put(self.red, self.green, self.blue)
                 self.powerStatus = "ON"  # Reset "?" if previous failures
-                self.connect_errors = 0  # 2025-07-23 get about 100 errors / hour
-                # 2025-07-24 only getting 1 error in 90 minutes after resume.
                 return self.app.isActive and self.powerStatus == "ON"
-            except (pygatt.exceptions.NotConnectedError, AttributeError,
-                    pygatt.exceptions.NotificationTimeout) as gatt_err:
-                if self.connect_errors < self.MAX_FAIL:
-                    # Try to connect 5 times. Error after 6th time never displayed
-                    self.Connect(retry=self.MAX_FAIL + 1)  # Increments self.connect_errors on failure
-                    delta = round(time.time() - GLO['APP_RESTART_TIME'], 2)
-                    v1_print("{0:>8.2f}".format(delta), "|", _who, "Attempted reconnect:",
-                             self.connect_errors + 1, "time(s).")
-                else:
-                    # Failed to connect self.MAX_FAIL consecutive times.
-                    self.showMessage(gatt_err, count=self.connect_errors)
-
-                return False
-
-        def myMonitorColor(me, other1, other2, trace=None):
-            """ Calculate monitor color to display facsimile of LED Lights color.
-                low color is very dark. E.G Dark Red (80, 0, 0).
-                As color percentage increases gradually add color.
 
-                'me' is my color percentage. 'other1' and 'other2' are the other two.
-                Percentage is fraction E.G. 1.0 = 100%, 0.5 = 50% and 0.25 = 25%
-            """
-            all_percent = me + other1 + other2
-            if all_percent > 100.0:
-                v0_print("all_percent > 100.0:", me, other1, other2, trace)
-                all_percent = 100.0
-            if me == 0.0:
-                my_col = int(all_percent * .25)
-            else:
-                my_col = int(75 + me * 180)
-                if my_col < 0:
-                    v0_print("my_col < 0:", me, other1, other2, trace)
-                    my_col = 0
-                if my_col > 255:
-                    v0_print("my_col > 255:", my_col, me, other1, other2, trace)
-                    my_col = 255
-            return int(my_col)
-
-        def _myMonitorColor2(me, other1, other2, trace=None):
-            """ Calculate monitor color to display facsimile of LED Lights color.
-                No color is very light grey (240, 240, 240).
-                As color percentage increases gradually add color (by subtracting
-                other colors)
-
-                rp, gp, bp are red, green and blue percentage as a fraction.
-                E.G. .5 = 50% and .25 = 25%
-            """
-            all_percent = me + other1 + other2
-            if all_percent > 100.0:
-                v0_print("all_percent > 100.0:", me, other1, other2, trace)
-                all_percent = 100.0
-            if me == 0.0:
-                my_col = int(100.0 - all_percent * 1.25)
-                my_col = 0 if my_col < 0 else 0  # Intentionally driven negative.
-            else:
-                my_col = int(269.0 - me * 200.0)
-                if my_col < 0:
-                    v0_print("my_col < 0:", me, other1, other2, trace)
-                    my_col = 0
-                if my_col > 255:
-                    v0_print("my_col > 255:", my_col, me, other1, other2, trace)
-                    my_col = 255
-            return int(my_col)
-
-        def setColor():
-            """ Calculate color and call sendCommand to Bluetooth """
-            tr, tg, tb = colors[color_ndx]  # Turn on red, green, blue?
-            num_colors = sum(colors[color_ndx])  # How many colors are used?
-            if True is False:  # Dummy to make pycharm happy
-                _myMonitorColor2(1, 2, 3)
-
-            if turning_up is True:
-                if self.stepNdx == 0:
-                    brightness = low
-                elif self.stepNdx == step_count - 1:  # Last index in range?
-                    brightness = high
-                else:
-                    brightness = low + int(self.stepNdx * step_amount)
+            if gatt_err is None:  # Last reconnect failed
+                gatt_err = pygatt.exceptions.NotConnectedError("Device not connected!")
+            if self.connect_errors < self.MAX_FAIL:
+                # Try to connect 5 times. Error after 6th time never displayed
+                self.Connect(retry=self.MAX_FAIL + 1)  # Increments self.connect_errors on failure
+                queue.set_device(self.device)
+                delta = round(time.time() - GLO['APP_RESTART_TIME'], 2)
+                v1_print("{0:>8.2f}".format(delta), "|", _who, "Attempted reconnect:",
+                         self.connect_errors + 1, "time(s).")
             else:
-                if self.stepNdx == 0:
-                    brightness = high
-                elif self.stepNdx == step_count - 1:  # Last index in range?
-                    brightness = low
-                else:
-                    brightness = high - int(self.stepNdx * step_amount)
+                # Failed to connect self.MAX_FAIL consecutive times.
+                # self.finishBreathing() shows message on tkinter thread.
+                self.breathe_error = gatt_err
 
-            brightness = low if brightness < low else brightness
-            brightness = high if brightness > high else brightness
+            return False
 
-            if cp.sunlight_percent > 0:  # Additional brightness for sunlight % > 0
-                new_high = high + int((float(high) * cp.sunlight_percent) / 100.0)
-                brightness += int((float(brightness) * cp.sunlight_percent) / 100.0)
-            else:
-                new_high = high
-
-            # When two colors, each color gets half brightness
-            half_bright = int(brightness / num_colors)  # 1 or 2 colors
-
-            # Integer rounding can make half_bright 1 less than true half
-            v3_print(_who, "1st half_bright:", half_bright)
-            self.red = half_bright if tr else 0
-            half_bright = brightness - half_bright if self.red > 0 else half_bright
-            self.green = half_bright if tg else 0
-            half_bright = brightness - half_bright if self.green > 0 else half_bright
-            self.blue = half_bright if tb else 0
-            v3_print(_who, "2nd half_bright:", half_bright)
-
-            ''' Override red+green has too much green GLO['LED_RED+GREEN_ADJ'] '''
-            if GLO['LED_RED+GREEN_ADJ'] is True and self.red and self.green:
-                self.green = int(self.green / 2)  # turns olive into yellow
-                self.red = int(brightness - self.green)
-                if self.green == 1 and self.red > 2:  # Value of 1 is LED light off.
-                    self.green += 1  # Green becomes 2, the dimmest possible color.
-                    self.red -= 1  # Red decremented to compensate for Green increment.
-
-            ''' Set LED facsimile color for computer monitor display '''
-            rp = float(self.red) / float(new_high)  # rp = red percentage
-            gp = float(self.green) / float(new_high)
-            bp = float(self.blue) / float(new_high)
-            rc = myMonitorColor(rp, gp, bp, "red")  # rc = red color
-            gc = myMonitorColor(gp, rp, bp, "green")
-            bc = myMonitorColor(bp, rp, gp, "blue")
-            self.monitor_color = "#%02x%02x%02x" % (rc, gc, bc)  # Hex = #f9f9f9
-
-            return sendCommand() and self.powerStatus == "ON"
-
-        def refresh(ms):
-            """ Call self.app.refreshApp() in loop for designated milliseconds. """
-            while ms > 0:
-                self.app.last_refresh_time = time.time()
-                tk_after = False if ms < GLO['REFRESH_MS'] else True
-                rst = time.time()
-                self.app.refreshApp(tk_after=tk_after)
-                #app.refreshApp(tk_after=tk_after)  # 2025-06-19 Display doesn't update
-                if not tk_after:
-                    time.sleep(fast_sleep)  # give 5 ms idle time
-                    self.app.update_idletasks()  # Give screen and mouse response
-                refresh_ms = int((time.time() - rst) * 1000)
-                ms -= refresh_ms
-                
-                if tk_after:  # tally normal refresh
-                    self.stat["norm_ms"] += refresh_ms
-                    self.stat["norm_cnt"] += 1
-                else:  # tally fast refresh
-                    self.stat["fast_ms"] += refresh_ms
-                    self.stat["fast_cnt"] += 1
-
-        def processStep():
-            """ Process One Step """
-            if not self.app.isActive:
+        def setColor(ndx):
+            """ Look up frame colors and call sendCommand to Bluetooth.
+                Return milliseconds to hold frame and sendCommand() result.
+            """
+            table.boost(cp.sunlight_percent)  # Nothing to do when unchanged
+            (self.red, self.green, self.blue), hold_ms, self.monitor_color = \
+                table.frame(ndx)
+            return hold_ms, sendCommand() and self.powerStatus == "ON"
+
+        def publish():
+            """ Replace self.snapshot for DisplayBreathing() """
+            written = dict(queue.stats)  # Measured by ColorQueue() thread
+            stat["gatt_ms"], stat["gatt_cnt"] = written["write_ms"], written["write_cnt"]
+            stat["gatt_low"], stat["gatt_high"] = written["write_low"], written["write_high"]
+            stat["ack_cnt"], stat["drop_cnt"] = written["ack_cnt"], written["drop_cnt"]
+            self.snapshot = {
+                "stat": dict(stat), "red": self.red, "green": self.green,
+                "blue": self.blue, "monitor_color": self.monitor_color,
+                "sunlight_percent": cp.sunlight_percent, "step_ms": step_ms}
+            self.stat = self.snapshot["stat"]
+
+        def processStep(ndx, due):
+            """ Process One Step. Return time next step is due or None to end. """
+            if not running():
                 v2_print(_who, "Closing down. self.app.isActive:", self.app.isActive)
-                return False
-            if not self.already_breathing_colors:
-                return False  # Nighttime and Set Color can turn off breathing
+                return None  # Nighttime and Set Color can turn off breathing
 
-            start_step = time.time()
-            result = setColor()  # Waits 1 second for a response
-            end_step = time.time()
+            start_step = monotonic()
+            hold_ms, result = setColor(ndx)  # Only waits to reconnect
+            end_step = monotonic()
             gatt_ms = int((end_step - start_step) * 1000.0)
 
-            if result:
-                self.stat["gatt_ms"] += gatt_ms
-                self.stat["gatt_cnt"] += 1
-                if self.stat["gatt_high"] == 0:  # First gatt encountered?
-                    self.stat["gatt_low"] = self.stat["gatt_high"] = gatt_ms
-                if gatt_ms < self.stat["gatt_low"]:
-                    self.stat["gatt_low"] = gatt_ms
-                if gatt_ms > self.stat["gatt_high"]:
-                    self.stat["gatt_high"] = gatt_ms
-            else:
-                if not self.app.isActive:  # Shutting down?
-                    self.already_breathing_colors = False  # End this method
-                    return False
-                self.stat["fail_ms"] += gatt_ms  # Time waiting for response
-                self.stat["fail_cnt"] += 1
+            if not result:
+                if not running():  # Shutting down?
+                    return None
+                stat["fail_ms"] += gatt_ms  # Time waiting for response
+                stat["fail_cnt"] += 1
 
                 # LED Light strip not connected OR Nighttime/Set Color menu options
-                # v2_print(_who, "LED Light strip not connected.")
-                if self.connect_errors == self.MAX_FAIL:  # Give up
+                if self.connect_errors == self.MAX_FAIL or self.breathe_error:
                     self.connect_errors = 0  # Reset self.Connect() errors
-                    self.already_breathing_colors = False  # End this method
                     self.device = None
                     self.powerStatus = "?"
-                    return False
+                    return None  # Give up
 
-            self.app.last_refresh_time = time.time()
-            sleep_ms = step_ms - gatt_ms
-            sleep_ms = 0 if sleep_ms < 0 else sleep_ms
+            # Frame holds step ms. At low, hold for bots. At high, hold for tops
+            self.stepNdx = ndx % step_count
+            if hold_ms != step_ms:
+                v2_print(ext.ch(), "Holding", hold_ms, "ms at step:", ndx)
+
+            due += float(hold_ms) / 1000.0
+            sleep_ms = int((due - monotonic()) * 1000.0)
+            if sleep_ms < 0:  # GATT command took longer than the step
+                stat["late_ms"] -= sleep_ms
+                stat["late_cnt"] += 1
+                due = monotonic()  # Restart schedule from now
+                sleep_ms = 0
 
             # Sleep low & high are exempt from bots and tops
-            if self.stat["sleep_high"] == 0:  # First sleep encountered?
-                self.stat["sleep_low"] = self.stat["sleep_high"] = sleep_ms
-            if self.stat["sleep_low"] > sleep_ms > 0:
-                self.stat["sleep_low"] = sleep_ms
-            if sleep_ms > self.stat["sleep_high"]:
-                self.stat["sleep_high"] = sleep_ms
-
-            # Override sleep_ms - at low, sleep for bots, at high, sleep for tops
-            if self.stepNdx == step_count - 1:  # Last step?
-                if turning_up:
-                    sleep_ms = tops
-                    v2_print(ext.ch(), "HIGHEST Brightness")
-                else:
-                    sleep_ms = bots
-                    v2_print(ext.ch(), "LOWEST Brightness")
+            if hold_ms == step_ms:
+                if stat["sleep_high"] == 0:  # First sleep encountered?
+                    stat["sleep_low"] = stat["sleep_high"] = sleep_ms
+                if stat["sleep_low"] > sleep_ms > 0:
+                    stat["sleep_low"] = sleep_ms
+                if sleep_ms > stat["sleep_high"]:
+                    stat["sleep_high"] = sleep_ms
 
             if sleep_ms:  # Time for sleeping after gatt command?
-                self.stat["sleep_ms"] += sleep_ms
-                self.stat["sleep_cnt"] += 1
-                refresh(sleep_ms)  # Normal / Fast Refresh in loop
-
-            return True
-
-        # Main loop until app closes or method ends
-        while self.app.isActive:
-            for self.stepNdx in range(step_count):
-                if not processStep():
+                stat["sleep_ms"] += sleep_ms
+                stat["sleep_cnt"] += 1
+            publish()
+            if sleep_ms and stop_event.wait(float(sleep_ms) / 1000.0):
+                return None  # self.stopBreathing()
+            return due
+
+        # Main loop until app closes or stopBreathing()
+        publish()
+        next_due = monotonic()
+        try:
+            ndx = 0
+            while running():
+                next_due = processStep(ndx, next_due)
+                if next_due is None:  # Is method ending?
+                    if self.powerStatus == "ON":
+                        v2_print(_who, "Forced off by Nighttime or Set Color menu option.")
+                    elif self.powerStatus == "?":
+                        v2_print(_who, "Lost connection to: '" + self.name + "'.")
+                    elif self.powerStatus == "OFF":
+                        v2_print(_who, "'" + self.name + "' was manually turned off.")
+                    else:
+                        v0_print(_who, "Breathing Colors invalid power",
+                                 "status: '" + self.powerStatus + "'.")
                     break
-
-            if not self.already_breathing_colors:  # Is method ending?
-                if self.powerStatus == "ON":
-                    v2_print(_who, "Forced off by Nighttime or Set Color menu option.")
-                elif self.powerStatus == "?":
-                    v2_print(_who, "Lost connection to: '" + self.name + "'.")
-                elif self.powerStatus == "OFF":
-                    v2_print(_who, "'" + self.name + "' was manually turned off.")
-                else:
-                    v0_print(_who, "Breathing Colors invalid power",
-                             "status: '" + self.powerStatus + "'.")
-                break
-
-            if turning_up:  # End turning up. Begin turning down.
-                v2_print(ext.ch(), "Turning down brightness")
-            else:  # End turning down. Begin turning up.
-                color_ndx += 1  # Next color
-                color_ndx = color_ndx if color_ndx <= color_max else 0
-                v2_print(ext.ch(), "New color_ndx:", color_ndx)
-            turning_up = not turning_up  # Flip direction
+                ndx = ndx + 1 if ndx + 1 < len(table) else 0  # Next frame
+        except Exception as err:  # Thread must not die silently
+            v0_print(_who, "Breathing colors failed:", err)
+        queue.close()  # Last color written before stopBreathing() returns
 
         # Statistics displayed with "View" dropdown, "Breathing stats"
         v1_print("\n" + ext.ch() + _who, "Parameters:")
         v1_print("  low:", low, " | high:", high, " | span:", span,
                  " | step:", step, " | bots:", bots, " | tops:", tops)
         v1_print("  step_count:", step_count, " | step_amount:", step_amount,
-                 " | step_ms:", step_ms)
+                 " | step_ms:", step_ms, " | frames:", len(table))
 
         v1_print("\n" + _who, "Run Statistics:")
-        gatt_avg = 0 if self.stat["gatt_cnt"] == 0 else self.stat["gatt_ms"] / self.stat["gatt_cnt"]
-        v1_print("  gatt_ms:", self.stat["gatt_ms"], " | gatt_cnt:", 
-                 self.stat["gatt_cnt"], " | average:", gatt_avg, 
-                 " | low:", self.stat["gatt_low"], " | high:", self.stat["gatt_high"])
-
-        sleep_avg = 0 if self.stat["sleep_cnt"] == 0 else self.stat["sleep_ms"] / self.stat["sleep_cnt"]
-        v1_print("  sleep_ms:", self.stat["sleep_ms"], " | sleep_cnt:",
-                 self.stat["sleep_cnt"], " | average:", sleep_avg, 
-                 " | low:", self.stat["sleep_low"], " | high:", self.stat["sleep_high"])
-
-        norm_avg = 0 if self.stat["norm_cnt"] == 0 else self.stat["norm_ms"] / self.stat["norm_cnt"]
-        v1_print("  norm_ms:", self.stat["norm_ms"], " | norm_cnt:", self.stat["norm_cnt"],
-                 " | average:", norm_avg, " | REFRESH_MS:", GLO['REFRESH_MS'])
-
-        fast_avg = 0 if self.stat["fast_cnt"] == 0 else self.stat["fast_ms"] / self.stat["fast_cnt"]
-        v1_print("  fast_ms:", self.stat["fast_ms"], " | fast_cnt:", self.stat["fast_cnt"],
-                 " | average:", fast_avg, " | self.FAST_MS:", self.FAST_MS)
-
-        fail_avg = 0 if self.stat["fail_cnt"] == 0 else self.stat["fail_ms"] / self.stat["fail_cnt"]
-        v1_print("  fail_ms:", self.stat["fail_ms"], " | fail_cnt:", self.stat["fail_cnt"],
-                 " | average:", fail_avg, " | self.MAX_FAIL:", self.MAX_FAIL, "\n")
-
+        gatt_avg = 0 if stat["gatt_cnt"] == 0 else stat["gatt_ms"] / stat["gatt_cnt"]
+        v1_print("  gatt_ms:", stat["gatt_ms"], " | gatt_cnt:",
+                 stat["gatt_cnt"], " | average:", gatt_avg,
+                 " | low:", stat["gatt_low"], " | high:", stat["gatt_high"])
+
+        sleep_avg = 0 if stat["sleep_cnt"] == 0 else stat["sleep_ms"] / stat["sleep_cnt"]
+        v1_print("  sleep_ms:", stat["sleep_ms"], " | sleep_cnt:",
+                 stat["sleep_cnt"], " | average:", sleep_avg,
+                 " | low:", stat["sleep_low"], " | high:", stat["sleep_high"])
+
+        late_avg = 0 if stat["late_cnt"] == 0 else stat["late_ms"] / stat["late_cnt"]
+        v1_print("  late_ms:", stat["late_ms"], " | late_cnt:", stat["late_cnt"],
+                 " | average:", late_avg, " | step_ms:", step_ms)
+
+        fail_avg = 0 if stat["fail_cnt"] == 0 else stat["fail_ms"] / stat["fail_cnt"]
+        v1_print("  fail_ms:", stat["fail_ms"], " | fail_cnt:", stat["fail_cnt"],
+                 " | average:", fail_avg, " | self.MAX_FAIL:", self.MAX_FAIL)
+        v1_print("  ack_cnt:", stat["ack_cnt"], " | drop_cnt:", stat["drop_cnt"], "\n")
+
+        publish()
         v2_print(self.monitorBreatheColors(test=True))
-
-        self.already_breathing_colors = False
-        self.app.updateDropdown()  # Disable "View" dropdown menu option "Breathing stats".
+        self.already_breathing_colors = False  # app.refreshApp() finishes up
 
     def monitorBreatheColors(self, test=False):
-        """ Format statistics generated inside self.breatheColors() method.
+        """ Format statistics generated inside self.breatheWorker() thread.
             Called by Application DisplayBreathing().
         """
         _who = self.who + "monitorBreatheColors():"
         if self.already_breathing_colors is False and test is False:
             v0_print("\n" + ext.ch(), _who, "Breathe Colors is NOT running!")
             return
-        
+
+        snap = self.snapshot  # Read once. breatheWorker() replaces it.
+        if snap is None:
+            return  # Thread hasn't published yet
+        stat = snap["stat"]
+
         ''' parm = {"low": low, "high": high, "span": span, "step": step,
                     "bots": bots, "tops": tops}  # breatheColors() parameters '''
 
-        txt = "\tRed:  " + str(self.red) + "\tGreen:  " + str(self.green)
-        txt += "\tBlue:  " + str(self.blue)
-        if cp.sunlight_percent > 0:
+        txt = "\tRed:  " + str(snap["red"]) + "\tGreen:  " + str(snap["green"])
+        txt += "\tBlue:  " + str(snap["blue"])
+        if snap["sunlight_percent"] > 0:
             txt += "\tSunlight percentage boost:\t"
-            txt += str(cp.sunlight_percent) + " %"
+            txt += str(snap["sunlight_percent"]) + " %"
         txt += "\n\n"
 
         def one(name, ms, cnt, ms2=None, ms3=None):
             """ Format one line. """
-            ret = name + "\t" + '{:,}'.format(self.stat[ms])
-            ret += "\t" + '{:,}'.format(self.stat[cnt])  # integer w/ comma thousands
-            avg = 0 if self.stat[cnt] == 0 else int(self.stat[ms] / self.stat[cnt])
+            ret = name + "\t" + '{:,}'.format(stat[ms])
+            ret += "\t" + '{:,}'.format(stat[cnt])  # integer w/ comma thousands
+            avg = 0 if stat[cnt] == 0 else int(stat[ms] / stat[cnt])
             ret += "\t" + '{:,}'.format(avg)  # integer with comma thousands separator
             if ms2 is None:  # Last two columns aren't used
                 ret += "\n"  # append new line character
             elif isinstance(ms3, str):  # gatt or sleep: low and high?
-                ret += "\t" + '{:,}'.format(self.stat[ms2])  # lowest found
-                ret += "\t" + '{:,}'.format(self.stat[ms3]) + "\n"  # highest found
+                ret += "\t" + '{:,}'.format(stat[ms2])  # lowest found
+                ret += "\t" + '{:,}'.format(stat[ms3]) + "\n"  # highest found
             else:  # ms2 is variable name string, ms3 is an integer
                 ret += "\t" + ms2 + "\t" + '{:,}'.format(ms3) + "\n"
             return ret
 
         ''' stat = {
             "gatt_ms": 0, "gatt_cnt": 0, "gatt_low": 0, "gatt_high": 0, "sleep_ms": 0,
-            "sleep_cnt": 0, "fast_ms": 0, "fast_cnt": 0, "norm_ms": 0, "norm_cnt": 0,
-            "fail_ms": 0, "fail_cnt": 0
+            "sleep_cnt": 0, "sleep_low": 0, "sleep_high": 0, "late_ms": 0,
+            "late_cnt": 0, "fail_ms": 0, "fail_cnt": 0, "ack_cnt": 0, "drop_cnt": 0
         } '''
 
         # Tabs= Left             Right  Right    Right  Left    Left
@@ -5066,9 +6062,10 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
 
         txt += one("Set LED Color", "gatt_ms", "gatt_cnt", "gatt_low", "gatt_high")
         txt += one("Set LED Sleep", "sleep_ms", "sleep_cnt", "sleep_low", "sleep_high")
-        txt += one("Regular Refresh", "norm_ms", "norm_cnt", "REFRESH_MS:", GLO['REFRESH_MS'])
-        txt += one("Fast Refresh", "fast_ms", "fast_cnt", "FAST_MS:", self.FAST_MS)
+        txt += one("Late Steps", "late_ms", "late_cnt", "STEP_MS:", snap["step_ms"])
         txt += one("GATT Failures", "fail_ms", "fail_cnt", "MAX_FAIL:", self.MAX_FAIL)
+        txt += "Acknowledged\t\t" + '{:,}'.format(stat["ack_cnt"])
+        txt += "\t\tDropped:\t" + '{:,}'.format(stat["drop_cnt"]) + "\n"
 
         return txt
 
@@ -5100,12 +6097,22 @@ class BluetoothLedLightStrip(DeviceCommonSelf):
             self.powerStatus = "?"
             return self.device
 
+        if self.device is not None:  # Reconnect, E.G. breatheWorker() retry
+            # bgapi adapter holds BLED112 serial port and a receiver thread
+            device, self.device = self.device, None
+            try:
+                tc.disconnect(device)
+            except (tc.pygatt.exceptions.BLEError, AttributeError) as err:
+                v1_print(_who, "Previous device:", err)
+
         self.cmdStart = time.time()
-        self.cmdCommand = ["tc.connect", GLO['LED_LIGHTS_MAC']]
+        self.cmdCommand = ["tc.connect", GLO['LED_LIGHTS_MAC'], GLO['LED_BACKEND']]
         self.cmdString = ' '.join(self.cmdCommand)
 
         try:
-            self.device = tc.connect(GLO['LED_LIGHTS_MAC'], reset_on_start=sudo_reset)
+            self.device = tc.connect(
+                GLO['LED_LIGHTS_MAC'], reset_on_start=sudo_reset,
+                backend=GLO['LED_BACKEND'], serial_port=GLO['LED_SERIAL_PORT'] or None)
             self.connect_errors = 0  # Reset connect error counter
         except tc.pygatt.exceptions.NotConnectedError as err:
             v2_print(_who, "error:")
@@ -5242,12 +6249,12 @@ $ ps aux | grep gatttool | grep -v grep | wc -l
         _who = self.who + "turnOn():"
         v2_print("\n" + _who, "Send GATT cmd to:", self.name)
 
+        self.stopBreathing()  # Restarted below
         if self.device is None:
             self.Connect()
 
         try:
             tc.powerOn(self.device)
-            self.already_breathing_colors = False
             self.powerStatus = "ON"  # Can be "ON", "OFF" or "?"
             v1_print(_who, "self.suspendPowerOff:", self.suspendPowerOff)
             # BluetoothLedLightStrip().turnOn(): self.suspendPowerOff: 1
@@ -5287,10 +6294,10 @@ $ ps aux | grep gatttool | grep -v grep | wc -l
             else:
                 return  # Already "OFF" or "?"
 
+        self.stopBreathing()  # Wait for last GATT command
         try:
             tc.powerOff(self.device)
             self.powerStatus = "OFF"  # Can be "ON", "OFF" or "?"
-            self.already_breathing_colors = False
             return self.powerStatus
         except pygatt.exceptions.NotConnectedError as err:
             v0_print(_who, err)
@@ -5367,7 +6374,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         self.last_red = self.last_green = self.last_blue = 0  # Display when different.
 
         self.isActive = True  # Set False when exiting or suspending
-        self.requires = ['arp', 'getent', 'timeout', 'curl', 'adb', 'hs100.sh', 'aplay',
+        self.requires = ['arp', 'getent', 'timeout', 'adb', 'aplay',
                          'ps', 'grep', 'xdotool', 'wmctrl', 'nmcli', 'sensors']
         self.installed = []
         self.checkDependencies(self.requires, self.installed)
@@ -5400,9 +6407,21 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         self.rediscovering = False
         self.last_rediscover_time = time.time()
         self.spam_count = 0  # How many times self.Rediscover() called in error.
+        self.rediscover_thread = None  # self.rediscoverWorker() thread
+        self.rediscover_queue = Queue.Queue()  # Events for self.drainRediscover()
+        self.rediscover_stop = threading.Event()  # Stop worker before suspend, etc.
+        self.power_queue = Queue.Queue()  # self.pollPower() thread results
+        self.power_pending = 0  # getPower() threads not applied to treeview yet
+        self.power_start = 0.0  # Time refreshAllPowerStatuses() started threads
+        self.power_latency = {}  # Last getPower() seconds by MAC address
 
         # self.exitRediscover() resets self.last_rediscover_time & self.rediscovering
-        self.last_minute = "0"  # Check sunlight percentage every minute
+        self.sched = hc.Scheduler(on_wake=self.wakeLoop)  # self.scheduleJobs()
+        if p_args.profile_loop:  # Else View dropdown menu "Loop performance"
+            self.sched.profile = hc.LoopProfile()
+        self.wake_var = None  # tk.BooleanVar() self.loopForever() is waiting on
+        self.wake_id = None  # self.after() id that sets self.wake_var
+        self.refresh_depth = 0  # refreshApp() calls running. Nested when > 1
         #self.last_second = "0"  # Update YouTube progress every second
         self.force_refresh_power_time = time.time() + 90.0  # 1 minute after treeview done
 
@@ -5553,9 +6572,9 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         ''' If Sony TV used, enable Sony Volume menu controls '''
         self.updateDropdown()
 
-        ''' Polling and processing with refresh tkinter forever loop '''
-        while self.refreshApp():  # Run forever until quit
-            pass  # 2025-09-14 TODO: Redesign like yt-skip.py self.loopForever()
+        ''' Run scheduled jobs and process tkinter events forever '''
+        self.scheduleJobs()  # 2026-10-18 Jobs run when due instead of every frame
+        self.loopForever()  # Never returns. self.exitApp() calls sys.exit()
 
     def getWindowID(self, title):
         """ Use wmctrl to get window ID in hex and convert to decimal for xdotool
@@ -5662,6 +6681,8 @@ class Application(DeviceCommonSelf, tk.Toplevel):
                                    command=self.DisplayErrors, state=tk.DISABLED)
         self.view_menu.add_command(label="Breathing stats", font=g.FONT, underline=10,
                                    command=self.DisplayBreathing, state=tk.DISABLED)
+        self.view_menu.add_command(label="Loop performance", font=g.FONT, underline=0,
+                                   command=self.DisplayLoopProfile, state=tk.DISABLED)
 
         _menubar.add_cascade(label="View", font=g.FONT, underline=0, menu=self.view_menu)
         self.view_menu.config(activebackground="SkyBlue3", activeforeground="black")
@@ -5757,6 +6778,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         # Default to enabled
         self.view_menu.entryconfig("Bluetooth devices", state=tk.NORMAL)
         self.view_menu.entryconfig("Discovery timings", state=tk.NORMAL)
+        self.view_menu.entryconfig("Loop performance", state=tk.NORMAL)
 
         # Enable options depending on Sensors Treeview or Devices Treeview mounted
         if self.usingDevicesTreeview:  # Devices Treeview is displayed
@@ -5782,6 +6804,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
             self.view_menu.entryconfig("Discovery timings", state=tk.DISABLED)
             self.view_menu.entryconfig("Discovery errors", state=tk.DISABLED)
             self.view_menu.entryconfig("Breathing stats", state=tk.DISABLED)
+            self.view_menu.entryconfig("Loop performance", state=tk.DISABLED)
 
         ''' Tools Menu '''
         self.tools_menu.entryconfig("Configure YouTube Ads", state=tk.NORMAL)
@@ -5805,14 +6828,21 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         msg = None
         if self.dtb:  # Cannot Close when resume countdown timer is running.
             msg = "Countdown timer is running."
-        if self.rediscovering:  # Cannot suspend during rediscovery.
-            msg = "Device rediscovery is in progress for a few seconds."
 
         if msg and not kill_now:  # Cannot suspend when other jobs are active
             self.showInfoMsg("Cannot Close now.", msg, icon="error")
             v0_print(_who, "Aborting Close.", msg)
             return
 
+        self.stopRediscover()  # 2026-10-18 Background thread may be running
+        if p_args.profile_loop:
+            self.profileJob()  # Print loop profile one last time
+        em.stop()  # 2026-10-18 HS110 power history thread
+        if self.sonySaveInst:
+            self.sonySaveInst.stopMonitor()  # 2026-10-18 Sony TV events thread
+        if self.bleSaveInst:
+            self.bleSaveInst.stopBreathing()  # 2026-10-18 Breathing colors thread
+
         # Need Devices treeview displayed to save ni.view_order
         if not self.usingDevicesTreeview:
             self.toggleSensorsDevices()  # Toggle off Sensors Treeview
@@ -5832,6 +6862,9 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         ni.view_order = order
         save_files()
         sql.close_homa_db()  # Close SQL History Table
+        rings = [instance['instance'].cmdEvents for instance in ni.instances]
+        hc.events.close(rings + [ni.cmdEvents, sm.cmdEvents, cp.cmdEvents,
+                                 self.cmdEvents])  # 2026-10-18 Save to library.db
 
         ''' reset to original SAVE_CWD (saved current working directory) '''
         if SAVE_CWD != g.PROGRAM_DIR:
@@ -6685,18 +7718,14 @@ class Application(DeviceCommonSelf, tk.Toplevel):
             during homa.py startup and resuming from suspend.
 
             OVERVIEW:
-            Suspends self.refreshApp() running in self.App.__init__() loop.
-            Calls cr.inst.breatheColors() which loops forever and:
-                Exit if app.isActive is False
-                Exit if self.already_breathing_colors is False
-                Calls app.refreshApp after each LED set color as time permits
+            2026-10-18 cr.inst.breatheColors() starts breatheWorker() thread
+                and returns. self.refreshApp() keeps running. Thread ends when:
+                app.isActive is False
+                cr.inst.stopBreathing() is called
 
         """
         _who = self.who + "setLEDBreathe():"
-        resp = cr.inst.breatheColors()  # Loops forever until self.isActive False
-        self.last_refresh_time = time.time()
-        if not self.isActive:
-            return
+        resp = cr.inst.breatheColors()  # Returns after starting thread
         self.displayTreePower(cr, resp)
 
     def turnOn(self, cr):
@@ -7000,23 +8029,168 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         # Class to create window and process Device Details
         LayoutDetails(self, cr, updateDetails)
 
+    def scheduleJobs(self):
+        """ Jobs run by refreshApp() when they are due. Each job returns seconds
+            until it needs to run again, or None for the seconds given here.
+
+            2026-10-18 Until now every job was checked every GLO['REFRESH_MS']
+                whether it had anything to do or not.
+        """
+        if self.sonySaveInst:
+            self.sched.every("sony", 0.1, self.sonyJob)
+        self.sched.every("tooltips", 0.1, self.tooltipsJob)
+        self.tt.wake_callback = lambda: self.sched.wake("tooltips")
+        self.sched.every("power", 1.0, self.powerJob)
+        if self.bleSaveInst:
+            self.sched.every("breathing", 1.0, self.breathingJob)
+        self.sched.every("sensors", 1.0, self.sensorsJob)
+        self.sched.every("minute", 60.0, self.minuteJob)
+        self.sched.every("rediscover", 1.0, self.rediscoverJob)
+        self.sched.every("commands", 1.0, self.commandsJob)
+        hc.executor.wake = lambda: self.sched.wake("commands")
+        if p_args.profile_loop:
+            self.sched.every("profile", 60.0, self.profileJob, first=60.0)
+
+    def sonyJob(self):
+        """ Apply Sony TV state changes posted by monitorWorker() thread """
+        self.sonySaveInst.checkSonyEvents()  # 2026-10-18 Never waits on TV
+        if self.sony_suspended_system is True:  # Sony TV initiated suspend
+            self.Suspend(sony_remote_powered_off=True)  # Turns on event logging
+            # Will not return until Suspend finishes and resume finishes
+            self.sony_suspended_system = False  # not needed but insurance
+
+    def tooltipsJob(self):
+        """ Tooltips fade in and out every frame. Idle until mouse event. """
+        self.tt.poll_tips()
+        if self.tt.tips_busy():
+            return GLO['REFRESH_MS'] / 1000.0
+        return 1.0  # self.tt.log_event() wakes job sooner
+
+    def powerJob(self):
+        """ 1 minute after restart or resume, refresh unknown power statuses """
+        if self.force_refresh_power_time and time.time() > self.force_refresh_power_time:
+            self.force_refresh_power_time = 0.0  # Don't do it again
+            self.GATTToolJobs(found_inst=self.bleSaveInst)
+            self.refreshAllPowerStatuses()  # Display "ON", "OFF" or "?"
+
+    def breathingJob(self):
+        """ Did breathing colors thread end by itself? Display statistics. """
+        self.bleSaveInst.checkBreathing()
+        if self.bleScrollbox:  # Statistics for breathing colors?
+            self.DisplayBreathing()  # Display single step in Bluetooth LEDs
+            return GLO['REFRESH_MS'] / 1000.0
+
+    @staticmethod
+    def sensorsJob():
+        """ if GLO['SENSOR_CHECK'] <= 0 the feature is turned off """
+        if GLO['SENSOR_CHECK'] > 0:
+            sm.Sensors()  # Check `sensors` every GLO['SENSOR_CHECK'] seconds
+
+    @staticmethod
+    def minuteJob():
+        """ Get sunlight percentage every minute for LED light strip boost """
+        night = cp.getNightLightStatus()
+        v2_print("Application().minuteJob():", ext.t(),
+                 "cp.getNightLightStatus():", night)
+        return 60.0 - time.time() % 60.0 + 0.1  # Just after next minute starts
+
+    def rediscoverJob(self):
+        """ Apply rediscoverWorker() thread results every frame until done.
+            Otherwise wait for GLO['REDISCOVER_SECONDS'] to start again.
+        """
+        if self.rediscovering:
+            self.drainRediscover()  # Apply rediscoverWorker() thread results
+            return GLO['REFRESH_MS'] / 1000.0
+
+        elapsed = time.time() - self.last_rediscover_time
+        if int(elapsed) > GLO['REDISCOVER_SECONDS']:
+            # 2025-08-08 - automatic rediscovery unreliable. Disable it.
+            # 2026-10-18 - Enabled. rediscoverWorker() thread never blocks Tk.
+            self.Rediscover(auto=True)  # Check for new network devices
+            return GLO['REFRESH_MS'] / 1000.0
+        # last_rediscover_time moves forward when volume changes, etc.
+        return max(GLO['REDISCOVER_SECONDS'] - elapsed + 1.0, 0.1)
+
+    @staticmethod
+    def commandsJob():
+        """ Run runCommandAsync() callbacks on tkinter thread """
+        hc.executor.drain()
+        if hc.executor.busy():
+            return GLO['REFRESH_MS'] / 1000.0
+        return 1.0  # hc.executor.submit() wakes job sooner
+
+    def profileJob(self):
+        """ homa.py --profile-loop prints loop profile every minute """
+        if self.sched.profile:
+            v0_print("\n" + "\n".join(self.sched.profile.report()))
+
+    def loopForever(self):
+        """ Run jobs when due. In between, tkinter waits for events.
+            2025-09-14 TODO: Redesign like yt-skip.py self.loopForever()
+            2026-10-18 Done. Was refreshApp() every GLO['REFRESH_MS'].
+        """
+        self.wake_var = tk.BooleanVar()
+        while True:
+            prof = self.sched.profile  # hc.LoopProfile() or None
+            start = time.time()
+            if not self.refreshApp(tk_after=False):
+                break
+            self.last_refresh_time = time.time()
+            if prof:  # Outermost refreshApp(). Nested calls don't record frames.
+                prof.frame(self.last_refresh_time - start, GLO['REFRESH_MS'])
+
+            ms = self.sched.wait_ms()
+            if ms <= 0:
+                continue  # Job due again already. refreshApp() ran update()
+            self.wake_id = self.after(ms, self.wakeLoop)
+            start = time.time()
+            self.wait_variable(self.wake_var)  # Process events until wakeLoop()
+            if prof:  # tkinter event callbacks that made jobs late
+                prof.record("late", max(time.time() - start - ms / 1000.0, 0.0))
+
+    def wakeLoop(self):
+        """ Stop waiting in loopForever(). Called by self.after() when next job
+            is due and by self.sched.wake() when a job is due sooner.
+        """
+        if self.wake_id:
+            self.after_cancel(self.wake_id)
+            self.wake_id = None
+        if self.wake_var is not None:
+            self.wake_var.set(True)
+
     def refreshApp(self, tk_after=True):
-        """ Sleeping loop until need to do something. Fade tooltips. Resume from
+        """ Run scheduled jobs that are due. Fade tooltips. Resume from
             suspend. Monitor Sony TV settings. Rediscover devices.
 
             Multiple instances of refreshApp can be running:
-                1) Called in mainloop of Application.__init__()
-                2) Called by Right-Click Breathe Colors()
-                3) Called by Suspend->Resume->Breathe Colors()
-                4) Called by showInfo() and other user wait dialogs()
-                5) Called by ResumeWait() countdown timer
+                1) Called by loopForever() of Application.__init__()
+                2) Called by showInfo() and other user wait dialogs()
+                3) Called by ResumeWait() countdown timer
+
+            2026-10-18 Breathe Colors() no longer calls refreshApp(). It runs
+                in BluetoothLedLightStrip.breatheWorker() thread.
 
-            When a new instance of refreshApp() starts, the previous version(s)
-            is paused until the caller of the new instance finishes.
+            2026-10-18 Jobs are in self.sched (see self.scheduleJobs()). When a
+                new instance of refreshApp() starts, jobs the previous
+                version(s) are still running are skipped until they return.
 
+            2026-10-18 Only the outermost refreshApp() records a
+                hc.LoopProfile() frame. Its time includes nested calls.
+
+            :param tk_after: Sleep remaining GLO['REFRESH_MS'] for callers
+                looping until user responds. False returns right away.
         """
+        self.refresh_depth += 1
+        try:
+            return self.refreshPass(tk_after)
+        finally:
+            self.refresh_depth -= 1
+
+    def refreshPass(self, tk_after):
+        """ Body of refreshApp() inside self.refresh_depth count """
 
         _who = self.who + "refreshApp()"
+        start = time.time()  # hc.LoopProfile() frame time
         self.update_idletasks()
 
         if not self.winfo_exists():  # Application window destroyed?
@@ -7037,63 +8211,38 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         if not self.winfo_exists():  # Application window destroyed?
             return False  # self.exitApp() has set to None
 
-        if self.sonySaveInst:  # Check Sony TV special features if enabled
-            self.sonySaveInst.checkSonyEvents()  # 2025-06-01 new method
-            if self.sony_suspended_system is True:  # Sony TV initiated suspend
-                self.Suspend(sony_remote_powered_off=True)  # Turns on event logging
-                # Will not return until Suspend finishes and resume finishes
-                now = time.time()  # Time changed after resume
-                self.sony_suspended_system = False  # not needed but insurance
-
-            if not self.winfo_exists():  # Application window destroyed?
-                return False  # self.exitApp() has set to None
-
-        self.tt.poll_tips()  # Tooltips fade in and out
-        self.update()  # process pending tk events in queue
-
-        ''' 1 minute after restart, refresh unknown power statuses '''
-        if self.force_refresh_power_time and now > self.force_refresh_power_time:
-            self.force_refresh_power_time = 0.0  # Don't do it again
-            self.GATTToolJobs(found_inst=self.bleSaveInst)
-            self.refreshAllPowerStatuses()  # Display "ON", "OFF" or "?"
+        self.sched.run()  # Sony TV, tooltips, breathing, sensors, rediscover...
 
         if not self.winfo_exists():  # Application window destroyed?
             return False  # self.exitApp() has set to None
 
-        if self.bleSaveInst and self.bleScrollbox:  # Statistics for breathing colors?
-            self.DisplayBreathing()  # Display single step in Bluetooth LEDs
-
-        # if GLO['SENSOR_CHECK'] <= 0 the feature is turned off
-        if GLO['SENSOR_CHECK'] > 0:
-            sm.Sensors()  # Check `sensors` every GLO['SENSOR_CHECK'] seconds
-
         # Speedy derivative called by CPU intensive methods.
-        if not tk_after:  # Skip tkinter update and 16 to 33ms sleep
+        if not tk_after:  # Skip 16 to 33ms sleep
+            self.update()  # Callers loop on self.after(5) so keys and close run
             return self.winfo_exists()  # Application window destroyed?
 
-        minute = ext.h(now).split(":")[1]  # Current minute for this hour
-        if minute != self.last_minute:  # Get sunlight percentage every minute
-            night = cp.getNightLightStatus()  # For LED light strip brightness boost
-            self.last_minute = minute  # Wait for minute change to check again
-            v2_print(_who, ext.t(), "cp.getNightLightStatus():", night)
-
-        if int(now - self.last_rediscover_time) > GLO['REDISCOVER_SECONDS']:
-            #self.Rediscover(auto=True)  # Check for new network devices
-            # 2025-08-08 - automatic rediscovery unreliable. Disable it.
-            pass
-
-        now = time.time()  # Time changed after .Rediscover()
+        now = time.time()  # Time changed after jobs ran
         if self.last_refresh_time > now:
             v0_print(_who, "self.last_refresh_time: ",
                      ext.h(self.last_refresh_time), " >  now: ", ext.h(now))
             now = self.last_refresh_time  # Reset for proper sleep time
 
         ''' Sleep remaining time to match GLO['REFRESH_MS'] '''
+        prof = self.sched.profile  # hc.LoopProfile() or None
+        update_start = time.time()
         self.update()  # Process everything in tkinter queue before sleeping
-        sleep = GLO['REFRESH_MS'] - int(now - self.last_refresh_time)
+        if prof:
+            now = time.time()
+            prof.record("update", now - update_start)
+            if self.refresh_depth == 1:  # Outer refreshApp() counts nested time
+                prof.frame(now - start, GLO['REFRESH_MS'])
+        # 2026-10-18 Seconds were subtracted from milliseconds
+        sleep = GLO['REFRESH_MS'] - int((now - self.last_refresh_time) * 1000.0)
         sleep = sleep if sleep > 0 else 1  # Sleep minimum 1 millisecond
         if sleep == 1:
-            v0_print(_who, "Only sleeping 1 millisecond")
+            v2_print(_who, "Only sleeping 1 millisecond")
+            if prof:
+                prof.short_sleeps += 1
         self.after(sleep)  # Sleep until next GLO['REFRESH_MS'] (30 to 60 fps)
         self.last_refresh_time = time.time()
 
@@ -7112,15 +8261,16 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         msg = None
         if self.dtb:  # Cannot suspend when resume countdown timer is running.
             msg = "Countdown timer is running."
-        if self.rediscovering:  # Cannot suspend during rediscovery.
-            msg = "Device rediscovery is in progress for a few seconds."
 
         if msg:  # Cannot suspend when other jobs are active
             self.showInfoMsg("Cannot Suspend now.", msg, icon="error")
             v0_print(_who, "Aborting suspend.", msg)
             return
 
+        self.stopRediscover()  # 2026-10-18 Background thread may be running
         self.exitRediscover()  # Not required now. Called after resume finishes.
+        if self.sonySaveInst:
+            self.sonySaveInst.stopMonitor()  # Restarted by checkSonyEvents()
 
         v1_print(_who, "\nSuspending system...")
         self.suspending = True  # Prevent error dialog from interrupting suspend
@@ -7139,7 +8289,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         self.resuming = False
 
         if self.bleSaveInst:  # Is breathing colors active?
-            self.bleSaveInst.already_breathing_colors = False  # Force shutdown
+            self.bleSaveInst.stopBreathing()  # Force shutdown
         self.update_idletasks()
         self.after(100)  # Extra time (besides power off time) for Breathing Colors
 
@@ -7295,7 +8445,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         if timer and alarm is True:  # Play sound when timer ends
             if self.checkInstalled("aplay"):
                 command_line_list = ["aplay", GLO['TIMER_ALARM']]
-                self.runCommand(command_line_list, _who)
+                self.runCommandAsync(command_line_list, _who)  # Don't wait for sound
 
         self.dtb.close()
         self.dtb = None
@@ -7311,20 +8461,47 @@ class Application(DeviceCommonSelf, tk.Toplevel):
             2026-05-24 TODO: check new self.layout["is_light"] boolean value
                 for True or False.
 
+            2026-10-18 Devices are switched in stages set by the type codes
+                in GLO['POWER_ALL_ORDER_LIST']. E.g. [[20, 30], [10]] is both
+                TVs at the same time, then bias light when "ON" and reverse
+                order when "OFF". A type code outside a sub-list is a stage
+                by itself. Type codes not in the list are switched in the
+                first stage. Smart plugs and TVs in the same stage are
+                switched at the same time with WorkerPool() threads. Waiting
+                for all stages ends after GLO['POWER_ALL_TIME'] seconds. Late
+                devices are still switched but not waited for or counted.
+
             :param state: Power state to set; "ON" or "OFF"
             :param fade: Fade in and out, false = No fading
             :param type_code: Process specific type_code outside of suspend/resume
             :param check_lights: Process specific type_code outside of suspend/resume
         """
         _who = self.who + "turnAllPower(" + state + "):"
+        if state not in ("ON", "OFF"):
+            v0_print(_who, "power state is not 'ON' or 'OFF':", state)
+            return
+
         isNightNow = cp.getNightLightStatus()  # Already v0 printed in resumeFromSuspend()
         v1_print(_who, "Nightlight status: '" + isNightNow + "'")  # Lights turn on at night
         cr = None  # Network devices treeview row instance and current iid
         if fade and self.usingDevicesTreeview:
             cr = TreeviewRow(self)  # Used to fade in row over 300ms
 
+        order_list = list(GLO['POWER_ALL_ORDER_LIST'])  # Stages in "ON" order
+        if state == "OFF":
+            order_list.reverse()  # E.g. Bias light off before TV off
+        stage_for_type = {}  # {type_code: stage}
+        for stage, codes in enumerate(order_list):
+            for code in codes if isinstance(codes, list) else [codes]:
+                stage_for_type.setdefault(code, stage)
+        network_types = [GLO['HS1_SP'], GLO['KDL_TV'], GLO['ADB_TV']]
+        stages = {}  # {stage: [{"inst", "switch", "night_powered_on"}, ...]}
+
         # Loop through discovered device instances stored in ni.instances[]
-        for i, instance in enumerate(ni.instances):
+        instances = ni.instances
+        if type_code:  # Only loop through instances of requested type_code
+            instances = ni.registry.instancesForTypeCode(type_code)
+        for instance in instances:
             mac = instance['mac']
             inst = instance['instance']
             layout = ni.layout_for_mac(mac)
@@ -7364,71 +8541,127 @@ class Application(DeviceCommonSelf, tk.Toplevel):
                     v1_print(_who, "Turn on Bias light at night.")
                     night_powered_on = True
 
-            if fade and cr:  # Current row exists when usingDevicesTreeview
-                iid = cr.getIidForInst(inst)  # Get treeview row IID
-                if iid is not None:
-                    cr.fadeIn(iid)  # Fading in was requested
+            # To avoid errors must be "ON" in order to turn "OFF".
+            switch = state == "ON" or inst.powerStatus == "ON"
+            stage = stage_for_type.get(inst.type_code, 0)
+            stages.setdefault(stage, []).append(
+                {"inst": inst, "switch": switch, "night_powered_on": night_powered_on})
 
-            if state == "ON":
-                if type_code is None:  # Called by Resume()
-                    v2_print(_who, "Switching power from '" + inst.powerStatus +
-                             "' to 'ON':", inst.name)
-                else:  # Called by "Turn ALL Lights Power" menu option or similar
-                    v1_print(_who, "Switching power from '" + inst.powerStatus +
-                             "' to 'ON':", inst.name)
-                inst.turnOn()  # inst.menuPowerOn += 1
-                if type_code is None:
+        def update_row(plan, late=False):
+            """ Update counters and Devices Treeview after device switched.
+                :param late: Still switching after GLO['POWER_ALL_TIME'].
+                    Counters aren't changed because it may fail.
+            """
+            _inst = plan['inst']
+            if plan['switch'] and type_code is None and not late:
+                if state == "ON":
                     # Assume powered on even if "?" due to timeout it can be "ON" later
-                    inst.resumePowerOn += 1  # Resume powered on the device
-                    inst.menuPowerOn = 0  # User didn't power on the device via menu
-                    inst.nightPowerOn += 1 if night_powered_on else 0
-            elif state == "OFF":
-                if inst.powerStatus == "ON":
-                    # To avoid errors must be "ON" in order to turn "OFF".
-                    if type_code is None:  # Called by Suspend()
-                        v2_print(_who, "Switching power from 'ON' to 'OFF':", inst.name)
-                    else:  # Called by "Turn ALL Lights Power" menu option or similar
-                        v1_print(_who, "Switching power from 'ON' to 'OFF':", inst.name)
-                    inst.turnOff()  # inst.menuPowerOff += 1
-                    if type_code is None:
-                        inst.suspendPowerOff += 1  # Suspend powered off the device
-                        inst.menuPowerOff = 0  # User didn't power on the device via menu
-                        # 2025-04-30 Track if Sony TV remote initiated system suspend
-                        inst.remote_suspends_system = self.sony_suspended_system
-            else:
-                v0_print(_who, inst.name, "power state is not 'ON' or 'OFF':", state)
-                return
+                    _inst.resumePowerOn += 1  # Resume powered on the device
+                    _inst.menuPowerOn = 0  # User didn't power on the device via menu
+                    _inst.nightPowerOn += 1 if plan['night_powered_on'] else 0
+                else:
+                    _inst.suspendPowerOff += 1  # Suspend powered off the device
+                    _inst.menuPowerOff = 0  # User didn't power on the device via menu
+                    # 2025-04-30 Track if Sony TV remote initiated system suspend
+                    _inst.remote_suspends_system = self.sony_suspended_system
 
             # Update Devices Treeview with power status
             if not self.usingDevicesTreeview:
-                continue  # No Devices Treeview to update
+                return  # No Devices Treeview to update
 
             # Get treeview row based on matching MAC address + type
             # Note that Laptop MAC address can have two types (Base and Display)
-            cr = TreeviewRow(self)  # Setup treeview row processing instance
-            iid = cr.getIidForInst(inst)  # Get iid number and set instance
-            if iid is None:
-                continue  # Instance not in Devices Treeview, perhaps a smartphone?
-
-            old_text = cr.power_text  # Treeview row old power state "  ON", etc.
-            cr.power_text = "  " + str(inst.powerStatus)  # Display treeview row new power state
-            if cr.power_text != old_text:
-                v1_print(_who, inst.name, "\n  Power status changed from: '"
-                         + old_text.strip() + "' to: '" + cr.power_text.strip() + "'.")
-            cr.Update(iid)  # Update iid with new ['text']
+            _cr = TreeviewRow(self)  # Setup treeview row processing instance
+            _iid = _cr.getIidForInst(_inst)  # Get iid number and set instance
+            if _iid is None:
+                return  # Instance not in Devices Treeview, perhaps a smartphone?
+
+            old_text = _cr.power_text  # Treeview row old power state "  ON", etc.
+            _cr.power_text = "  " + str(_inst.powerStatus)  # Display treeview row new power state
+            if _cr.power_text != old_text:
+                v1_print(_who, _inst.name, "\n  Power status changed from: '"
+                         + old_text.strip() + "' to: '" + _cr.power_text.strip() + "'.")
+            _cr.Update(_iid)  # Update iid with new ['text']
 
             # Display row by row when there is processing lag
             self.tree.update_idletasks()  # Slow mode display each row.
 
             # MAC address stored in treeview row hidden values[-1]
-            v2_print("\n" + _who, "i:", i, "cr.mac:", cr.mac)
-            v2_print("cr.inst:", cr.inst)
+            v2_print("\n" + _who, "cr.mac:", _cr.mac)
+            v2_print("cr.inst:", _cr.inst)
 
             if fade:  # Was fading out requested?
-                cr.fadeOut(iid)
+                _cr.fadeOut(_iid)
+
+        _start = time.time()
+        deadline = _start + float(GLO['POWER_ALL_TIME'])
+        thread_count = len([plan for plans in stages.values() for plan in plans
+                            if plan['switch'] and plan['inst'].type_code in network_types])
+        pool = hc.WorkerPool(thread_count, "turnAllPower") if thread_count else None
+        finished = Queue.Queue()  # Jobs finished by pool threads
+
+        for stage in sorted(stages):
+            pending = {}  # {PoolJob: plan} being switched by pool threads
+            for plan in stages[stage]:
+                inst = plan['inst']
+                if fade and cr:  # Current row exists when usingDevicesTreeview
+                    iid = cr.getIidForInst(inst)  # Get treeview row IID
+                    if iid is not None:
+                        cr.fadeIn(iid)  # Fading in was requested
+
+                if plan['switch'] and inst.type_code in network_types:
+                    job = pool.submit(self.switchPower, (inst, state, type_code),
+                                      callback=finished.put)
+                    pending[job] = plan
+                    continue
+
+                if plan['switch']:
+                    # Bluetooth LED Light strip turnOn() can call self.refreshApp()
+                    self.switchPower(inst, state, type_code)
+                update_row(plan)
+
+            while pending:
+                remaining = deadline - time.time()
+                if remaining <= 0.0:
+                    break  # Late devices are switched but not waited for
+                try:
+                    job = finished.get(timeout=remaining)
+                except Queue.Empty:
+                    break
+                if job in pending:
+                    update_row(pending.pop(job))
+
+            for job, plan in pending.items():
+                v0_print(_who, plan['inst'].name, "exceeded POWER_ALL_TIME:",
+                         GLO['POWER_ALL_TIME'])
+                update_row(plan, late=True)  # Status updated by next refresh
 
+        if pool:
+            pool.close()  # Threads end after last device switched
+
+        v1_print(_who, "Switched", thread_count, "network devices in",
+                 round(time.time() - _start, 3), "seconds.")
         v2_print()  # Blank line to separate debugging output
 
+    def switchPower(self, inst, state, type_code):
+        """ Run inst.turnOn() or inst.turnOff() for self.turnAllPower().
+            Runs in WorkerPool() thread for smart plugs and TVs.
+        """
+        _who = self.who + "turnAllPower(" + state + "):"
+        if type_code is None:  # Called by Resume() or Suspend()
+            v2_print(_who, "Switching power from '" + inst.powerStatus +
+                     "' to '" + state + "':", inst.name)
+        else:  # Called by "Turn ALL Lights Power" menu option or similar
+            v1_print(_who, "Switching power from '" + inst.powerStatus +
+                     "' to '" + state + "':", inst.name)
+        try:
+            if state == "ON":
+                inst.turnOn()  # inst.menuPowerOn += 1
+            else:
+                inst.turnOff()  # inst.menuPowerOff += 1
+        except Exception as err:  # Keep switching other devices
+            v0_print(_who, inst.name, "error:", err)
+
     def setColorScheme(self, scheme):
         """ Set color scheme for devices treeview and sensors treeview
             After setting color toggle treeview for new color to appear.
@@ -7460,65 +8693,153 @@ class Application(DeviceCommonSelf, tk.Toplevel):
             TreeviewRow.Get() creates a row instance to update text.
             Optional fading row instance in and out.
 
+            2026-10-18 Smart plugs and TVs call getPower() in threads at the
+                same time. self.applyPowerStatuses() uses self.after() to
+                update treeview rows as results arrive. Total time is the
+                slowest device instead of all devices added together.
+                Bluetooth LED and computer getPower() stay in Tk thread.
+                After GLO['POWER_STATUS_TIME'] hung getPower() results are
+                discarded so the next refresh isn't skipped.
+
             :param auto: If 'False' highlight Network Devices Treeview rows.
         """
         _who = self.who + "refreshAllPowerStatuses():"
 
+        if self.power_pending:
+            v1_print(_who, "Previous refresh still has", self.power_pending,
+                     "devices pending. Skipping.")
+            return
+
         # If auto, called automatically at GLO['REDISCOVER_SECONDS']
         cr = iid = None  # Assume Sensors Treeview is displayed
         if self.usingDevicesTreeview:
             cr = TreeviewRow(self)  # Setup treeview row processing instance
 
+        network_types = [GLO['HS1_SP'], GLO['KDL_TV'], GLO['ADB_TV']]
+        network_count = len([instance for instance in ni.instances
+                             if instance['instance'].type_code in network_types])
+        pool = hc.WorkerPool(network_count, "getPower") if network_count else None
+        self.power_queue = Queue.Queue()  # Results from older refresh discarded
+        self.power_start = time.time()
+        self.power_pending = 0  # applyPowerStatuses() gave up on older refresh
+
         # Loop through ni.instances
         for i, instance in enumerate(ni.instances):
             if not self.isActive:
-                return  # Shutting down
+                break  # Shutting down
 
             inst = instance['instance']
+            fade = False
             if self.usingDevicesTreeview:
                 # Get treeview row based on matching MAC address + device_type
                 iid = cr.getIidForInst(inst)  # Get iid number and set instance
-                if iid is not None:
-                    # When cr.power_text is "Wait..." fast startup so highlight each row
-                    if auto is False or cr.power_text == "Wait...":
-                        cr.fadeIn(iid)
+                # When cr.power_text is "Wait..." fast startup so highlight each row
+                fade = iid is not None and (auto is False or cr.power_text == "Wait...")
+
+            if inst.type_code in network_types:
+                self.power_pending += 1
+                pool.submit(self.pollPower, (inst, fade, self.power_queue))
+                if fade:
+                    cr.fadeIn(iid)  # Threads are running while fading in
+                continue
 
-            inst.getPower()  # Get the power status for device
+            if fade:
+                cr.fadeIn(iid)
+            self.pollPower(inst, fade, None)  # Bluetooth LED can call refreshApp()
             self.last_refresh_time = time.time()  # In case getPower() long time
+            self.applyPowerStatus(inst, fade, 0.0)
 
-            # Update Devices Treeview with power status
-            if not self.usingDevicesTreeview:
-                continue  # No Devices Treeview to update
-
-            if iid is None:
-                continue  # Instance not in Devices Treeview or treeview not mounted
-
-            old_text = cr.power_text  # Treeview row's old power state "  ON", etc.
-            cr.power_text = "  " + inst.powerStatus  # Display treeview row's new power state
-            if cr.power_text != old_text:
-                v1_print(_who, cr.mac, "\n  Power status changed from: '"
-                         + old_text.strip() + "' to: '" + cr.power_text.strip() + "'.")
-            cr.Update(iid)  # Update row with new ['text']
-            if auto is False or old_text == "Wait...":
-                # Fade in/out performed when called from Dropdown Menu (auto=False).
-                # Or on startup when status is "Wait...". Otherwise, too distracting.
-                cr.fadeOut(iid)
+        if pool:
+            pool.close()  # Threads end after last getPower()
+            self.after(10, self.applyPowerStatuses)
 
-            # Display row by row when there is processing lag
-            self.tree.update_idletasks()  # Slow mode display each row.
+        v2_print()  # Blank line to separate debugging output
 
-            # MAC address stored in treeview row hidden values[-1]
-            v2_print("\n" + _who, "i:", i, "cr.mac:", cr.mac)
-            v2_print("cr.inst:", cr.inst)
+    def pollPower(self, inst, fade, results):
+        """ Run inst.getPower() in WorkerPool() thread or Tk thread.
+            :param results: Queue for self.applyPowerStatuses(). None = Tk thread
+        """
+        _start = time.time()
+        try:
+            inst.getPower()  # Get the power status for device
+        except Exception as err:  # Always report result to Tk thread
+            v0_print(self.who + "pollPower():", inst.name, "getPower() error:", err)
+        latency = time.time() - _start
+        self.power_latency[inst.mac] = latency
+        if results is not None:
+            results.put((inst, fade, latency))
+
+    def applyPowerStatuses(self):
+        """ self.after() loop applying self.pollPower() thread results. """
+        _who = self.who + "applyPowerStatuses():"
+        if not self.isActive:
+            self.power_pending = 0
+            return  # Shutting down
 
-        v2_print()  # Blank line to separate debugging output
+        while self.power_pending:
+            try:
+                inst, fade, latency = self.power_queue.get_nowait()
+            except Queue.Empty:
+                if time.time() - self.power_start > GLO['POWER_STATUS_TIME']:
+                    v0_print(_who, self.power_pending, "devices exceeded",
+                             "POWER_STATUS_TIME:", GLO['POWER_STATUS_TIME'])
+                    self.power_pending = 0  # Next refresh uses new queue
+                    break
+                self.after(10, self.applyPowerStatuses)  # Check again in 10 ms
+                return
+            self.power_pending -= 1
+            self.applyPowerStatus(inst, fade, latency)
+
+        self.last_refresh_time = time.time()  # In case fading was long time
+        v1_print(_who, len(self.power_latency), "devices refreshed in",
+                 round(time.time() - self.power_start, 3), "seconds.")
+
+    def applyPowerStatus(self, inst, fade, latency):
+        """ Update Devices Treeview row with inst.powerStatus.
+            Row is searched again because rows can move while threads run.
+        """
+        _who = self.who + "refreshAllPowerStatuses():"
+        v1_print(_who, inst.name, "getPower():", inst.powerStatus,
+                 "in", round(latency, 3), "seconds.")
+
+        # Update Devices Treeview with power status
+        if not self.usingDevicesTreeview:
+            return  # No Devices Treeview to update
+
+        cr = TreeviewRow(self)  # Setup treeview row processing instance
+        iid = cr.getIidForInst(inst)
+        if iid is None:
+            return  # Instance not in Devices Treeview or treeview not mounted
+
+        old_text = cr.power_text  # Treeview row's old power state "  ON", etc.
+        cr.power_text = "  " + inst.powerStatus  # Display treeview row's new power state
+        if cr.power_text != old_text:
+            v1_print(_who, cr.mac, "\n  Power status changed from: '"
+                     + old_text.strip() + "' to: '" + cr.power_text.strip() + "'.")
+        cr.Update(iid)  # Update row with new ['text']
+        if fade or old_text == "Wait...":
+            # Fade in/out performed when called from Dropdown Menu (auto=False).
+            # Or on startup when status is "Wait...". Otherwise, too distracting.
+            cr.fadeOut(iid)
+
+        # Display row by row when there is processing lag
+        self.tree.update_idletasks()  # Slow mode display each row.
+
+        # MAC address stored in treeview row hidden values[-1]
+        v2_print("\n" + _who, "cr.mac:", cr.mac)
+        v2_print("cr.inst:", cr.inst)
 
     def Rediscover(self, auto=False):
-        """ Automatically call 'arp -a' to check on network changes.
+        """ Automatically read arp table to check on network changes.
             self.refreshApp() calls every GLO['REDISCOVER_SECONDS'].
 
             NOTE: Used to be two step process called twice. Changed 2025-05-15.
 
+            2026-10-18 self.rediscoverWorker() thread tests arp devices and puts
+                events into self.rediscover_queue. self.refreshApp() calls
+                self.drainRediscover() every frame to update ni lists and the
+                Devices Treeview without waiting on network devices.
+
             :param auto: If 'False', called from menu "Rediscover Now".
         """
 
@@ -7559,6 +8880,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         '''
 
         self.rediscovering = True  # Prevent being called a second time.
+        self.sched.wake("rediscover")  # Apply results every frame until done
         hc.spamming = False  # spam printing hasn't been invoked yet.
         self.spam_count = 0  # How many times Rediscover called in error.
         self.updateDropdown()  # Disable many dropdown menu options.
@@ -7575,11 +8897,112 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         # Override event logging and v3_print(...) during auto rediscovery
         GLO['LOG_EVENTS'] = True if auto is False else False
 
-        # First step is to create rd[] list and return to self.refreshApp()
-        ext.t_init("Creating instance rd = NetworkInfo()")
+        self.refreshAllPowerStatuses(auto=auto)  # When auto=False, rows highlighted
+
+        # rd = NetworkInfo() created in thread. New queue so a stopped worker
+        # that is still finishing can't post stale events. The thread gets
+        # copies of ni lists and cp because tkinter keeps changing them.
+        self.rediscover_queue = Queue.Queue()
+        self.rediscover_stop = threading.Event()
+        known = dict((mac_dict['mac'], dict(mac_dict)) for mac_dict in ni.mac_dicts)
+        with_instance = set(instance['mac'] for instance in ni.instances)
+        in_view = set(ni.view_order)
+        self.rediscover_thread = threading.Thread(
+            target=self.rediscoverWorker, name="Rediscover",
+            args=(self.rediscover_queue, self.rediscover_stop, known,
+                  with_instance, in_view, copy.copy(cp)))
+        self.rediscover_thread.daemon = True  # Don't stop HomA from exiting
+        self.rediscover_thread.start()
+
+    def rediscoverWorker(self, post_queue, stop_event, known, with_instance,
+                         in_view, computer):
+        """ Thread started by self.Rediscover(). Never touches tkinter, ni or
+            cp. Those are only changed by self.drainRediscover().
+
+            Events put into post_queue for self.drainRediscover():
+                ("new", rd_mac_dict, instance) - New MAC. instance can be {}
+                ("found", mac, instance) - Instance for known ni.mac_dicts MAC
+                ("known", rd_mac_dict) - Check IP, name, alias and view order
+                ("lost", mac) - MAC with instance no longer in arp table
+                ("done", rd_cmd_events, computer) - Always the last event
+
+            Neighbours with an instance that are unchanged since the last
+            NetworkInfo() and match ni.mac_dicts are skipped. MACs without
+            an instance are still tested in case the device woke up.
+
+            :param known: {mac: copy of ni.mac_dicts entry} when started
+            :param with_instance: set of MACs in ni.instances when started
+            :param in_view: set of MACs in ni.view_order when started
+            :param computer: copy.copy(cp) for rd = NetworkInfo() to update
+        """
+        _who = self.who + "rediscoverWorker():"
         global rd
-        rd = NetworkInfo()  # rd. class is newer instance ni. class
-        ext.t_end('no_print')
+        post = post_queue.put
+        cmd_events = []
+        try:
+            ext.t_init("Creating instance rd = NetworkInfo()")
+            rd = NetworkInfo(computer)  # rd. class is newer instance ni. class
+            ext.t_end('no_print')
+            rd.kasa_discover()  # Smart plugs not in arp cache added to rd.mac_dicts
+            cmd_events = rd.cmdEvents
+            v2_print(_who, "Rediscovery count:", len(rd.mac_dicts))
+
+            unchanged = set()  # Every row is checked without a neighbour table
+            if rd.arp_diff is not None:
+                unchanged = set(rd.arp_diff["unchanged"])
+                for mac in rd.arp_diff["removed"]:
+                    if mac in with_instance:
+                        post(("lost", mac))
+
+            for rd_mac_dict in rd.mac_dicts:
+                if stop_event.is_set():
+                    v1_print(_who, "Stopped by self.stopRediscover()")
+                    break
+
+                mac = rd_mac_dict['mac']
+                # TCL.LAN (192.168.0.17) at <incomplete> on enp59s0
+                if mac == '<incomplete>':
+                    v1_print(_who, "Skipping invalid MAC: '<incomplete>'")
+                    continue
+
+                ip = rd_mac_dict['ip']
+                # ? (20.20.20.1) at a8:4e:3f:82:98:b2 [ether] on enp59s0
+                if ip == '?':
+                    v1_print(_who, "Skipping invalid IP: '?'")
+                    continue
+
+                v2_print("Checking MAC:", mac, "IP:", ip)
+                mac_dict = known.get(mac)  # NOTE different than rd_mac_dict !
+                if mac_dict is None:
+                    v0_print(_who, "new MAC discovered:", mac)
+                    instance = rd.test_for_instance(rd_mac_dict)
+                    post(("new", rd_mac_dict, instance))
+                    continue
+
+                if mac in with_instance:
+                    if mac in unchanged and mac in in_view and all(
+                            mac_dict.get(key) == rd_mac_dict[key]
+                            for key in ("ip", "name", "alias")):
+                        continue  # Nothing changed
+                    # 2025-05-14 If in tree, check changes to host name, IP, alias, etc.
+                    post(("known", rd_mac_dict))
+                    continue
+
+                # Instance doesn't exist for a mac_dict['mac']
+                v2_print(_who, "No Instance for ni.mac_dicts MAC:", mac)
+                instance = rd.test_for_instance(mac_dict)
+                if bool(instance):
+                    post(("found", mac, instance))
+        except Exception as err:  # Thread must always post "done"
+            v0_print(_who, "Rediscovery failed:", err)
+        finally:
+            post(("done", cmd_events, computer))
+
+    def drainRediscover(self):
+        """ Called by self.refreshApp() every frame while self.rediscovering.
+            Apply self.rediscoverWorker() events without waiting for them.
+        """
+        _who = self.who + "drainRediscover():"
 
         # tr instance only created if Network Devices treeview is mounted
         tr = TreeviewRow(self) if self.usingDevicesTreeview else None
@@ -7609,7 +9032,8 @@ class Application(DeviceCommonSelf, tk.Toplevel):
                 v0_print(_who, "new_dict['ip'] != old_dict['ip']:",
                          new_dict['ip'], old_dict['ip'])
                 old_dict['ip'] = new_dict['ip']
-            if new_dict['name'] != old_dict['name']:
+            # "?" when name isn't in /etc/hosts or DNS. Keep name in devices.json
+            if new_dict['name'] != '?' and new_dict['name'] != old_dict['name']:
                 v0_print(_who, "new_dict['name'] != old_dict['name']:",
                          new_dict['name'], old_dict['name'])
                 old_dict['name'] = new_dict['name']
@@ -7618,98 +9042,86 @@ class Application(DeviceCommonSelf, tk.Toplevel):
                          new_dict['alias'], old_dict['alias'])
                 old_dict['alias'] = new_dict['alias']
 
-        v2_print(_who, "Rediscovery count:", len(rd.mac_dicts))
+        def addInstance(mac, instance, mac_dict):
+            """ Add instance found by rediscoverWorker() """
+            if bool(ni.inst_for_mac(mac, False)):
+                return  # Added by someone else while thread was testing
+            v0_print("="*80, "\n" + _who, "Discovered a NEW INSTANCE or",
+                     "rediscovered a LOST INSTANCE:")
+            v0_print(instance)
+            ni.instances.append(instance)
+            mac_dict['type_code'] = instance['instance'].type_code  # mutable mac_dict
+            if mac not in ni.view_order:
+                ni.view_order.append(mac)  # New instance appears at treeview bottom.
+                addTreeviewRow(mac)  # Only update Devices Treeview when mounted.
+            v0_print("="*80)
 
-        self.refreshAllPowerStatuses(auto=auto)  # When auto=False, rows highlighted
+        while self.rediscovering:
+            try:
+                event = self.rediscover_queue.get_nowait()
+            except Queue.Empty:
+                return  # Check again next frame
 
-        for i, rd_mac_dict in enumerate(rd.mac_dicts):
             if not self.isActive:
                 self.exitRediscover()
                 return
 
-            if not self.rediscovering:
-                # Not used yet but someone else can force immediate exit
-                v0_print(_who, "Someone turned off rediscovering!")
-                self.exitRediscover()
-                return
-
-            mac = rd_mac_dict['mac']
-            # TCL.LAN (192.168.0.17) at <incomplete> on enp59s0
-            if mac == '<incomplete>':
-                v1_print(_who, "Skipping invalid MAC: '<incomplete>'")
-                continue
-
-            ip = rd_mac_dict['ip']
-            # ? (20.20.20.1) at a8:4e:3f:82:98:b2 [ether] on enp59s0
-            if ip == '?':
-                v1_print(_who, "Skipping invalid IP: '?'")
-                continue
-
-            v2_print("Checking MAC:", mac, "IP:", ip)
-            mac_dict = ni.get_mac_dict(mac)  # NOTE different than rd_mac_dict !
-            if not bool(mac_dict):
-                # Add ni.mac_dicts, ni.instances, ni.devices, ni.view_order
-                v0_print(_who, "new MAC discovered:", mac)
-
-                start = len(ni.mac_dicts)  # start = offset to next added mac_dict
-                # mac_dict = {"mac": mac, "ip": ip, "name": name, "alias": alias}
-                ni.mac_dicts.append(rd_mac_dict)  # mac_dict for 1 found device
-                discovered, instances, view_order = \
-                    discover(update=False, start=start, end=start+1)  # last mac_dict
-
-                if len(discovered) != 1:
-                    v0_print(_who, "Catastrophic error! Invalid len(discovered):",
-                             len(discovered))
-                    self.exitRediscover()
-                    return
-
-                # Format: 'SONY.LAN (192.168.0.19) at ac:9b:0a:df:3f:d9 [ether] on enp59s0'
-                ni.devices = copy.deepcopy(rd.devices)  # Copy ALL rediscovered devices.
-                # Unfortunately, ni.mac_dicts saved to filename "devices.json"
-
-                if bool(instances):
-                    ni.instances.append(instances[0])
-                    v0_print(_who, "Adding MAC to ni.instances:", mac)
+            if event[0] == "new":
+                _kind, rd_mac_dict, instance = event
+                mac = rd_mac_dict['mac']
+                if not bool(ni.registry.macDict(mac)):
+                    # mac_dict = {"mac": mac, "ip": ip, "name": name, "alias": alias}
+                    ni.mac_dicts.append(rd_mac_dict)  # mac_dict for 1 found device
+                if bool(instance):
+                    addInstance(mac, instance, ni.get_mac_dict(mac))
                 else:
                     v1_print(_who, "Unrecognized instance type for MAC:", mac)
-                    continue
-
-                ni.view_order.append(mac)  # New instance appears at treeview bottom.
-                addTreeviewRow(mac)  # Only update Devices Treeview when mounted.
 
-            elif mac not in ni.view_order:
-                v2_print(_who, "ni.mac_dicts MAC not in view order:", mac)
+            elif event[0] == "found":
+                _kind, mac, instance = event
+                addInstance(mac, instance, ni.get_mac_dict(mac))
 
-            mac_inst = ni.inst_for_mac(mac)
-            if bool(mac_inst):
-                v2_print(_who, "found instance:", mac_inst['mac'])
-                # 2025-05-14 If in tree, check changes to host name, IP, alias, etc.
+            elif event[0] == "known":
+                rd_mac_dict = event[1]
+                mac = rd_mac_dict['mac']
+                mac_dict = ni.get_mac_dict(mac)
+                if not bool(mac_dict):
+                    continue  # Removed while thread was running
                 if mac not in ni.view_order:
                     v0_print(_who, "arp exists, instance exists, but no view order")
                     v0_print("Inserting", rd_mac_dict['mac'], rd_mac_dict['name'])
                     ni.view_order.append(mac)
                     addTreeviewRow(mac)  # Only update Devices Treeview when mounted.
                 checkChanges(rd_mac_dict, mac_dict)
-                continue
-
-            # Instance doesn't exist for a mac_dict['mac']
-            v2_print(_who, "No Instance for ni.mac_dicts MAC:", mac)
-            instance = ni.test_for_instance(mac_dict)
-            if not bool(instance):
-                continue  # Router, ethernet adapter, wifi adapter, smartphone, etc.
 
-            v0_print("="*80, "\n" + _who, "Discovered a NEW INSTANCE or",
-                     "rediscovered a LOST INSTANCE:")
-            v0_print(instance)
-            ni.instances.append(instance)
-            mac_dict['type_code'] = instance['instance'].type_code  # mutable mac_dict
-            ni.view_order.append(rd_mac_dict['mac'])
-            addTreeviewRow(mac)  # Only update Devices Treeview when mounted.
-            v0_print("="*80)
+            elif event[0] == "lost":
+                v1_print(_who, "MAC with instance no longer in arp table:", event[1])
+
+            elif event[0] == "done":
+                # All steps done: Wait for next rediscovery period
+                if bool(event[1]):
+                    ni.cmdEvents.extend(event[1])  # For auto-rediscover, empty
+                for name in ("name", "alias", "ether_name", "ether_mac",
+                             "ether_ip", "wifi_name", "wifi_mac", "wifi_ip"):
+                    setattr(cp, name, getattr(event[2], name))  # rd updated copy
+                fp.saveFile()  # Device types tested by rediscoverWorker()
+                self.exitRediscover()
+                return
 
-        # All steps done: Wait for next rediscovery period
-        if bool(rd.cmdEvents):
-            ni.cmdEvents.extend(rd.cmdEvents)  # For auto-rediscover, rd.cmdEvents[] empty
+    def stopRediscover(self):
+        """ Stop rediscoverWorker() thread before suspend or exit.
+            Events not yet applied are discarded.
+        """
+        _who = self.who + "stopRediscover():"
+        if not self.rediscovering:
+            return
+        self.rediscover_stop.set()
+        if self.rediscover_thread is not None:
+            # Test of current arp device can take up to DISCOVER_HOST_TIME
+            self.rediscover_thread.join(float(GLO['DISCOVER_HOST_TIME']) + 1.0)
+            if self.rediscover_thread.is_alive():
+                v0_print(_who, "Rediscover thread still running. Ignoring it.")
+        self.rediscover_queue = Queue.Queue()  # Discard events
         self.exitRediscover()
 
     def exitRediscover(self):
@@ -8246,16 +9658,20 @@ class Application(DeviceCommonSelf, tk.Toplevel):
                 for error in errors:
                     scrollbox.insert("end", "\t\t" + error + "\n")
 
+        def query(ring):
+            """ 2026-10-18 Errors since HomA started in memory and library.db """
+            return hc.events.query([ring], failed=True, start=hc.START_TIME)
+
         # Loop through ni.instances
         for i, instance in enumerate(ni.instances):
             inst = instance['instance']
-            insertEvents(inst.cmdEvents)
+            insertEvents(query(inst.cmdEvents))
 
         # NetworkInfo (ni) and SystemMonitor (sm) have cmdEvents too!
-        insertEvents(ni.cmdEvents)
-        insertEvents(sm.cmdEvents)
-        insertEvents(cp.cmdEvents)  # cp = Computer() class
-        insertEvents(self.cmdEvents)  # This app = Application() class
+        insertEvents(query(ni.cmdEvents))
+        insertEvents(query(sm.cmdEvents))
+        insertEvents(query(cp.cmdEvents))  # cp = Computer() class
+        insertEvents(query(self.cmdEvents))  # This app = Application() class
 
     def DisplayTimings(self):
         """ Loop through ni.instances and display cmdEvents times:
@@ -8288,9 +9704,10 @@ class Application(DeviceCommonSelf, tk.Toplevel):
                 val = timings.get(keyT, None)
                 if val is None:
                     val = {'count': 0, 'all_times': 0.0, 'min': 999999999.9,
-                           'max': 0.0, 'avg': 9.9}
+                           'max': 0.0, 'avg': 9.9, 'wait': 0.0}
                 val['count'] += 1
                 val['all_times'] += event['duration']
+                val['wait'] += event.get('queue_time', 0.0)  # runCommandAsync()
                 val['min'] = event['duration'] if event['duration'] < val['min'] else val['min']
                 val['max'] = event['duration'] if event['duration'] > val['max'] else val['max']
                 val['avg'] = val['all_times'] / val['count']
@@ -8310,24 +9727,57 @@ class Application(DeviceCommonSelf, tk.Toplevel):
                                  "  | Min: " + '{0:.3f}'.format(val['min']) +
                                  "  | Max: " + '{0:.3f}'.format(val['max']) +
                                  "  | Avg: " + '{0:.3f}'.format(val['avg']) +
+                                 "  | Wait: " + '{0:.3f}'.format(val['wait'] / val['count']) +
                                  "\n")
                 scrollbox.highlight_pattern(keyT, "blue")
 
+        def query(ring):
+            """ 2026-10-18 Events since HomA started in memory and library.db """
+            return hc.events.query([ring], start=hc.START_TIME)
+
         # Loop through ni.instances
         for i, instance in enumerate(ni.instances):
             inst = instance['instance']
-            insertEvents(inst.cmdEvents)
+            insertEvents(query(inst.cmdEvents))
 
         # NetworkInfo (ni) and SystemMonitor (sm) have cmdEvents too!
-        insertEvents(ni.cmdEvents)
-        insertEvents(sm.cmdEvents)
-        insertEvents(cp.cmdEvents)  # cp = Computer() class
-        insertEvents(self.cmdEvents)  # This app = Application() class
+        insertEvents(query(ni.cmdEvents))
+        insertEvents(query(sm.cmdEvents))
+        insertEvents(query(cp.cmdEvents))  # cp = Computer() class
+        insertEvents(query(self.cmdEvents))  # This app = Application() class
 
         scrollbox.highlight_pattern("Min:", "green")
         scrollbox.highlight_pattern("Max:", "red")
         scrollbox.highlight_pattern("Avg:", "yellow")
 
+    def DisplayLoopProfile(self):
+        """ Display hc.LoopProfile() of self.sched jobs, tkinter updates and
+            frames longer than GLO['REFRESH_MS']. Profiling starts the first
+            time when `homa.py --profile-loop` wasn't used.
+        """
+        _who = self.who + "DisplayLoopProfile():"
+        title = "Loop performance"
+        scrollbox = self.DisplayCommon(_who, title, width=1400)
+        if scrollbox is None:
+            return  # Window already opened and method is running
+
+        if self.sched.profile is None:
+            self.sched.profile = hc.LoopProfile()
+            scrollbox.insert("end", "\nProfiling started. Close and open " +
+                             "window again to see results.\n")
+            return
+
+        scrollbox.config(font=("Courier", g.MON_FONT))  # Columns line up
+        lines = self.sched.profile.report()
+        scrollbox.insert("end", "\n" + lines[0] + "\n\n")
+        scrollbox.insert("end", "\n".join(lines[1:]) + "\n")
+        scrollbox.insert("end", "\nHistogram columns count times less than " +
+                         "milliseconds. 'late' is time tkinter events\n" +
+                         "delayed jobs. 'frame' is one pass of jobs that are due.\n")
+        scrollbox.highlight_pattern("Overruns:", "red")
+        scrollbox.highlight_pattern("Max ms", "red")
+        scrollbox.highlight_pattern("Avg ms", "yellow")
+
     def DisplayBluetooth(self):
         """ Display Bluetooth devices that have a name
             May have to call a few times to see a device that was connected.
@@ -8409,8 +9859,8 @@ class Application(DeviceCommonSelf, tk.Toplevel):
     def DisplayBreathing(self):
         """ Display Breathing Colors parameters and statistics in real time.
 
-            Called about 3 times per second during self.refreshApp() cycle.
-            self.refreshApp() in turn is called by bleSaveInst.breatheColors().
+            Called every self.refreshApp() cycle. Body is only updated when
+            bleSaveInst.breatheWorker() thread publishes new colors.
             bleSaveInst.monitorBreatheColors() returns formatted text lines.
 
             First time, calls DisplayCommon to create Window, Frame and Scrollbox.
@@ -8462,14 +9912,17 @@ class Application(DeviceCommonSelf, tk.Toplevel):
             self.last_red = self.last_green = self.last_blue = 0
 
         # Body is only updated when red, green or blue change
-        if self.last_red == self.bleSaveInst.red and \
-                self.last_green == self.bleSaveInst.green and \
-                self.last_blue == self.bleSaveInst.blue:
+        snap = self.bleSaveInst.snapshot  # Read once. breatheWorker() replaces it.
+        if snap is None:
+            return  # Thread hasn't published first step yet
+        if self.last_red == snap["red"] and \
+                self.last_green == snap["green"] and \
+                self.last_blue == snap["blue"]:
             return
 
-        self.last_red = self.bleSaveInst.red
-        self.last_green = self.bleSaveInst.green
-        self.last_blue = self.bleSaveInst.blue
+        self.last_red = snap["red"]
+        self.last_green = snap["green"]
+        self.last_blue = snap["blue"]
 
         # Delete dynamic lines in custom scrollbox
         self.bleScrollbox.delete(6.0, "end")
@@ -8498,7 +9951,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
         self.bleScrollbox.highlight_pattern("Highest", "yellow")
 
         ''' Button frame background shows monitor facsimile color of LED lights '''
-        self.event_btn_frm.configure(bg=self.bleSaveInst.monitor_color)
+        self.event_btn_frm.configure(bg=snap["monitor_color"])
 
     def DisplayTvSettings(self, cr):
         """ Display Sony KDL/Bravia TV or Android TV Settings in real time.
@@ -8696,7 +10149,7 @@ class Application(DeviceCommonSelf, tk.Toplevel):
     def DisplayCommon(self, _who, title, x=None, y=None, width=1200, height=500,
                       close_cb=None, help=None):
         """ Common method for DisplayBluetooth(), DisplayErrors(), DisplayTimings()
-                DisplayBreathing()
+                DisplayBreathing(), DisplayLoopProfile()
 
             Caller has 90 heading rows, 10 footer rows and 10 columns to use. For
                 example, DisplayBreathing() uses 4 heading rows and 5 columns.
@@ -8925,7 +10378,12 @@ def discover(update=False, start=None, end=None):
 
         Before calling use ni = NetworkInfo() to create ni.mac_dicts[{}, {}...]
         app.Rediscover() uses rd = NetworkInfo() to create rd.mac_dicts
-        
+
+        2026-10-18 arp devices are tested in parallel by GLO['DISCOVER_WORKERS']
+            threads. Each arp device is given GLO['DISCOVER_HOST_TIME'] seconds
+            from when its device type tests start.
+            Results are returned in ni.mac_dicts order regardless of finish order.
+
         :param update: If True, update ni.mac_dicts entry with type_code
         :param start: ni.mac_dicts starting index for loop
         :param end: ni.mac_dicts ending index (ends just before passed index)
@@ -8943,16 +10401,30 @@ def discover(update=False, start=None, end=None):
 
     if not start:
         start = 0
+    ni.kasa_discover()  # Smart plugs not in arp cache appended to ni.mac_dicts
     if not end:
         end = len(ni.mac_dicts)  # Not tested as of 2024-11-10
 
+    _start = time.time()
+    workers = int(GLO['DISCOVER_WORKERS'])
+    # Host threads wait on their own device type test threads, which never wait.
+    host_pool = hc.WorkerPool(workers, "discover-host")
+
+    def test_host(arp):
+        """ Run in host_pool thread. Deadline starts when tests start. """
+        v2_print("\nTest for device type using 'arp' dictionary:", arp)
+        return ni.test_for_instance(arp)
+
+    host_jobs = []
     for i, arp in enumerate(ni.mac_dicts[start:end]):
         # arp = {"mac": mac, "ip": ip, "name": name, "alias": alias, "type_code": 99}
-        v2_print("\nTest for device type using 'arp' dictionary:", arp)
+        host_jobs.append((i, arp, host_pool.submit(test_host, (arp,))))
 
+    for i, arp, job in host_jobs:
+        job.wait()  # Every host has a deadline so wait() always returns
         # Get class instance information rebuilt at run time and never saved to disk
-        instance = ni.test_for_instance(arp)  # test against known device types
-        if not bool(instance):  # Is instance an empty dictionary?
+        instance = job.result  # tested against known device types
+        if not bool(instance):  # Is instance an empty dictionary or error?
             continue  # No instance found, perhaps it's a router or smart phone, etc.
 
         arp['type_code'] = instance['instance'].type_code  # type_code unknown until now
@@ -8960,7 +10432,12 @@ def discover(update=False, start=None, end=None):
         instances.append(instance)  # instance = {"mac": arp['mac'], "instance": inst}
         view_order.append(arp['mac'])  # treeview ordered by MAC address saved to disk
         if update:
-            ni.mac_dicts[i] = arp  # Update arp list with type_code found in instance
+            ni.mac_dicts[start + i] = arp  # Update arp list with type_code found
+
+    host_pool.close()
+    fp.saveFile()  # Device types tested by MAC
+    v1_print(_who, "Tested", len(host_jobs), "arp devices in",
+             round(time.time() - _start, 2), "seconds. Found:", len(discovered))
 
     return discovered, instances, view_order
 
@@ -8989,6 +10466,8 @@ pav = None  # PulseAudio sinks. Initialize in Application() -> AudioControl()
 
 #cp = Computer()  # 2026-02-25 Computer() class is in homa_common.py now.
 cp = hc.Computer()  # cp = Computer Platform instance used everywhere
+fp = DeviceFingerprints()  # Device types tested by MAC. Read in open_files()
+em = EmeterCollector()  # HS110 power history. Started in main()
 ni = NetworkInfo()  # ni = global class instance used everywhere
 ni.adb_reset(background=True)  # Sometimes necessary when TCL TV isn't communicating
 rd = None  # rd = Rediscovery instance for app.Rediscover() & app.Discover()
@@ -9020,6 +10499,7 @@ def open_files():
 
     #glo.openFile()  2025-01-11 Moved to call before ni instance
     sql.open_homa_db()  # Open SQL History Table for saved configs
+    fp.openFile()  # Device types tested by MAC for discover()
 
     ni.discovered = []  # NetworkInfo() lists
     ni.instances = []
@@ -9107,6 +10587,7 @@ def save_files():
         f.write(json.dumps(ni.mac_dicts))
     with open(g.USER_DATA_DIR + os.sep + GLO['VIEW_ORDER_FNAME'], "w") as f:
         f.write(json.dumps(ni.view_order))
+    fp.saveFile()
 
     _unencrypted = GLO['SUDO_PASSWORD']  # Save before encrypting. Can be none
     if GLO['SUDO_PASSWORD'] is not None:
@@ -9155,6 +10636,7 @@ def main():
         v1_print("Changing from:", SAVE_CWD, "to g.PROGRAM_DIR:", g.PROGRAM_DIR)
         os.chdir(g.PROGRAM_DIR)
 
+    hc.startRunner()  # 2026-10-18 runCommand() spawns from small helper process
     glo.openFile()
 
     ''' Decrypt SUDO PASSWORD using ethernet or wifi MAC crypto key '''
@@ -9191,6 +10673,8 @@ def main():
         for i, entry in enumerate(ni.instances):
             v1_print("  ", str(i+1) + ".", entry)
 
+    em.start()  # HS110 Smart Plug power history
+
     ''' Tkinter root window '''
     root = tk.Tk()
     root.withdraw()
@@ -22,6 +22,19 @@ warnings.filterwarnings("ignore", "ResourceWarning")  # PIL python 3 unclosed fi
 #       2025-07-17 - DeviceCommonSelf and Globals from homa.py for yt-skip.py.
 #       2025-08-03 - Create spam_print() for reprinting on the same line.
 #       2025-11-09 - Remove commented code from CheckRunning()
+#       2026-10-18 - WorkerPool() threads for parallel device discovery.
+#       2026-10-18 - POWER_ALL_ORDER_LIST stages and POWER_ALL_TIME deadline.
+#       2026-10-18 - KASA_DISCOVER_TIME smart plug broadcast reply window.
+#       2026-10-18 - EMETER_xxx HS110 power history settings.
+#       2026-10-18 - SONY_NOTIFICATIONS pushed by TV instead of polling.
+#       2026-10-18 - ADB_CACHE_TIME Android TV power probe reuse.
+#       2026-10-18 - WOL_SCHEDULE_LIST and WOL_BURST magic packet retries.
+#       2026-10-18 - LED_BACKEND and LED_SERIAL_PORT for BLED112 dongle.
+#       2026-10-18 - Scheduler() runs refreshApp() jobs when they are due.
+#       2026-10-18 - LoopProfile() job histograms. --profile-loop console dump.
+#       2026-10-18 - runCommandAsync() CommandExecutor() with CMD_DEVICE_LIMIT.
+#       2026-10-18 - runCommand() spawns from cmd_runner.py helper process.
+#       2026-10-18 - EventRing() cmdEvents spill to EventLog() in library.db.
 #
 # ==============================================================================
 
@@ -86,7 +99,19 @@ import json  # For dictionary storage in external file
 import copy  # For deepcopy of lists of dictionaries
 import random  # Temporary filenames
 import string  # Temporary filenames
-from collections import OrderedDict, namedtuple
+import threading  # WorkerPool() threads and runCommand() lock
+import heapq  # Scheduler() jobs ordered by due time
+import bisect  # LoopProfile() histogram bucket
+import itertools  # Scheduler() tie breaker for jobs due at same time
+import sys  # Python version for startRunner()
+import sqlite3  # EventLog() cmdEvents spilled from EventRing()
+import cmd_runner as cr  # Commands spawned by small helper process
+from collections import OrderedDict, namedtuple, deque
+
+try:  # Python 3
+    import queue as Queue
+except ImportError:  # Python 2
+    import Queue
 
 SUDO_PASSWORD = None  # Parent can see as 'homa_common.SUDO_PASSWORD'
 
@@ -119,7 +144,7 @@ class DeviceCommonSelf:
         self.nightPowerOn = 0  # Did nighttime power on the device?
 
         # Separate self.cmdEvents for every instance.
-        self.cmdEvents = []  # Command events log
+        self.cmdEvents = EventRing(self)  # Last command events. Older in events
         self.cmdEvent = {}  # Single command event
         self.cmdCaller = ""  # Command caller (self.who) {caller: ""}
         self.cmdCommand = []  # Command list to execute. {command: []}
@@ -129,6 +154,9 @@ class DeviceCommonSelf:
         self.cmdOutput = ""  # stdout.strip() from command {output: Xxx}
         self.cmdError = ""  # stderr.strip() from command {error: Xxx}
         self.cmdReturncode = 0  # return code from command {returncode: 9}
+        self.cmdQueueTime = 0.0  # runCommandAsync() wait for worker {queue_time: 9.99}
+        # 2026-10-18 WorkerPool() threads can share an instance, E.G. ni.curl()
+        self.cmdLock = threading.RLock()  # self.cmdXxx -> self.cmdEvent atomic
         # time: 999.99 duration: 9.999 who: <_who> command: <command str>
         # text: <text> err: <text> return: <return code>
 
@@ -234,27 +262,96 @@ class DeviceCommonSelf:
 
             During automatic rediscovery, logging is turned off (log=False) to
             reduce size of cmdEvents[list].
+            2026-10-18 cmdEvents is a bounded EventRing(). log=False events
+                stay in the ring only and are hidden from Discovery errors and
+                timings. They are never saved in library.db.
         """
 
-        self.cmdCaller = who if who is not None else self.who
-        _who = self.cmdCaller + " runCommand():"
-        self.cmdCommand = command_line_list
-        self.cmdString = ' '.join(command_line_list)
-        self.cmdStart = time.time()
+        caller = who if who is not None else self.who
+        start = time.time()
 
         # Python 3 error: https://stackoverflow.com/a/58696973/6929343
-        pipe = sp.Popen(self.cmdCommand, stdout=sp.PIPE, stderr=sp.PIPE)
+        pipe = popen(command_line_list)  # 2026-10-18 Was sp.Popen()
         text, err = pipe.communicate()  # This performs .wait() too
         # pipe.stdout.close()  # Added 2025-02-09 for python3 error
         # pipe.stderr.close()
 
-        # self.cmdOutput = text.strip()  # Python 2 uses strings
-        # self.cmdError = err.strip()
-        self.cmdOutput = text.decode().strip()  # Python 3 uses bytes
-        self.cmdError = err.decode().strip()
-        self.cmdReturncode = pipe.returncode
-        self.cmdDuration = time.time() - self.cmdStart
-        return self.logEvent(_who, forgive=forgive, log=log)
+        return self.recordCommand(caller, command_line_list, start, 0.0, text,
+                                  err, pipe.returncode, forgive, log)
+
+    def recordCommand(self, caller, command_line_list, start, queue_time, text,
+                      err, returncode, forgive, log):
+        """ Assign self.cmdXxx variables and return self.logEvent() """
+        _who = caller + " runCommand():"
+
+        # 2026-10-18 Command runs unlocked. Results are assigned under lock so
+        #   WorkerPool() threads sharing this instance get their own cmdEvent.
+        with self.cmdLock:
+            self.cmdCaller = caller
+            self.cmdCommand = command_line_list
+            self.cmdString = ' '.join(command_line_list)
+            self.cmdStart = start
+            # self.cmdOutput = text.strip()  # Python 2 uses strings
+            # self.cmdError = err.strip()
+            self.cmdOutput = text.decode().strip()  # Python 3 uses bytes
+            self.cmdError = err.decode().strip()
+            self.cmdReturncode = returncode
+            self.cmdDuration = time.time() - self.cmdStart
+            self.cmdQueueTime = queue_time
+            return self.logEvent(_who, forgive=forgive, log=log)
+
+    def runCommandAsync(self, command_line_list, who=None, forgive=False,
+                        log=True, timeout=None, callback=None):
+        """ Run command in an executor thread and return CommandJob() at once.
+
+            :param timeout: Seconds from now the command must finish by,
+                including time waiting for a worker. Then it is killed.
+            :param callback: callback(job) run on tkinter thread when done.
+                job.result is the same dictionary runCommand() returns.
+            :returns: CommandJob(). job.cancel() kills a running command.
+        """
+        caller = who if who is not None else self.who
+        deadline = None if timeout is None else time.time() + timeout
+        job = CommandJob(self, command_line_list, caller, forgive, log,
+                         deadline, callback)
+        executor.submit(job)
+        return job
+
+    def executeCommand(self, job):
+        """ Run CommandJob() in CommandExecutor() worker thread """
+        job.start_time = time.time()
+        queue_time = job.start_time - job.queued_time
+        returncode = DEADLINE_RETURNCODE
+        text = b""
+        err = b"Deadline passed waiting for a free worker."
+
+        with job.lock:
+            if job.cancelled:
+                return
+            if job.deadline is None or job.deadline > job.start_time:
+                job.pipe = popen(job.command)
+
+        if job.pipe:
+            timer = None
+            if job.deadline is not None:
+                timer = threading.Timer(job.deadline - job.start_time, job.expire)
+                timer.daemon = True
+                timer.start()
+            text, err = job.pipe.communicate()
+            returncode = job.pipe.returncode
+            if timer:
+                timer.cancel()
+            if job.expired:
+                returncode = DEADLINE_RETURNCODE
+                err = ("Command killed after deadline of " +
+                       str(round(job.deadline - job.queued_time, 3)) +
+                       " seconds.").encode()
+            elif job.cancelled:
+                err = b"Command cancelled."
+
+        job.result = self.recordCommand(
+            job.caller, job.command, job.start_time, queue_time, text, err,
+            returncode, job.forgive, job.log)
 
     def logEvent(self, who, forgive=False, log=True):
         """
@@ -262,6 +359,9 @@ class DeviceCommonSelf:
             Build self.cmdEvent{} dictionary from self.cmdXxx variables.
             During automatic rediscovery, logging is turned off (log=False) to
             reduce size of cmdEvents[list].
+            2026-10-18 cmdEvents is a bounded EventRing(). log=False events
+                stay in the ring only and are hidden from Discovery errors and
+                timings. They are never saved in library.db.
         """
 
         # GLO['LOG_EVENTS'] global variable is set during auto rediscovery
@@ -296,13 +396,18 @@ class DeviceCommonSelf:
             'command_string': self.cmdString,  # Command list as string
             'start_time': self.cmdStart,  # When command started
             'duration': self.cmdDuration,  # Command duration
+            'queue_time': self.cmdQueueTime,  # Waiting for runCommandAsync() worker
             'output': self.cmdOutput,  # stdout.strip() from command
             'error': self.cmdError,  # stderr.strip() from command
             'returncode': self.cmdReturncode  # return code from command
         }
 
+        self.cmdQueueTime = 0.0  # Only runCommandAsync() sets before logEvent()
+
+        # 2026-10-18 log=False events, E.G. `sensors` every second, are dropped
+        #   when pushed out of the ring instead of being saved in library.db.
+        self.cmdEvents.append(self.cmdEvent, logged=log)
         if log:
-            self.cmdEvents.append(self.cmdEvent)
             if self.cmdError or self.cmdReturncode:
                 # When one or more errors, menu is enabled.
                 GLO['EVENT_ERROR_COUNT'] += 1
@@ -363,20 +468,37 @@ class Globals(DeviceCommonSelf):
             "CONFIG_FNAME": "config.json",  # Future configuration file.
             "DEVICES_FNAME": "devices.json",  # mirrors ni.mac_dicts[{}, {}, ... {}]
             "VIEW_ORDER_FNAME": "view_order.json",  # Read into ni.view_order[mac1, mac2, ... mac9]
-            "LAYOUT_FNAME": "view_order.json",  # Read into ni.view_order[mac1, mac2, ... mac9]
+            "LAYOUT_FNAME": "layout.json",  # Read into ni.layouts[{}, {}, ... {}]
+            "FINGERPRINT_FNAME": "fingerprints.json",  # Device types tested by MAC
+            "EMETER_FNAME": "emeter.db",  # HS110 Smart Plug power history
+            "EVENTS_FNAME": "library.db",  # cmdEvents spilled from EventRing()
 
             # Timeouts improve device interface performance
             "PLUG_TIME": "2.0",  # Smart plug timeout to turn power on/off
+            "KASA_DISCOVER_TIME": 0.5,  # Seconds smart plugs can reply to broadcast
+            "CMD_DEVICE_LIMIT": 2,  # runCommandAsync() commands running per device
             "CURL_TIME": "0.2",  # Anything longer means not a Sony TV or disconnected
             "ADB_CON_TIME": "0.3",  # Android TV Test if connected timeout
             "ADB_PWR_TIME": "2.0",  # Android TV Test power state timeout
+            "ADB_CACHE_TIME": "1.0",  # Android TV power state reused for seconds
             "ADB_KEY_TIME": "5.0",  # Android keyevent KEYCODE_SLEEP or KEYCODE_WAKEUP timeout
-            "ADB_MAGIC_TIME": "0.2",  # Android TV Wake on Lan Magic Packet wait time.
+            "ADB_MAGIC_TIME": "0.2",  # Android TV wait between reconnects while waking
+            "WOL_SCHEDULE_LIST": [0.0, 1.0, 2.0, 4.0, 8.0, 16.0],  # Seconds to send
+            "WOL_BURST": 3,  # Wake on Lan Magic Packets sent each scheduled time
 
             # Application timings and global working variables
             "APP_RESTART_TIME": time.time(),  # Time started or resumed. Use for elapsed time print
             "REFRESH_MS": 33,  # Refresh tooltip fades 30 frames per second
             "REDISCOVER_SECONDS": 60,  # Check for device changes every x seconds
+            "DISCOVER_WORKERS": 8,  # Threads testing arp devices for device type
+            "DISCOVER_HOST_TIME": 4.0,  # Seconds allowed to test one arp device
+            "FINGERPRINT_HIT_DAYS": 30.0,  # Days to remember device type matched
+            "FINGERPRINT_MISS_DAYS": 1.0,  # Days to skip device type that failed
+            "EMETER_SECONDS": 10.0,  # Seconds between HS110 power samples. 0 = Off
+            "EMETER_RAW_DAYS": 2.0,  # Days to keep every sample
+            "EMETER_MINUTE_DAYS": 31.0,  # Days to keep minute summaries
+            "EVENT_RING_SIZE": 200,  # cmdEvents kept in memory for each device
+            "EVENT_KEEP_DAYS": 31.0,  # Days to keep cmdEvents in library.db
             "RESUME_TEST_SECONDS": 30,  # > x seconds disappeared means system resumed
             "RESUME_DELAY_RESTART": 10,  # Allow x seconds for network to come up
             # Sony TV error # 1792. Initial 3 sec. March 2025 6 sec. April 2025 7 sec.
@@ -387,6 +509,8 @@ class Globals(DeviceCommonSelf):
             "LED_LIGHTS_STARTUP": True,  # "0" turn off, "1" turn on.
             "LED_LIGHTS_COLOR": None,  # Last colorchooser ((r, g, b), #000000)
             "LED_RED+GREEN_ADJ": False,  # "1" override red+green mix with less green.
+            "LED_BACKEND": "gatttool",  # "gatttool" or "bgapi" (BLED112 USB dongle)
+            "LED_SERIAL_PORT": "",  # BLED112 serial port. "" = auto-detect
             "BLUETOOTH_SCAN_TIME": 10,  # Number of seconds to scan bluetooth devices
 
             "TIMER_SEC": 600,  # Tools Dropdown Menubar - Countdown Timer default
@@ -401,7 +525,7 @@ class Globals(DeviceCommonSelf):
             "DIAGONAL_CURSOR": False,  # Tkinter provides explicit diagonal resizing cursors
 
             # Device type global identifier hard-coded in "inst.type_code"
-            "HS1_SP": 10,  # TP-Link Kasa WiFi Smart Plug HS100, HS103 or HS110 using hs100.sh
+            "HS1_SP": 10,  # TP-Link Kasa WiFi Smart Plug HS100, HS103 or HS110 using kasa.py
             "KDL_TV": 20,  # Sony Bravia KDL Android TV using REST API (curl)
             "ADB_TV": 30,  # Google Android TV using adb (after wakeonlan)
             "BLE_LS": 40,  # Bluetooth Low Energy LED Light Strip
@@ -418,11 +542,16 @@ class Globals(DeviceCommonSelf):
             "POWER_OFF_CMD_LIST": ["systemctl", "suspend"],  # Run "Turn Off" for Computer()
             "POWER_ALL_EXCL_LIST": [100, 110, 120, 200],  # Exclude when powering "All"
             # to "ON" / "OFF" 100=DESKTOP, 110=LAPTOP_B, 120=LAPTOP_D, 200=ROUTER_M
+            "POWER_ALL_ORDER_LIST": [[20, 30], [10]],  # Stages to power "ON". Reversed "OFF"
+            # 20=KDL_TV, 30=ADB_TV, 10=HS1_SP. TV before bias light. Others 1st stage
+            "POWER_ALL_TIME": 10.0,  # Seconds to wait for all devices "ON" / "OFF"
+            "POWER_STATUS_TIME": 15.0,  # Seconds to wait for getPower() threads
 
             "TREEVIEW_COLOR": "WhiteSmoke",  # Treeview main color
             "TREE_EDGE_COLOR": "White",  # Treeview edge color 5 pixels wide
             "ALLOW_REMOTE_TO_SUSPEND": True,  # Sony getPower()
             "ALLOW_VOLUME_CONTROL": True,  # Sony getVolume() and setVolume()
+            "SONY_NOTIFICATIONS": True,  # Sony TV pushes power and volume changes
             "QUIET_VOLUME": 20,  # 10pm - 9am
             "NORMAL_VOLUME": 36,  # Normal volume (9am - 10pm)
 
@@ -451,10 +580,17 @@ class Globals(DeviceCommonSelf):
         if not os.path.isfile(self.config_fname):
             return False  # config.json doesn't exist
 
+        defaults = self.dictGlobals  # Key/value pairs not in older config.json
         with open(self.config_fname, "r") as fcb:
             v2_print("Opening configuration file:", self.config_fname)
             self.dictGlobals = json.loads(fcb.read())
 
+        # 2026-10-18 Automate TEMPLATE below for new key/value pairs
+        for key in defaults:
+            if key not in self.dictGlobals:
+                self.dictGlobals[key] = defaults[key]
+                v0_print("Create GLO['" + key + "']:", self.dictGlobals[key])
+
         # print("GLO['LED_LIGHTS_COLOR']:", GLO['LED_LIGHTS_COLOR'])
         # Starts as a tuple json converts to list: [[44, 28, 27], u'#2c1c1b']
         try:
@@ -583,6 +719,10 @@ class Globals(DeviceCommonSelf):
             ("ALLOW_VOLUME_CONTROL", 1, RW, BOOL, BOOL, 2, DEC, MIN, MAX, CB,
              "Monitor Sony TV volume levels and set to\n"
              "quiet volume or normal volume on restart."),
+            ("SONY_NOTIFICATIONS", 1, RW, BOOL, BOOL, 2, DEC, MIN, MAX, CB,
+             "Sony TV sends power off and volume changes\n"
+             "as they happen. Polls every second when the\n"
+             "TV model doesn't support notifications."),
             ("QUIET_VOLUME", 1, RW, INT, INT, 3, DEC, 5, 80, CB,
              "Audio System volume level between\n10pm and 9am (20:00 and 9:00)"),
             ("NORMAL_VOLUME", 1, RW, INT, INT, 3, DEC, 5, 80, CB,
@@ -590,16 +730,29 @@ class Globals(DeviceCommonSelf):
             # Timeouts improve incorrect device communication performance
             ("PLUG_TIME", 3, RW, FLOAT, STR, 6, DEC, MIN, MAX, CB,
              "Smart plug timeout to turn power on/off"),
+            ("KASA_DISCOVER_TIME", 3, RW, FLOAT, FLOAT, 6, DEC, MIN, MAX, CB,
+             "Seconds smart plugs can reply to\ndiscovery broadcast. 0 = Off"),
+            ("CMD_DEVICE_LIMIT", 3, RW, INT, INT, 2, DEC, 1, 8, CB,
+             "Background commands that can run\nat the same time for one device."),
             ("CURL_TIME", 1, RW, FLOAT, STR, 6, DEC, MIN, MAX, CB,
              "A longer time means this is not\na Sony TV or Sony TV disconnected"),
             ("ADB_CON_TIME", 2, RW, FLOAT, STR, 6, DEC, MIN, MAX, CB,
              "Android TV test if connected timeout"),
             ("ADB_PWR_TIME", 2, RW, FLOAT, STR, 6, DEC, MIN, MAX, CB,
              "Android TV test power state timeout"),
+            ("ADB_CACHE_TIME", 2, RW, FLOAT, STR, 6, DEC, MIN, MAX, CB,
+             "Seconds Android TV power state is\nreused before asking TV again."),
             ("ADB_KEY_TIME", 2, RW, FLOAT, STR, 6, DEC, MIN, MAX, CB,
              "Android keyevent KEYCODE_SLEEP\nor KEYCODE_WAKEUP timeout"),
             ("ADB_MAGIC_TIME", 2, RW, FLOAT, STR, 6, DEC, MIN, MAX, CB,
-             "Android TV Wake on Lan Magic Packet wait time."),
+             "Android TV seconds between reconnect\n"
+             "attempts while Magic Packets are sent."),
+            ("WOL_SCHEDULE_LIST", 2, RW, STR, LIST, 20, DEC, MIN, MAX, CB,
+             "Seconds after Connect() starts to send\n"
+             "Wake on Lan Magic Packets. E.G. [0, 1, 2, 4]\n"
+             "Menu Turn On only waits ADB_KEY_TIME."),
+            ("WOL_BURST", 2, RW, INT, INT, 2, DEC, 1, 10, CB,
+             "Magic Packets sent at each scheduled time."),
             # Application timings and global working variables
             ("APP_RESTART_TIME", 0, HD, TM, TM, 18, DEC, MIN, MAX, CB,
              "Time HomA was started or resumed.\nUsed for elapsed time printing."),
@@ -607,6 +760,33 @@ class Globals(DeviceCommonSelf):
              "Refresh tooltip fades 60 frames per second"),
             ("REDISCOVER_SECONDS", 6, RW, INT, INT, 5, DEC, MIN, MAX, CB,
              "Check devices changes every x seconds"),
+            ("DISCOVER_WORKERS", 6, RW, INT, INT, 3, DEC, 1, 64, CB,
+             "Number of arp devices tested at the same\n"
+             "time during discovery and rediscovery."),
+            ("DISCOVER_HOST_TIME", 6, RW, FLOAT, FLOAT, 6, DEC, MIN, MAX, CB,
+             "Seconds allowed to test one arp device\n"
+             "before giving up on it during discovery."),
+            ("FINGERPRINT_HIT_DAYS", 6, RW, FLOAT, FLOAT, 6, DEC, 0.0, MAX, CB,
+             "Days to remember the device type found\n"
+             "for a MAC address. It is tested first."),
+            ("FINGERPRINT_MISS_DAYS", 6, RW, FLOAT, FLOAT, 6, DEC, 0.0, MAX, CB,
+             "Days to skip testing a device type that\n"
+             "failed for a MAC address. 0 = never skip."),
+            ("EMETER_SECONDS", 6, RW, FLOAT, FLOAT, 6, DEC, 0.0, MAX, CB,
+             "Seconds between HS110 Smart Plug power\n"
+             "samples. 0 = Off. Restart HomA to apply."),
+            ("EMETER_RAW_DAYS", 6, RW, FLOAT, FLOAT, 6, DEC, 0.0, MAX, CB,
+             "Days to keep every HS110 power sample."),
+            ("EMETER_MINUTE_DAYS", 6, RW, FLOAT, FLOAT, 6, DEC, 0.0, MAX, CB,
+             "Days to keep HS110 power minute summaries.\n"
+             "Hour summaries are kept forever."),
+            ("EVENT_RING_SIZE", 6, RW, INT, INT, 4, DEC, 10, 5000, CB,
+             "Command events kept in memory for each\n"
+             "device. Older events are saved in library.db"),
+            ("EVENT_KEEP_DAYS", 6, RW, FLOAT, FLOAT, 6, DEC, 0.0, MAX, CB,
+             "Days to keep command events in library.db.\n"
+             "0 = forever. Old events deleted on startup.\n"
+             "Events when logging is off aren't saved."),
             ("RESUME_TEST_SECONDS", 6, RW, INT, INT, 3, DEC, MIN, MAX, CB,
              "> x seconds disappeared means system resumed"),
             ("RESUME_DELAY_RESTART", 6, RW, INT, INT, 3, DEC, MIN, MAX, CB,
@@ -621,6 +801,12 @@ class Globals(DeviceCommonSelf):
              "When LED Red and Green are mixed together,\n"
              "boost Red by 50% and reduce Green by 50%\n"
              "for a more accurate Yellow?  1=True / 0=False"),
+            ("LED_BACKEND", 4, RW, STR, STR, 10, DEC, MIN, MAX, CB,
+             'Bluetooth backend for LED lights. "gatttool"\n'
+             'for BlueZ or "bgapi" for BLED112 USB dongle.'),
+            ("LED_SERIAL_PORT", 4, RW, STR, STR, 20, DEC, MIN, MAX, CB,
+             'BLED112 serial port. E.G. "/dev/ttyACM0"\n'
+             "Leave blank to auto-detect."),
             ("BLUETOOTH_SCAN_TIME", 4, RW, INT, INT, 3, DEC, MIN, MAX, CB,
              "Number of seconds to perform bluetooth scan.\n"
              "A longer time may discover more devices."),
@@ -652,7 +838,7 @@ class Globals(DeviceCommonSelf):
              "diagonal resizing of images?  1=True / 0=False"),
             # Device type global identifier hard-coded in "inst.type_code"
             ("HS1_SP", 3, RO, INT, INT, 2, DEC, MIN, MAX, CB,
-             "TP-Link Kasa WiFi Smart Plug HS100,\nHS103 or HS110 using hs100.sh"),  #
+             "TP-Link Kasa WiFi Smart Plug HS100,\nHS103 or HS110 using kasa.py"),  #
             ("KDL_TV", 1, RO, INT, INT, 2, DEC, MIN, MAX, CB,
              "Sony Bravia KDL Android TV using REST API `curl`"),
             ("ADB_TV", 2, RO, INT, INT, 2, DEC, MIN, MAX, CB,
@@ -667,6 +853,12 @@ class Globals(DeviceCommonSelf):
              "Network Devices Treeview display order filename"),
             ("LAYOUT_FNAME", 6, RO, STR, STR, WID, DEC, MIN, MAX, CB,
              "Network Devices layout schematic filename"),
+            ("FINGERPRINT_FNAME", 6, RO, STR, STR, WID, DEC, MIN, MAX, CB,
+             "Device types tested by MAC address filename"),
+            ("EMETER_FNAME", 6, RO, STR, STR, WID, DEC, MIN, MAX, CB,
+             "HS110 Smart Plug power history filename"),
+            ("EVENTS_FNAME", 6, RO, STR, STR, WID, DEC, MIN, MAX, CB,
+             "Command events history filename"),
             ("BACKLIGHT_NAME", 7, RW, STR, STR, 30, DEC, MIN, MAX, CB,
              "E.G. 'intel_backlight', 'nvidia_backlight', etc."),
             ("BACKLIGHT_ON", 7, RW, STR, STR, 2, DEC, MIN, MAX, CB,
@@ -678,6 +870,15 @@ class Globals(DeviceCommonSelf):
              'Run "Turn Off" for Computer'),
             ("POWER_ALL_EXCL_LIST", 7, RW, STR, LIST, 20, DEC, MIN, MAX, CB,
              'Exclude devices when powering all "ON" / "OFF"'),
+            ("POWER_ALL_ORDER_LIST", 7, RW, STR, LIST, 20, DEC, MIN, MAX, CB,
+             'Device type stages when powering all "ON".\n'
+             '[[20, 30], [10]] = TVs together, then lights.\n'
+             'Reversed for "OFF".'),
+            ("POWER_ALL_TIME", 7, RW, FLOAT, FLOAT, 6, DEC, MIN, MAX, CB,
+             'Seconds to wait for all devices "ON" / "OFF"'),
+            ("POWER_STATUS_TIME", 7, RW, FLOAT, FLOAT, 6, DEC, MIN, MAX, CB,
+             'Seconds to wait for power status of all\n'
+             'devices. Late devices are updated next time.'),
             # Once entered, sudo password stored encrypted on disk until "forget" is run.
             # ("SUDO_PASSWORD", 7, HD, STR, STR, WID, DEC, MIN, MAX, CB,
             # "Sudo password required for laptop backlight"),  # HD Hidden NOT working yet.
@@ -756,15 +957,36 @@ class Globals(DeviceCommonSelf):
                 v0_print("Bad list passed:", key, new_value, type(new_value))
                 return False
 
-            if key == "POWER_ALL_EXCL_LIST":  # List longer for future device types
+            if key in ("POWER_ALL_EXCL_LIST", "POWER_ALL_ORDER_LIST"):
+                # List longer for future device types
                 subset_list = [10, 20, 30, 40, 50, 60, 70, 100, 110, 120, 200]
-                if not set(new_list).issubset(subset_list):
+                codes = []  # POWER_ALL_ORDER_LIST stages can be sub-lists
+                for code in new_list:
+                    if key == "POWER_ALL_ORDER_LIST" and isinstance(code, list):
+                        codes.extend(code)
+                    else:
+                        codes.append(code)
+                if not all(isinstance(code, int) and code in subset_list
+                           for code in codes):
                     v0_print(_who, "POWER_ALL bad value:", key, new_value)
                     v0_print("Not in list:", subset_list)
                     return False
 
+            if key == "WOL_SCHEDULE_LIST":
+                try:
+                    new_list = sorted(float(seconds) for seconds in new_list)
+                except (TypeError, ValueError):
+                    new_list = [-1.0]
+                if not new_list or new_list[0] < 0.0:
+                    v0_print(_who, "WOL_SCHEDULE_LIST bad value:", new_value)
+                    return False
+
             new_value = new_list  # Passed all tests
 
+        if key == "LED_BACKEND" and new_value not in ("gatttool", "bgapi"):
+            v0_print(_who, "LED_BACKEND bad value:", new_value)
+            return False
+
         GLO[key] = new_value
         return True
 
@@ -1206,6 +1428,780 @@ class AudioControl(DeviceCommonSelf):
         self.isWorking = True  # All methods in AudioControl() should work now
 
 
+
+class PoolJob:
+    """ Function call queued by WorkerPool().submit(). Works like a future.
+
+        job.result    - Value returned by function when job.error is None
+        job.error     - Exception raised by function
+        job.cancelled - job.cancel() called before a worker started job
+    """
+
+    def __init__(self, func, args, callback):
+        """ Created by WorkerPool().submit() only """
+        self.func = func
+        self.args = args
+        self.callback = callback  # Run in worker thread when job finishes
+
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.queued_time = time.time()  # Time waiting for a free worker is
+        self.start_time = 0.0  # start_time - queued_time. Run time is
+        self.end_time = 0.0  # end_time - start_time.
+        self.finished = threading.Event()
+        self.lock = threading.Lock()  # self.start_time and self.cancelled
+
+    def cancel(self):
+        """ Cancel job if it hasn't started. Running jobs can't be cancelled. """
+        with self.lock:
+            if self.start_time:
+                return False
+            self.cancelled = True
+        self.finished.set()
+        return True
+
+    def done(self):
+        """ Return True when job has finished or was cancelled """
+        return self.finished.is_set()
+
+    def wait(self, timeout=None):
+        """ Wait up to timeout seconds (None = forever) for job to finish.
+            :returns: True if job finished, False if still running.
+        """
+        self.finished.wait(timeout)
+        return self.finished.is_set()
+
+
+class WorkerPool:
+    """ Bounded pool of daemon threads running PoolJob() function calls.
+
+        USAGE: pool = WorkerPool(8, "discover")
+               job = pool.submit(inst.isDevice, (True,))
+               if job.wait(2.0) and job.error is None: print(job.result)
+               pool.close()
+
+        Python 2 has no concurrent.futures so threads and Queue are used.
+    """
+
+    def __init__(self, workers=4, name="WorkerPool"):
+        """ Start worker threads. They sleep until jobs are submitted. """
+        self.who = "WorkerPool(" + name + ")."
+        self.jobs = Queue.Queue()  # PoolJob() instances waiting for a worker
+        self.threads = []
+        self.closed = False
+        for i in range(max(1, int(workers))):
+            thread = threading.Thread(target=self.worker,
+                                      name=name + "-" + str(i + 1))
+            thread.daemon = True  # Never stop HomA from exiting
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, func, args=(), callback=None):
+        """ Queue func(*args) for next free worker.
+            :param callback: callback(job) run in worker thread when done.
+            :returns: PoolJob() instance
+        """
+        job = PoolJob(func, args, callback)
+        if self.closed:
+            v0_print(self.who + "submit():", "Pool is closed:", func)
+            job.cancel()
+            return job
+        self.jobs.put(job)
+        return job
+
+    def worker(self):
+        """ Thread loop. Run jobs until None is received from close(). """
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            with job.lock:  # job.cancel() can't slip in after this
+                if job.cancelled:
+                    continue
+                job.start_time = time.time()
+            try:
+                job.result = job.func(*job.args)
+            except Exception as err:  # Report in caller's thread
+                job.error = err
+                v1_print(self.who + "worker():", job.func, "error:", err)
+            job.end_time = time.time()
+            job.finished.set()
+            if job.callback:
+                job.callback(job)
+
+    def close(self, wait=False):
+        """ Stop workers after queued jobs finish. Cancel with job.cancel() """
+        self.closed = True
+        for _thread in self.threads:
+            self.jobs.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+
+class SchedJob:
+    """ One Scheduler() job """
+
+    def __init__(self, name, func, period):
+        self.name = name  # E.G. "sensors"
+        self.func = func  # Called with no arguments
+        self.period = period  # Seconds between runs. None = run once
+        self.due = 0.0  # Scheduler().clock() time to run next
+        self.running = False  # func() hasn't returned yet
+        self.cancelled = False
+        self.runs = 0  # Number of times func() was called
+        self.run_time = 0.0  # Seconds spent in func() by all runs
+
+
+class Scheduler:
+    """ Jobs run on the tkinter thread when they are due, instead of every
+        job being checked every 16 to 33 ms by Application().refreshApp().
+
+        USAGE: sched = Scheduler()
+               sched.every("sensors", 1.0, sm.Sensors)  # Every second
+               sched.after("power", 90.0, self.refreshAllPowerStatuses)  # Once
+               sched.run()  # Run jobs that are due
+               ms = sched.wait_ms()  # Milliseconds until next job is due
+
+        A job can return seconds until it should run again, E.G. fast while
+        breathing colors statistics are displayed and slow when they aren't.
+        None returned means wait self.period seconds.
+
+        run() can be called again while a job is running, E.G. the job opened
+        a dialog box that calls refreshApp(). Jobs still running in the outer
+        run() are skipped so a job is never running twice at the same time.
+
+        :param on_wake: Called when wake() makes a job due sooner than the
+            time returned by wait_ms(). Application() stops waiting.
+    """
+
+    def __init__(self, on_wake=None):
+        self.who = "homa_common.py Scheduler()."
+        self.clock = getattr(time, "monotonic", time.time)  # Python 2 time
+        self.on_wake = on_wake
+        self.heap = []  # (due, count, SchedJob)
+        self.jobs = {}  # SchedJob by name
+        self.count = itertools.count()  # Tie breaker when due times equal
+        self.profile = None  # LoopProfile() when profiling
+
+    def push(self, job, seconds):
+        """ Schedule job to run in seconds. Old heap entries become stale. """
+        job.due = self.clock() + max(seconds, 0.0)
+        heapq.heappush(self.heap, (job.due, next(self.count), job))
+
+    def every(self, name, seconds, func, first=0.0):
+        """ Run func() every seconds. First run is first seconds from now.
+            A job with the same name is replaced.
+        """
+        self.cancel(name)
+        job = SchedJob(name, func, seconds)
+        self.jobs[name] = job
+        self.push(job, first)
+        return job
+
+    def after(self, name, seconds, func):
+        """ Run func() once, seconds from now. Same name is replaced. """
+        self.cancel(name)
+        job = SchedJob(name, func, None)
+        self.jobs[name] = job
+        self.push(job, seconds)
+        return job
+
+    def cancel(self, name):
+        """ Stop running job. Nothing happens when name isn't scheduled. """
+        job = self.jobs.pop(name, None)
+        if job:
+            job.cancelled = True
+
+    def wake(self, name, seconds=0.0):
+        """ Run job in seconds when it is due later than that. E.G. a tooltip
+            event was logged so poll_tips() can't wait for the next second.
+        """
+        job = self.jobs.get(name)
+        if job is None or job.due <= self.clock() + seconds:
+            return
+        self.push(job, seconds)
+        if self.on_wake:
+            self.on_wake()
+
+    def top(self):
+        """ Return next (due, count, job) after discarding stale entries """
+        while self.heap:
+            due, _count, job = self.heap[0]
+            if not job.cancelled and due == job.due:
+                return self.heap[0]
+            heapq.heappop(self.heap)
+        return None
+
+    def run(self):
+        """ Run every job that is due. Return number of jobs run. """
+        ran = 0
+        skipped = []  # Jobs still running in an outer run()
+        now = self.clock()
+        while True:
+            entry = self.top()
+            if entry is None or entry[0] > now:
+                break
+            job = heapq.heappop(self.heap)[2]
+            if job.running:
+                skipped.append(entry)
+                continue
+
+            job.running = True
+            start = self.clock()
+            try:
+                seconds = job.func()
+            finally:
+                elapsed = self.clock() - start
+                job.running = False
+                job.runs += 1
+                job.run_time += elapsed
+                if self.profile:
+                    self.profile.record(job.name, elapsed)
+            ran += 1
+
+            if job.cancelled or job.due != entry[0]:
+                continue  # Job cancelled or woken while it was running
+            if seconds is None:
+                seconds = job.period
+            if seconds is None:  # after() job is finished
+                self.jobs.pop(job.name, None)
+                continue
+            self.push(job, seconds)
+
+        for entry in skipped:
+            heapq.heappush(self.heap, entry)
+        return ran
+
+    def wait_ms(self, most=1000):
+        """ Return milliseconds until next job is due. Never more than most. """
+        entry = self.top()
+        if entry is None:
+            return most
+        ms = int((entry[0] - self.clock()) * 1000.0)
+        return max(0, min(ms, most))
+
+
+class CommandJob(PoolJob):
+    """ Command queued by DeviceCommonSelf.runCommandAsync(). Works like a future.
+
+        job.result    - cmdEvent dictionary when command ran, else None
+        job.error     - Exception raised starting command, E.G. not installed
+        job.cancelled - job.cancel() called
+        job.expired   - Command killed at job.deadline
+
+        Unlike PoolJob(), job.callback runs on tkinter thread when Application()
+        calls executor.drain().
+    """
+
+    def __init__(self, inst, command, caller, forgive, log, deadline, callback):
+        """ Created by DeviceCommonSelf.runCommandAsync() only """
+        PoolJob.__init__(self, inst.executeCommand, (), callback)
+        self.args = (self,)  # inst.executeCommand(job)
+        self.inst = inst  # Device instance. CMD_DEVICE_LIMIT counts by inst
+        self.command = command  # command_line_list
+        self.caller = caller
+        self.forgive = forgive
+        self.log = log
+        self.deadline = deadline  # time.time() command is killed or None
+        self.expired = False
+        self.pipe = None  # sp.Popen() while running. Set under self.lock
+
+    def cancel(self):
+        """ Cancel command. Kill it if running. Callback still runs. """
+        with self.lock:
+            if self.finished.is_set():
+                return False
+            self.cancelled = True
+            pipe = self.pipe
+        if pipe is not None:
+            self.kill(pipe)
+        return True
+
+    def expire(self):
+        """ threading.Timer() at self.deadline """
+        self.expired = True
+        self.kill(self.pipe)
+
+    @staticmethod
+    def kill(pipe):
+        """ Kill command. Already ended is ok. """
+        try:
+            pipe.kill()
+        except OSError:
+            pass
+
+
+class CommandExecutor:
+    """ Run CommandJob() commands in WorkerPool() threads. No more than
+        GLO['CMD_DEVICE_LIMIT'] commands run at once for one device. Others
+        wait in that device's queue so they don't hold a worker thread.
+
+        USAGE: job = inst.runCommandAsync(["sensors"], _who, callback=func)
+               Application() job calls executor.drain() on tkinter thread
+               to run func(job) for finished commands.
+    """
+
+    def __init__(self, workers=8, limit=2):
+        self.who = "homa_common.py CommandExecutor()."
+        self.workers = workers
+        self.limit = limit  # When GLO isn't defined yet
+        self.pool = None  # WorkerPool() started on first submit()
+        self.lock = threading.Lock()
+        self.running = {}  # Commands running by id(inst)
+        self.waiting = {}  # deque of CommandJob() by id(inst)
+        self.done = Queue.Queue()  # Finished CommandJob() for drain()
+        self.outstanding = 0  # Submitted and not drained yet
+        self.wake = None  # Called by submit() on tkinter thread
+
+    def submit(self, job):
+        """ Start job now or when one of its device's commands finishes """
+        try:
+            limit = GLO['CMD_DEVICE_LIMIT']
+        except NameError:
+            limit = self.limit  # Early on, GLO is not defined
+        key = id(job.inst)
+        with self.lock:
+            if self.pool is None:
+                self.pool = WorkerPool(self.workers, "commands")
+            self.outstanding += 1
+            start = self.running.get(key, 0) < limit
+            if start:
+                self.running[key] = self.running.get(key, 0) + 1
+            else:
+                self.waiting.setdefault(key, deque()).append(job)
+        if start:
+            self.pool.submit(self.execute, (job,))
+        if self.wake and threading.current_thread().name == "MainThread":
+            self.wake()  # Application() drains sooner
+
+    def execute(self, job):
+        """ Worker thread. Run job then start next job for same device. """
+        try:
+            job.func(*job.args)
+        except Exception as err:  # Report in drain()
+            job.error = err
+            v1_print(self.who + "execute():", job.command, "error:", err)
+        job.end_time = time.time()
+
+        key = id(job.inst)
+        with self.lock:
+            queue = self.waiting.get(key)
+            next_job = queue.popleft() if queue else None
+            if queue is not None and not queue:
+                del self.waiting[key]
+            if next_job is None:
+                self.running[key] -= 1
+                if self.running[key] <= 0:
+                    del self.running[key]
+        with job.lock:
+            job.finished.set()
+        self.done.put(job)
+        if next_job is not None:
+            self.pool.submit(self.execute, (next_job,))
+
+    def drain(self):
+        """ Call on tkinter thread. Run callbacks of finished jobs. """
+        count = 0
+        while True:
+            try:
+                job = self.done.get_nowait()
+            except Queue.Empty:
+                return count
+            with self.lock:
+                self.outstanding -= 1
+            count += 1
+            if job.callback:
+                job.callback(job)
+
+    def busy(self):
+        """ Return True when commands haven't been drained yet """
+        return self.outstanding > 0
+
+
+DEADLINE_RETURNCODE = 124  # Same as `timeout` command
+executor = CommandExecutor()  # DeviceCommonSelf.runCommandAsync() commands
+runner = None  # cr.Runner() started by startRunner(). None = fork HomA
+
+
+def startRunner():
+    """ Start cmd_runner.py helper process. Called once by homa.py main().
+
+        Python 3.10+ subprocess uses vfork() which doesn't copy HomA's memory.
+        spawn_bench.py shows the helper is slower there, so it isn't started.
+    """
+    global runner
+    if sys.version_info >= (3, 10):
+        v1_print("homa_common.py startRunner(): subprocess uses vfork()")
+        return
+    try:
+        runner = cr.Runner()
+    except OSError as err:
+        v0_print("homa_common.py startRunner(): Forking HomA instead:", err)
+        runner = None
+
+
+def popen(command_line_list):
+    """ Start command and return sp.Popen() or cr.RunnerProcess(). Both have
+        .communicate(), .returncode and .kill(). OSError when not installed.
+    """
+    if runner is not None and runner.alive():
+        try:
+            return runner.popen(command_line_list)
+        except cr.RunnerError as err:  # Helper ended. Fork from now on.
+            v0_print("homa_common.py popen():", err)
+    return sp.Popen(command_line_list, stdout=sp.PIPE, stderr=sp.PIPE)
+
+
+class EventRing:
+    """ Last GLO['EVENT_RING_SIZE'] cmdEvents of one DeviceCommonSelf() instance.
+
+        Events are stored as tuples in fixed slots instead of dictionaries.
+        When all slots are used, the oldest event is pushed out to a spill
+        list. Full spill lists are written to library.db by events.write().
+        Events appended with logged=False are dropped when pushed out.
+
+        Iterating returns cmdEvent dictionaries oldest first for events not
+        written yet. events.query() returns written and unwritten events.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner  # DeviceCommonSelf() instance
+        self.slots = []  # Records. Allocated on first append()
+        self.head = 0  # Next slot to write
+        self.count = 0  # Slots used
+        self.spill = []  # Records pushed out of slots, not written yet
+        self.lock = threading.Lock()
+
+    def device(self):
+        """ MAC address of device, else class name, E.G. "NetworkInfo()." """
+        return getattr(self.owner, "mac", None) or self.owner.who
+
+    def append(self, event, logged=True):
+        """ Add cmdEvent dictionary. logged=False when GLO['LOG_EVENTS'] off. """
+        record = (self.device(), event['caller'], list(event['command']),
+                  event['command_string'], event['start_time'],
+                  event['duration'], event.get('queue_time', 0.0),
+                  self.text(event['output'], ""),
+                  self.text(event['error'], "\n"), event['returncode'],
+                  bool(logged))
+        with events.spill_lock:  # events.query() never sees batch in between
+            batch = None
+            with self.lock:
+                if not self.slots:
+                    self.slots = [None] * events.ring_size()
+                old = self.slots[self.head]
+                if old is not None and old[10]:  # Unlogged events are dropped
+                    self.spill.append(old)
+                self.slots[self.head] = record
+                self.head = (self.head + 1) % len(self.slots)
+                self.count = min(self.count + 1, len(self.slots))
+                if len(self.spill) >= max(len(self.slots) // 4, 1):
+                    batch, self.spill = self.spill, []
+            if batch:
+                events.write(batch)
+
+    @staticmethod
+    def text(value, separator):
+        """ Output and error can be lists of lines. Return string. """
+        return value if hasattr(value, "splitlines") else separator.join(value)
+
+    def extend(self, cmd_events):
+        """ Add cmdEvent dictionaries, E.G. from rediscovery's NetworkInfo() """
+        for event in cmd_events:
+            self.append(event, event.get('logged', True))
+
+    def records(self):
+        """ Return list of records not written to library.db, oldest first """
+        with self.lock:
+            return self.unlocked_records()
+
+    def unlocked_records(self):
+        """ records() when caller has self.lock """
+        if self.count < len(self.slots):
+            slots = self.slots[:self.count]
+        else:
+            slots = self.slots[self.head:] + self.slots[:self.head]
+        return self.spill + slots
+
+    def take(self):
+        """ Return logged records not written yet and empty ring. For
+            events.close().
+        """
+        with self.lock:
+            records = self.unlocked_records()
+            self.slots = []
+            self.head = self.count = 0
+            self.spill = []
+        return [record for record in records if record[10]]
+
+    def __iter__(self):
+        return iter([EventLog.asDict(record) for record in self.records()])
+
+    def __len__(self):
+        with self.lock:
+            return len(self.spill) + self.count
+
+
+class EventLog:
+    """ CmdEvent table in library.db for events spilled from every EventRing().
+
+        Batches are written by a daemon thread so tkinter never waits for a
+        commit. query() waits for queued batches, then adds events still in
+        the rings it is given. Only logged events are written, so `sensors`
+        every second with logging off never reaches library.db:
+
+            events.query([inst.cmdEvents], failed=True, start=restart_time)
+    """
+
+    COLUMNS = ("Device", "Caller", "Command", "CommandString", "StartTime",
+               "Duration", "QueueTime", "Output", "Error", "ReturnCode", "Logged")
+
+    def __init__(self):
+        self.who = "homa_common.py EventLog()."
+        self.con = None  # sqlite3 connection shared by writer and query()
+        self.lock = threading.Lock()  # One thread at a time uses self.con
+        self.spill_lock = threading.Lock()  # EventRing() spill and write()
+        self.batches = Queue.Queue()  # Record lists for self.writer()
+        self.thread = None  # self.writer() started by first write()
+
+    @staticmethod
+    def ring_size():
+        """ Slots in each EventRing(). Early on, GLO is not defined. """
+        try:
+            return max(int(GLO['EVENT_RING_SIZE']), 1)
+        except NameError:
+            return 200
+
+    @staticmethod
+    def fname():
+        """ Return library.db full path in user data directory """
+        try:
+            name = GLO['EVENTS_FNAME']
+        except NameError:
+            name = "library.db"
+        return g.USER_DATA_DIR + os.sep + name
+
+    def openFile(self):
+        """ Open library.db, create CmdEvent table and delete old events """
+        self.con = sqlite3.connect(self.fname(), check_same_thread=False)
+        self.con.execute(
+            "CREATE TABLE IF NOT EXISTS CmdEvent(Id INTEGER PRIMARY KEY, " +
+            "Device TEXT, Caller TEXT, Command TEXT, CommandString TEXT, " +
+            "StartTime REAL, Duration REAL, QueueTime REAL, Output TEXT, " +
+            "Error TEXT, ReturnCode INTEGER, Logged INTEGER, Failed INTEGER)")
+        for name, columns in (("Device", "Device, StartTime"),
+                              ("Caller", "Caller, StartTime"),
+                              ("Command", "CommandString, StartTime"),
+                              ("Failed", "Failed, StartTime"),
+                              ("Time", "StartTime")):
+            self.con.execute("CREATE INDEX IF NOT EXISTS CmdEvent" + name +
+                             " ON CmdEvent(" + columns + ")")
+        try:
+            days = float(GLO['EVENT_KEEP_DAYS'])
+        except NameError:
+            days = 0.0
+        if days > 0.0:
+            self.con.execute("DELETE FROM CmdEvent WHERE StartTime < ?",
+                             (time.time() - days * 86400.0,))
+        self.con.execute("DELETE FROM CmdEvent WHERE Logged = 0")  # Never kept
+        self.con.commit()
+
+    def write(self, records):
+        """ Queue records for self.writer() thread """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.writer, name="cmd-events")
+            self.thread.daemon = True
+            self.thread.start()
+        self.batches.put(records)
+
+    def writer(self):
+        """ Thread inserting batches until None from close(). Never touches
+            tkinter.
+        """
+        while True:
+            records = self.batches.get()
+            try:
+                if records is None:
+                    break
+                self.insert(records)
+            finally:
+                self.batches.task_done()
+
+    def insert(self, records):
+        """ Insert records in one transaction. Errors lose the batch only. """
+        rows = [record[:2] + (json.dumps(record[2]),) + record[3:] +
+                (bool(record[8]) or record[9] != 0,) for record in records]
+        with self.lock:
+            try:
+                if self.con is None:
+                    self.openFile()
+                self.con.executemany(
+                    "INSERT INTO CmdEvent(" + ", ".join(self.COLUMNS) +
+                    ", Failed) VALUES (" + ", ".join(["?"] * 12) + ")", rows)
+                self.con.commit()
+            except sqlite3.Error as err:
+                v0_print(self.who + "insert():", err)
+
+    def query(self, rings, caller=None, command=None, start=None, end=None,
+              failed=None, logged=True):
+        """ Return cmdEvent dictionaries for devices of rings, oldest first.
+
+            :param rings: EventRing() list. Only their devices are selected.
+            :param caller: Exact caller, E.G. "SonyBraviaKdlTV().getPower():"
+            :param command: Text found in command string, E.G. "curl"
+            :param start: time.time() of first event or None
+            :param end: time.time() after last event or None
+            :param failed: True = errors only, False = no errors, None = all
+            :param logged: False includes events when GLO['LOG_EVENTS'] off.
+                Those are only in memory.
+        """
+        devices = []
+        memory = []
+        with self.spill_lock:  # No record moves from a ring to self.batches
+            self.batches.join()  # Wait for self.writer() to insert queued batches
+            for ring in rings:
+                if ring.device() not in devices:
+                    devices.append(ring.device())
+                memory.extend(ring.records())
+
+        where = ["Device IN (" + ", ".join(["?"] * len(devices)) + ")"]
+        args = list(devices)
+        for test, column, value in (
+                (caller is not None, "Caller = ?", caller),
+                (command is not None, "CommandString LIKE ?", "%" + str(command) + "%"),
+                (start is not None, "StartTime >= ?", start),
+                (end is not None, "StartTime < ?", end),
+                (failed is not None, "Failed = ?", bool(failed)),
+                (logged, "Logged = ?", True)):
+            if test:
+                where.append(column)
+                args.append(value)
+
+        rows = []
+        with self.lock:
+            try:
+                if self.con is None:
+                    self.openFile()
+                rows = self.con.execute(
+                    "SELECT " + ", ".join(self.COLUMNS) + " FROM CmdEvent WHERE " +
+                    " AND ".join(where) + " ORDER BY StartTime", args).fetchall()
+            except sqlite3.Error as err:
+                v0_print(self.who + "query():", err)
+
+        results = []
+        for row in rows:
+            results.append(self.asDict(row[:2] + (json.loads(row[2]),) + row[3:]))
+        for record in memory:
+            if caller is not None and record[1] != caller:
+                continue
+            if command is not None and str(command) not in record[3]:
+                continue
+            if start is not None and record[4] < start:
+                continue
+            if end is not None and record[4] >= end:
+                continue
+            error = bool(record[8]) or record[9] != 0
+            if failed is not None and error != bool(failed):
+                continue
+            if logged and not record[10]:
+                continue
+            results.append(self.asDict(record))
+        results.sort(key=lambda event: event['start_time'])
+        return results
+
+    @staticmethod
+    def asDict(record):
+        """ Record tuple to cmdEvent dictionary """
+        return {'device': record[0], 'caller': record[1], 'command': record[2],
+                'command_string': record[3], 'start_time': record[4],
+                'duration': record[5], 'queue_time': record[6],
+                'output': record[7], 'error': record[8],
+                'returncode': record[9], 'logged': bool(record[10])}
+
+    def close(self, rings):
+        """ Write events still in rings and close library.db. Called on exit. """
+        with self.spill_lock:
+            for ring in rings:
+                records = ring.take()
+                if records:
+                    self.write(records)
+        if self.thread is not None:
+            self.batches.put(None)  # Stop self.writer() after last batch
+            self.thread.join()
+            self.thread = None  # Restarted if an event is written after close
+        with self.lock:
+            if self.con:
+                self.con.close()
+                self.con = None
+
+
+START_TIME = time.time()  # Process start. GLO['APP_RESTART_TIME'] resets on resume
+events = EventLog()  # cmdEvents pushed out of every EventRing()
+
+
+class LoopProfile:
+    """ Fixed size histograms of how long Application() loop tasks take.
+
+        USAGE: prof = LoopProfile()
+               prof.record("sensors", seconds)  # Scheduler() job, update, etc.
+               prof.frame(seconds, GLO['REFRESH_MS'])  # One refreshApp() pass
+               for line in prof.report(): print(line)
+
+        Nothing is recorded when Scheduler().profile is None. Enabled by
+        `homa.py --profile-loop` or View dropdown menu "Loop performance".
+    """
+
+    BUCKETS_MS = (0.1, 0.3, 1.0, 3.0, 10.0, 30.0, 100.0, 300.0, 1000.0)
+
+    def __init__(self):
+        self.start = time.time()
+        self.tasks = OrderedDict()  # name: [count, total ms, max ms, buckets]
+        self.frames = 0  # refreshApp() passes
+        self.overruns = 0  # Passes longer than GLO['REFRESH_MS']
+        self.short_sleeps = 0  # "Only sleeping 1 millisecond"
+
+    def record(self, name, seconds):
+        """ Add duration to name's histogram """
+        ms = seconds * 1000.0
+        task = self.tasks.get(name)
+        if task is None:
+            task = [0, 0.0, 0.0, [0] * (len(self.BUCKETS_MS) + 1)]
+            self.tasks[name] = task
+        task[0] += 1
+        task[1] += ms
+        if ms > task[2]:
+            task[2] = ms
+        task[3][bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+
+    def frame(self, seconds, budget_ms):
+        """ One pass of jobs. Overrun when longer than budget_ms. """
+        self.frames += 1
+        if seconds * 1000.0 > budget_ms:
+            self.overruns += 1
+        self.record("frame", seconds)
+
+    def report(self):
+        """ Return list of text lines. Histogram columns are upper bounds. """
+        lines = ["Loop profile for " + str(int(time.time() - self.start)) +
+                 " seconds. Frames: " + str(self.frames) + "  Overruns: " +
+                 str(self.overruns) + "  Only sleeping 1 ms: " +
+                 str(self.short_sleeps)]
+        heading = "{0:<12}{1:>8}{2:>10}{3:>10}{4:>10}".format(
+            "Task", "Count", "Avg ms", "Max ms", "Tot sec")
+        for limit in self.BUCKETS_MS:
+            heading += "{0:>7}".format("<" + ('%g' % limit))
+        lines.append(heading + "{0:>7}".format(">" + ('%g' % self.BUCKETS_MS[-1])))
+        for name, (count, total, most, buckets) in self.tasks.items():
+            line = "{0:<12}{1:>8}{2:>10.3f}{3:>10.3f}{4:>10.3f}".format(
+                name[:11], count, total / count, most, total / 1000.0)
+            for bucket in buckets:
+                line += "{0:>7}".format(bucket)
+            lines.append(line)
+        return lines
+
+
 import argparse  # Command line argument parser
 parser = argparse.ArgumentParser()
 parser.add_argument('-f', '--fast', action='store_true')  # Fast startup
@@ -1213,6 +2209,7 @@ parser.add_argument('-s', '--silent', action='store_true')  # No info printing
 parser.add_argument('-v', '--verbose1', action='store_true')  # Print Overview
 parser.add_argument('-vv', '--verbose2', action='store_true')  # Print Functions
 parser.add_argument('-vvv', '--verbose3', action='store_true')  # Print Commands
+parser.add_argument('--profile-loop', action='store_true')  # Print LoopProfile()
 p_args = parser.parse_args()
 spamming = False  # 2025-08-11 undefined when at bottom
 last_spam_callback = None
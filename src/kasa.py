@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - TP-Link Kasa Smart Plug protocol
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       kasa.py - TP-Link Kasa Smart Plug HS100, HS103 and HS110 protocol
+#
+#       2026-10-18 - Replace hs100.sh (nc, base64, od) with Python sockets.
+#       2026-10-18 - discover() all plugs with one UDP broadcast.
+#       2026-10-18 - setRelayState() confirms relay_state in get_sysinfo.
+#
+# ==============================================================================
+
+"""
+    The Kasa "autokey" cipher XORs each byte with the previous cipher byte.
+    The first byte is XOR'd with 171. TCP messages on port 9999 have a four
+    byte big-endian length prefix. UDP messages have no length prefix.
+
+    Same payloads hs100.sh sends:
+
+        {"system":{"set_relay_state":{"state":1}}}  # hs100.sh on
+        {"system":{"set_relay_state":{"state":0}}}  # hs100.sh off
+        {"system":{"get_sysinfo":null}}             # hs100.sh check
+        {"emeter":{"get_realtime":null}}            # hs100.sh emeter
+
+    Several commands can be combined in one message. The reply dictionary
+    has one result for each command.
+"""
+
+import json  # Kasa messages are JSON
+from collections import OrderedDict  # set_relay_state before get_sysinfo
+import socket  # TCP client
+import struct  # Four byte message length prefix
+import threading  # WorkerPool() threads can share one KasaClient()
+import time  # Command duration
+
+PORT = 9999  # Kasa TCP and UDP port
+KEY = 171  # Kasa autokey cipher initial key
+TIMEOUT = 2.0  # Seconds to wait for connect, send and receive
+BROADCAST = "255.255.255.255"  # discover() address
+
+QUERY = {"system": {"get_sysinfo": None}}
+EMETER = {"emeter": {"get_realtime": None}}
+
+
+def encrypt(text):
+    """ Return JSON string as Kasa autokey cipher bytes (no length prefix) """
+    key = KEY
+    result = bytearray()
+    for char in bytearray(text.encode("utf-8")):
+        key = key ^ char
+        result.append(key)
+    return bytes(result)
+
+
+def decrypt(data):
+    """ Return Kasa autokey cipher bytes (no length prefix) as JSON string """
+    key = KEY
+    result = bytearray()
+    for char in bytearray(data):
+        result.append(key ^ char)
+        key = char
+    return result.decode("utf-8")
+
+
+class KasaError(Exception):
+    """ Plug didn't reply, closed the connection or reply isn't Kasa JSON """
+    pass
+
+
+class KasaClient(object):
+    """ TCP client for one Kasa smart plug.
+
+        The connection is kept open between requests. When the plug has
+        closed it (older firmware closes after each reply) the request is
+        sent again on a new connection.
+
+        host and port are arguments so a local fake plug server can be used.
+    """
+
+    def __init__(self, host, port=PORT, timeout=TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock = None  # Persistent connection
+        self.lock = threading.Lock()  # One request at a time on self.sock
+        self.duration = 0.0  # Seconds last request took
+
+    def connect(self):
+        """ Open new connection to plug with socket timeouts """
+        self.close()
+        self.sock = socket.create_connection((self.host, self.port), self.timeout)
+        self.sock.settimeout(self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def close(self):
+        """ Close connection. Next request opens a new one. """
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except socket.error:
+                pass
+            self.sock = None
+
+    def request(self, command):
+        """ Send command dictionary and return reply dictionary.
+            Raises KasaError when plug can't be reached or reply is invalid.
+        """
+        start = time.time()
+        text = json.dumps(command)
+        with self.lock:
+            reused = self.sock is not None
+            try:
+                try:
+                    if not reused:
+                        self.connect()
+                    reply = self.exchange(text)
+                except socket.timeout:
+                    raise  # Plug is off line, don't wait twice
+                except (socket.error, KasaError):
+                    if not reused:
+                        raise
+                    # Plug closed the kept open connection. Try once on new one
+                    self.connect()
+                    reply = self.exchange(text)
+            except socket.timeout:
+                self.close()
+                raise KasaError("Timeout after " + str(self.timeout) +
+                                " seconds: " + self.host)
+            except socket.error as err:
+                self.close()
+                raise KasaError(str(err) + ": " + self.host)
+            except KasaError:
+                self.close()
+                raise
+            finally:
+                self.duration = time.time() - start
+
+        try:
+            return json.loads(reply)
+        except ValueError:
+            raise KasaError("Reply is not JSON: " + self.host)
+
+    def exchange(self, text):
+        """ Send length prefixed message and receive length prefixed reply """
+        data = encrypt(text)
+        self.sock.sendall(struct.pack(">I", len(data)) + data)
+        header = self.receive(4)
+        length = struct.unpack(">I", header)[0]
+        if length > 65536:
+            raise KasaError("Reply length " + str(length) + " too large: " + self.host)
+        return decrypt(self.receive(length))
+
+    def receive(self, size):
+        """ Receive exactly size bytes """
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = self.sock.recv(min(remaining, 4096))
+            if not chunk:
+                raise KasaError("Connection closed by plug: " + self.host)
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def getSysinfo(self):
+        """ Return get_sysinfo dictionary """
+        reply = self.request(QUERY)
+        try:
+            return reply["system"]["get_sysinfo"]
+        except (KeyError, TypeError):
+            raise KasaError("No get_sysinfo in reply: " + self.host)
+
+    def getRelayState(self):
+        """ Return 1 when plug is on, 0 when off """
+        try:
+            return int(self.getSysinfo()["relay_state"])
+        except (KeyError, TypeError, ValueError):
+            raise KasaError("No relay_state in get_sysinfo: " + self.host)
+
+    def setRelayState(self, state):
+        """ Set relay_state and get_sysinfo in the same exchange.
+            Setting to current state is harmless so query isn't needed first.
+            Plug runs commands in order so get_sysinfo has the new relay_state.
+            Return relay_state when plug reports err_code 0 and relay switched.
+        """
+        system = OrderedDict([("set_relay_state", {"state": int(state)}),
+                              ("get_sysinfo", None)])  # Python 2 dict order
+        reply = self.request({"system": system})
+        try:
+            err_code = reply["system"]["set_relay_state"]["err_code"]
+        except (KeyError, TypeError):
+            raise KasaError("No set_relay_state in reply: " + self.host)
+        if err_code != 0:
+            raise KasaError("set_relay_state err_code " + str(err_code) +
+                            ": " + self.host)
+        try:
+            relay_state = int(reply["system"]["get_sysinfo"]["relay_state"])
+        except (KeyError, TypeError, ValueError):
+            raise KasaError("No relay_state in get_sysinfo: " + self.host)
+        if relay_state != int(state):
+            raise KasaError("relay_state is " + str(relay_state) + " after set " +
+                            str(int(state)) + ": " + self.host)
+        return relay_state
+
+    def getRealtime(self):
+        """ Return emeter get_realtime dictionary (HS110 only) """
+        reply = self.request(EMETER)
+        try:
+            realtime = reply["emeter"]["get_realtime"]
+        except (KeyError, TypeError):
+            raise KasaError("No emeter in reply: " + self.host)
+        if realtime.get("err_code", 0) != 0:
+            raise KasaError("emeter err_code " + str(realtime["err_code"]) +
+                            ": " + self.host)
+        return realtime
+
+
+def discover(window=0.5, address=BROADCAST, port=PORT):
+    """ Send one get_sysinfo UDP broadcast and collect every plug's reply.
+
+        Replies arriving within window seconds are returned regardless of
+        subnet size or arp cache. address and port are arguments so a local
+        UDP responder can be used.
+
+        :returns: {mac: {"ip", "mac", "alias", "relay_state", "sysinfo"}}
+            MAC address is lower case to match /proc/net/arp.
+    """
+    plugs = {}
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.sendto(encrypt(json.dumps(QUERY)), (address, port))
+        deadline = time.time() + window
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            sock.settimeout(remaining)
+            try:
+                data, (ip, _port) = sock.recvfrom(4096)
+            except socket.timeout:
+                break
+            try:
+                sysinfo = json.loads(decrypt(data))["system"]["get_sysinfo"]
+                mac = sysinfo.get("mac", sysinfo.get("mic_mac", ""))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue  # Not a Kasa device
+            mac = mac.lower()
+            if len(mac) == 12:  # Some firmware "50D4F7EB4135"
+                mac = ":".join(mac[i:i + 2] for i in range(0, 12, 2))
+            if len(mac) != 17:
+                continue
+            plugs[mac] = {"ip": ip, "mac": mac, "alias": sysinfo.get("alias", ""),
+                          "relay_state": sysinfo.get("relay_state"),
+                          "sysinfo": sysinfo}
+    except socket.error:
+        pass  # No network. Return plugs found so far.
+    finally:
+        sock.close()
+    return plugs
+
+
+# End of kasa.py
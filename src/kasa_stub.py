@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - kasa.py checks against a stub smart plug
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       kasa_stub.py - Check kasa.py without a TP-Link Kasa smart plug
+#
+#       2026-10-18 - KasaClient() relay state, keep-alive, retry and errors.
+#                    discover() UDP replies.
+#
+# ==============================================================================
+
+"""
+    Starts a stub Kasa smart plug on 127.0.0.1 and runs kasa.KasaClient()
+    against it. Then a stub UDP responder for kasa.discover():
+
+        python kasa_stub.py       # Prints each check. Exit code 1 on failure
+
+    The stub plug answers set_relay_state and get_sysinfo in the order they
+    are sent, like an HS100. Settings make it close the connection after
+    each reply (older firmware), keep the relay stuck or return an err_code.
+"""
+
+import json  # Kasa messages are JSON
+import socket  # Stub plug and unused port for connect error
+import struct  # Four byte message length prefix
+import sys
+import threading  # Stub plug thread
+import time  # Stub plug slow to reply
+
+import kasa
+
+MAC = "50:D4:F7:EB:41:35"  # Stub plug get_sysinfo "mac"
+
+failures = []  # Names of checks that failed
+
+
+def check(name, ok, detail=""):
+    """ Print check result and remember failures """
+    print("PASS" if ok else "FAIL", name, detail)
+    if not ok:
+        failures.append(name)
+
+
+def recvExact(conn, size):
+    """ Return size bytes from conn or None when closed """
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def reply(stub, text):
+    """ Return reply dictionary for decrypted command text """
+    result = {}
+    for module, commands in json.loads(text, object_pairs_hook=list):
+        result[module] = {}
+        for name, params in commands:
+            if name == "set_relay_state":
+                if stub["err_code"] == 0 and not stub["stuck"]:
+                    stub["relay_state"] = dict(params)["state"]
+                result[module][name] = {"err_code": stub["err_code"]}
+            elif name == "get_sysinfo":
+                result[module][name] = {"relay_state": stub["relay_state"],
+                                        "alias": "Stub Plug", "mac": MAC,
+                                        "err_code": 0}
+    return result
+
+
+def servePlug(conn, stub):
+    """ One KasaClient() connection to stub plug """
+    while True:
+        header = recvExact(conn, 4)
+        if header is None:
+            break
+        data = recvExact(conn, struct.unpack(">I", header)[0])
+        time.sleep(stub["delay"])
+        out = kasa.encrypt(json.dumps(reply(stub, kasa.decrypt(data))))
+        try:
+            conn.sendall(struct.pack(">I", len(out)) + out)
+        except socket.error:
+            break  # Client stopped waiting after "timeout" check
+        if stub["close_each"]:
+            break
+    conn.close()
+
+
+def startStub():
+    """ Return (listening socket, settings) of stub plug accepting in a thread """
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(5)
+    stub = {"relay_state": 0, "close_each": False, "stuck": False,
+            "err_code": 0, "delay": 0.0, "connections": 0}
+
+    def accept():
+        while True:
+            try:
+                conn = server.accept()[0]
+            except socket.error:
+                return  # Closed by checkClient()
+            stub["connections"] += 1
+            thread = threading.Thread(target=servePlug, args=(conn, stub))
+            thread.daemon = True
+            thread.start()
+
+    thread = threading.Thread(target=accept)
+    thread.daemon = True
+    thread.start()
+    return server, stub
+
+
+def unusedPort():
+    """ Port nothing listens on """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def checkClient():
+    """ KasaClient() against stub plug """
+    server, stub = startStub()
+    client = kasa.KasaClient("127.0.0.1", server.getsockname()[1], 1.0)
+
+    check("relay off", client.getRelayState() == 0)
+    check("set on", client.setRelayState(1) == 1)
+    check("relay on", client.getRelayState() == 1)
+    for _i in range(20):
+        client.getRelayState()
+    check("keep-alive", stub["connections"] == 1,
+          str(stub["connections"]) + " connections for 23 requests")
+
+    stub["close_each"] = True
+    stub["connections"] = 0
+    try:
+        for state in (0, 1, 0):
+            client.setRelayState(state)  # First uses kept open connection
+        check("retry closed connection", stub["connections"] == 2,
+              str(stub["connections"]) + " new connections")
+    except kasa.KasaError as err:
+        check("retry closed connection", False, str(err))
+    stub["close_each"] = False
+
+    stub["stuck"] = True
+    try:
+        client.setRelayState(1)
+        check("relay stuck", False, "No error")
+    except kasa.KasaError as err:
+        check("relay stuck", "relay_state is 0" in str(err), str(err))
+    stub["stuck"] = False
+
+    stub["err_code"] = -3
+    try:
+        client.setRelayState(1)
+        check("err_code", False, "No error")
+    except kasa.KasaError as err:
+        check("err_code", "err_code -3" in str(err), str(err))
+    stub["err_code"] = 0
+
+    stub["delay"] = 0.5
+    client.timeout = 0.1
+    client.close()  # New connection gets new timeout
+    try:
+        client.getRelayState()
+        check("timeout", False, "No error")
+    except kasa.KasaError as err:
+        check("timeout", str(err).startswith("Timeout"), str(err))
+    stub["delay"] = 0.0
+
+    try:
+        kasa.KasaClient("127.0.0.1", unusedPort(), 1.0).getSysinfo()
+        check("connect failed", False, "No error")
+    except kasa.KasaError as err:
+        check("connect failed", True, str(err))
+
+    client.close()
+    server.close()
+
+
+def checkDiscover():
+    """ discover() against stub UDP responder """
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    stub = {"relay_state": 1, "stuck": False, "err_code": 0}
+
+    def respond():
+        data, address = server.recvfrom(4096)
+        server.sendto(b"not kasa", address)  # Ignored
+        server.sendto(kasa.encrypt(json.dumps(reply(stub, kasa.decrypt(data)))),
+                      address)
+
+    thread = threading.Thread(target=respond)
+    thread.daemon = True
+    thread.start()
+    plugs = kasa.discover(0.5, "127.0.0.1", server.getsockname()[1])
+    plug = plugs.get(MAC.lower(), {})
+    check("discover", len(plugs) == 1 and plug.get("ip") == "127.0.0.1" and
+          plug.get("relay_state") == 1, str(plugs))
+    server.close()
+
+
+def main():
+    checkClient()
+    checkDiscover()
+    print(len(failures), "failed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# End of kasa_stub.py
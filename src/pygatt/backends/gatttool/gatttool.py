@@ -3,6 +3,7 @@
     2025-01-07 - Fix typos
     2025-01-25 - Record pexpect.TIMEOUT not defined error during system resume
     2025-01-30 - char_write_handle(timeout=30) too extreme. Use timeout=1 & retry
+    2026-10-18 - GATTToolReceiver one compiled regex and dispatch table
 """
 
 from __future__ import print_function
@@ -35,6 +36,8 @@ from .device import GATTToolBLEDevice
 #gatttool.py .device: <class 'pygatt.backends.gatttool.device.GATTToolBLEDevice'>
 
 DEFAULT_RECONNECT_DELAY = 1.0
+RECEIVE_CHUNK = 8192  # GATTToolReceiver bytes read at once
+RECEIVE_LIMIT = 65536  # Unmatched gatttool output kept for next read
 
 log = logging.getLogger(__name__)
 
@@ -131,19 +134,67 @@ class GATTToolReceiver(threading.Thread):
             event["match"] = None
             event["callback"] = []
 
-    def run(self):
+    def compile(self):
+        """ 2026-10-18 Combine every event pattern into one regex.
+
+            Each pattern becomes a named group "e0", "e1", ... in the same
+            sorted order pexpect.expect() used. At any position the first
+            pattern that matches wins, the same tie break pexpect used.
+            Patterns with their own groups (discover, mtu) keep a compiled
+            copy so event["match"].group(n) numbers don't change.
+
+            Patterns starting with ".*" (disconnected) are tried at every
+            position to the end of the buffer. A second regex without them
+            is used when their text isn't in the buffer at all.
+
+            :returns: (combined regex, regex without ".*" patterns,
+                       regex for text after ".*" or None,
+                       {group name: (event, regex or None)})
+        """
         items = sorted(itertools.chain.from_iterable(
             [[(pattern, event)
               for pattern in event["patterns"]]
-             for event in self._event_vector.values()])
+             for event in self._event_vector.values()]),
+            key=lambda item: item[0]
         )
-        patterns = [item[0] for item in items]
-        events = [item[1] for item in items]
+        alternatives = []
+        fast = []  # alternatives without ".*" patterns
+        tails = []  # ".*" patterns without ".*"
+        dispatch = {}
+        for i, (pattern, event) in enumerate(items):
+            name = "e" + str(i)
+            alternatives.append("(?P<" + name + ">" + pattern + ")")
+            if pattern.startswith(".*"):
+                tails.append(pattern[2:])
+            else:
+                fast.append(alternatives[-1])
+            single = re.compile(pattern.encode("ascii"), re.DOTALL)
+            dispatch[name] = (event, single if single.groups else None)
+
+        def build(parts):
+            return re.compile("|".join(parts).encode("ascii"), re.DOTALL)
+
+        return build(alternatives), build(fast), \
+            build(tails) if tails else None, dispatch
+
+    def run(self):
+        """ Read gatttool output in chunks and dispatch every event found.
+
+            2026-10-18 pexpect.expect() searched the buffer once for each
+            pattern and returned one event per call. Now one pass of the
+            combined regex finds all events in the chunk. Searching resumes
+            where the last event ended and consumed text is discarded.
+        """
+        combined, fast, tails, dispatch = self.compile()
+        limit = self._connection.searchwindowsize or RECEIVE_LIMIT
+        buffer = self._connection.buffer  # Left over by start() expect()
+        self._connection.buffer = buffer[:0]
 
         log.info('Running...')
         while self._parent_aliveness.is_set():
             try:
-                event_index = self._connection.expect(patterns, timeout=.5)
+                chunk = self._connection.read_nonblocking(RECEIVE_CHUNK,
+                                                          timeout=.5)
             except pexpect.TIMEOUT:
                 ''' 2025-01-25 first time error occurred after a month of usage:
         Exception in thread Thread-3 (most likely raised during interpreter shutdown):
@@ -156,13 +207,23 @@ class GATTToolReceiver(threading.Thread):
             except (NotConnectedError, pexpect.EOF):
                 self._event_vector["disconnected"]["event"].set()
                 break
-            event = events[event_index]
-            event["before"] = self._connection.before
-            event["after"] = self._connection.after
-            event["match"] = self._connection.match
-            event["event"].set()
-            for clb in event["callback"]:
-                clb(event)
+
+            buffer += chunk
+            consumed = 0
+            regex = combined if tails and tails.search(buffer) else fast
+            for found in regex.finditer(buffer):
+                event, single = dispatch[found.lastgroup]
+                event["before"] = buffer[consumed:found.start()]
+                event["after"] = found.group()
+                event["match"] = found if single is None else \
+                    single.match(buffer, found.start())
+                consumed = found.end()
+                event["event"].set()
+                for clb in event["callback"]:
+                    clb(event)
+            buffer = buffer[consumed:]
+            if len(buffer) > limit:
+                buffer = buffer[-limit:]  # Same as pexpect searchwindowsize
         log.info("Listener thread finished")
 
     def clear(self, event):
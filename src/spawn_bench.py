@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - Command spawn latency benchmark
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+from __future__ import division  # integer division results in float
+
+# ==============================================================================
+#
+#       spawn_bench.py - Compare forking HomA with cmd_runner.py helper
+#
+#       2026-10-18 - Same commands through sp.Popen() and cr.Runner().
+#
+# ==============================================================================
+
+"""
+    Measures milliseconds runCommand() waits for a short command when:
+
+        fork   - sp.Popen() forks this process, like runCommand() did before
+                 2026-10-18.
+        runner - cmd_runner.py helper process spawns the command.
+
+    HomA is large after Tk, PIL and numpy load. Fork cost grows with the
+    memory being copied, so this process first grows to --megabytes:
+
+        python spawn_bench.py               # 300 MB, 200 runs of `true`
+        python spawn_bench.py -m 1000 -n 500
+"""
+
+import argparse  # --megabytes, --count
+import subprocess as sp  # Fork
+import time  # Latency
+
+import cmd_runner as cr
+
+
+def rss_mb():
+    """ Resident memory of this process in MB from /proc """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except IOError:
+        pass
+    return 0.0
+
+
+def measure(start, command, count):
+    """ Run command count times. Return sorted milliseconds. """
+    times = []
+    for _i in range(count):
+        begin = time.time()
+        pipe = start(command)
+        pipe.communicate()
+        times.append((time.time() - begin) * 1000.0)
+    return sorted(times)
+
+
+def report(name, times):
+    print("{0:<8} {1:>9.3f} {2:>9.3f} {3:>9.3f} {4:>9.3f}".format(
+        name, sum(times) / len(times), times[len(times) // 2],
+        times[int(len(times) * 0.95) - 1], times[-1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare forking HomA with cmd_runner.py helper")
+    parser.add_argument("-m", "--megabytes", type=int, default=300,
+                        help="Grow this process to look like HomA")
+    parser.add_argument("-n", "--count", type=int, default=200,
+                        help="Times to run command")
+    parser.add_argument("command", nargs="*", default=["true"],
+                        help="Command to run (default: true)")
+    args = parser.parse_args()
+
+    runner = cr.Runner()
+    ballast = bytearray(args.megabytes * 1024 * 1024)
+    for i in range(0, len(ballast), 4096):
+        ballast[i] = 1  # Touch every page so it is resident
+    print("Process RSS: {0:.0f} MB. Command: {1}".format(
+        rss_mb(), " ".join(args.command)))
+
+    def fork(command):
+        return sp.Popen(command, stdout=sp.PIPE, stderr=sp.PIPE)
+
+    print("{0:<8} {1:>9} {2:>9} {3:>9} {4:>9}".format(
+        "spawn", "mean ms", "p50 ms", "p95 ms", "max ms"))
+    report("fork", measure(fork, args.command, args.count))
+    report("runner", measure(runner.popen, args.command, args.count))
+    runner.close()
+
+
+if __name__ == "__main__":
+    main()
+
+# End of spawn_bench.py
@@ -33,6 +33,7 @@ from __future__ import with_statement       # Error handling for file opens
 #       Feb. 05 2025 - Create Tooltips().zap_tip_window() call before suspend
 #       June 14 2025 - Create VolumeMeters() ported from mserve for use in HomA
 #       Apr. 19 2026 - Create class Tot "Thing of Things" ported from mmm.py
+#       Oct. 18 2026 - Tooltips().tips_busy() and wake_callback for HomA jobs
 #
 #==============================================================================
 
@@ -5793,6 +5794,7 @@ class ToolTips(CommonTip):
 
         self.log_nt = None              # namedtuple time, action, widget, x, y
         self.log_list = []              # list of log dictionaries
+        self.wake_callback = None       # Called when event logged (HomA)
         self.deleted_str = "0.0.0"      # flag log entry as deleted (zero time)
         self.now = time.time()          # Current time
         self.who = "toolkit.py ToolTips()."
@@ -5912,6 +5914,8 @@ class ToolTips(CommonTip):
         #    print("log_event(self, action, widget)", action, str(widget)[-4:])
         self.log_list.append(self.log_nt)
         # print('EVENT:', self.log_nt)
+        if self.wake_callback:
+            self.wake_callback()  # Caller's poll_tips() may be sleeping
 
     def process_log_list(self):
         """ Process log list backwards deleting earlier matching widget events """
@@ -6233,6 +6237,18 @@ class ToolTips(CommonTip):
                                    outline=self.normal_button_color)
             self.widget.itemconfig("text_color", fill=self.normal_text_color)
 
+    def tips_busy(self):
+        """ Return True when events are logged or a tip is waiting to be
+            visible, visible or fading. Otherwise poll_tips() has nothing to
+            do until log_event() is called.
+        """
+        if self.log_list:
+            return True
+        for tip in self.tips_list:
+            if tip['enter_time'] != 0.0 or tip['tip_window']:
+                return True
+        return False
+
     # noinspection PyUnusedLocal
     def poll_tips(self):
         """ Check for fading in new tooltip and/or fading out current tooltip """
@@ -2,6 +2,8 @@
     Pippim modifications for HomA:
     2025-01-07 SyntaxError commented out and replaced
     2025-01-10 Add hci_device="hci0" default that can be changed by caller
+    2026-10-18 ColorQueue() latest-wins write commands with periodic acks
+    2026-10-18 backend="bgapi" uses BLED112 dongle instead of gatttool
 """
 
 from __future__ import print_function
@@ -9,16 +11,20 @@ from __future__ import print_function
 import pygatt
 import logging
 import pygatt.exceptions 
+import threading
+import time
 
 #print("\n trionesControl.py - pygatt", pygatt.exceptions.__file__)
 #trionesControl.py - pygatt /home/rick/HomA/pygatt/exceptions.pyc
 
 MAIN_CHARACTERISTIC_UUID = "0000ffd9-0000-1000-8000-00805f9b34fb"
+BACKENDS = ("gatttool", "bgapi")  # connect() backend choices
 
 log = logging.getLogger(__name__)
 
 
-def connect(MAC, hci_device="hci0", reset_on_start=True):
+def connect(MAC, hci_device="hci0", reset_on_start=True, backend="gatttool",
+            serial_port=None):
     """
     Create and start a new backend adapter and connect it to a device.
 
@@ -31,7 +37,17 @@ def connect(MAC, hci_device="hci0", reset_on_start=True):
     :param bool reset_on_start: Perhaps due to a bug in gatttool or pygatt,
         but if the bluez backend isn't restarted, it can sometimes lock up
         the computer when trying to make a connection to HCI device.
+    :param string backend: Added 2026-10-18 "gatttool" drives the gatttool CLI
+        through pexpect. "bgapi" talks binary BGAPI packets to a BLED112 USB
+        dongle over its serial port. No gatttool process to parse or kill.
+    :param string serial_port: BLED112 port E.G. "/dev/ttyACM0". None = detect.
     """
+    if backend == "bgapi":
+        return connectBgapi(MAC, serial_port, reset_on_start)
+    if backend != "gatttool":
+        raise pygatt.exceptions.NotConnectedError(
+            "Unknown Bluetooth backend: '" + str(backend) + "'")
+
     adapter = pygatt.GATTToolBackend(hci_device=hci_device)  # Create instance
     try:
         adapter.start(reset_on_start=reset_on_start)
@@ -59,12 +75,37 @@ def connect(MAC, hci_device="hci0", reset_on_start=True):
     return device
 
 
+def connectBgapi(MAC, serial_port=None, reset_on_start=True):
+    """ Start BGAPI backend on BLED112 dongle and connect it to a device.
+        Same exceptions as connect() so callers don't change.
+    """
+    adapter = pygatt.BGAPIBackend(serial_port=serial_port)
+    try:
+        adapter.start(reset=reset_on_start)
+    except pygatt.exceptions.BLEError as err:  # BGAPIError, no dongle found
+        raise pygatt.exceptions.NotConnectedError(
+            "BLED112 on port: '" + str(serial_port) + "' cannot start! " + str(err))
+    try:
+        device = adapter.connect(MAC)
+    except pygatt.exceptions.BLEError:
+        adapter.stop()  # Release serial port for next attempt
+        raise pygatt.exceptions.NotConnectedError(
+            "Device MAC: '" + MAC + "' not connected!")
+    log.info("Device connected")
+    return device
+
+
 def disconnect(device):
     """ Disconnect Bluetooth """
     try:
         device.disconnect()
     except pygatt.exceptions.NotConnectedError:
         raise pygatt.exceptions.NotConnectedError("Device not connected!")
+    finally:
+        # 2026-10-18 BGAPI adapter owns the serial port and a receiver thread
+        adapter = getattr(device, "_backend", None)
+        if isinstance(adapter, pygatt.BGAPIBackend):
+            adapter.stop()
     log.info("Device disconnected")
 
 
@@ -234,3 +275,115 @@ def setBuiltIn(mode, speed, device, wait_for_response=False):
     except pygatt.exceptions.NotConnectedError:
         raise pygatt.exceptions.NotConnectedError("Device not connected!")
     log.info("Default mode %d set -- Speed %d", mode, speed)
+
+
+class ColorQueue(object):
+    """ Send setRGB() colors from a thread using GATT write commands.
+
+        put() never waits. When the link is slower than the caller, colors
+        not yet sent are replaced by the newest one (latest wins).
+
+        A write command has no reply, so every ack_seconds one color is sent
+        as a write request instead to prove the device is still connected.
+        A failed write is kept in self.error for the caller to take_error() and
+        reconnect. Colors put() after an error are dropped until then.
+
+        queue = ColorQueue(device)
+        queue.put(30, 0, 0)  # Returns immediately
+        err = queue.take_error()  # None or pygatt exception
+        queue.close()  # Waits for write in progress. Discards pending color.
+    """
+
+    def __init__(self, device, ack_seconds=5.0, min_interval=0.04):
+        """
+        :param device: pygatt device from connect()
+        :param float ack_seconds: seconds between acknowledged writes
+        :param float min_interval: seconds between writes. 0.04 = 25 per second
+        """
+        self.device = device
+        self.ack_seconds = ack_seconds
+        self.min_interval = min_interval
+        self.pending = None  # (r, g, b) waiting to be sent
+        self.error = None  # Exception from last failed write
+        self.closed = False
+        self.cond = threading.Condition()
+        self.last_write = 0.0  # time.time() of last write
+        self.last_ack = 0.0  # time.time() of last acknowledged write
+        self.stats = {"write_ms": 0, "write_cnt": 0, "write_low": 0,
+                      "write_high": 0, "ack_cnt": 0, "drop_cnt": 0}
+        self.thread = threading.Thread(target=self.worker, name="color-queue")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def put(self, r, g, b):
+        """ Queue color. Replaces color not yet sent. """
+        with self.cond:
+            if self.pending is not None or self.error is not None:
+                self.stats["drop_cnt"] += 1  # Superseded or link is down
+            if self.error is None:
+                self.pending = (r, g, b)
+                self.cond.notify()
+
+    def take_error(self):
+        """ Return exception from failed write and start sending again """
+        with self.cond:
+            error, self.error = self.error, None
+            if error is not None:
+                self.last_ack = 0.0  # Next write after reconnect is acknowledged
+            return error
+
+    def set_device(self, device):
+        """ Use new device after caller reconnects """
+        with self.cond:
+            self.device = device
+            self.last_ack = 0.0
+
+    def worker(self):
+        """ Send newest color. Pause min_interval between writes. """
+        while True:
+            with self.cond:
+                while self.pending is None and not self.closed:
+                    self.cond.wait()
+                if self.closed:
+                    return
+                wait = self.last_write + self.min_interval - time.time()
+                if wait > 0:
+                    self.cond.wait(wait)  # put() may replace color meanwhile
+                    continue
+                (r, g, b), self.pending = self.pending, None
+                device = self.device
+                ack = time.time() - self.last_ack >= self.ack_seconds
+
+            start = time.time()
+            error = None
+            try:
+                setRGB(r, g, b, device, wait_for_response=ack)
+            except (pygatt.exceptions.NotConnectedError, AttributeError,
+                    pygatt.exceptions.NotificationTimeout) as err:
+                error = err
+            end = time.time()
+
+            with self.cond:
+                self.last_write = end
+                if error is not None:
+                    self.error = error
+                    self.pending = None
+                    continue
+                if ack:
+                    self.last_ack = end
+                    self.stats["ack_cnt"] += 1
+                write_ms = int((end - start) * 1000.0)
+                self.stats["write_ms"] += write_ms
+                self.stats["write_cnt"] += 1
+                if self.stats["write_cnt"] == 1:
+                    self.stats["write_low"] = self.stats["write_high"] = write_ms
+                self.stats["write_low"] = min(self.stats["write_low"], write_ms)
+                self.stats["write_high"] = max(self.stats["write_high"], write_ms)
+
+    def close(self, timeout=2.0):
+        """ Stop thread after write in progress. Pending color is discarded. """
+        with self.cond:
+            self.closed = True
+            self.pending = None
+            self.cond.notify()
+        self.thread.join(timeout)
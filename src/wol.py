@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - Wake-on-LAN magic packets
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       wol.py - Wake-on-LAN magic packet sender replaces `wakeonlan`
+#
+#       2026-10-18 - UDP broadcast bursts on a retry schedule in a thread.
+#
+# ==============================================================================
+
+"""
+    A magic packet is 6 bytes of 0xFF followed by the 6 byte MAC address
+    repeated 16 times. It is sent as a UDP broadcast to port 9, the same as
+    `wakeonlan <mac>`.
+
+    Packets get lost while a TV's network chip is half asleep, so a burst
+    of packets is sent at each time in a schedule:
+
+        waker = WakeOnLan(mac, schedule=[0.0, 1.0, 2.0, 4.0, 8.0], burst=3)
+        waker.start()  # Returns immediately
+        # ... reconnect to device ...
+        waker.stop()  # Device answered, don't send rest of schedule
+"""
+
+import binascii  # MAC address hex digits to bytes
+import socket  # UDP broadcast
+import threading  # WakeOnLan() sends schedule in background
+import time  # Schedule times
+
+BROADCAST = "255.255.255.255"  # Same as `wakeonlan` default
+PORT = 9  # Discard port. Same as `wakeonlan` default
+SCHEDULE = [0.0, 1.0, 2.0, 4.0, 8.0, 16.0]  # Seconds after start() to send
+BURST = 3  # Packets sent each time
+
+
+def magicPacket(mac):
+    """ Return magic packet bytes for "c0:79:82:41:2f:1f" or "c079-8241-2f1f" """
+    digits = "".join(char for char in mac if char not in ":-.")
+    if len(digits) != 12:
+        raise ValueError("Invalid MAC address: " + mac)
+    try:
+        return b"\xff" * 6 + binascii.unhexlify(digits) * 16
+    except (TypeError, ValueError):  # Python 2 TypeError, Python 3 ValueError
+        raise ValueError("Invalid MAC address: " + mac)
+
+
+def send(mac, count=1, address=BROADCAST, port=PORT):
+    """ Send count magic packets. Return number sent.
+        address and port are arguments so a local socket can capture them.
+    """
+    packet = magicPacket(mac)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sent = 0
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        for _i in range(count):
+            sock.sendto(packet, (address, port))
+            sent += 1
+    except socket.error:
+        pass  # No network. Caller sees fewer packets sent.
+    finally:
+        sock.close()
+    return sent
+
+
+class WakeOnLan(object):
+    """ Send bursts of magic packets on a schedule in a daemon thread until
+        the schedule ends or stop() is called.
+    """
+
+    def __init__(self, mac, schedule=None, burst=BURST, address=BROADCAST,
+                 port=PORT):
+        self.mac = mac
+        self.schedule = sorted(SCHEDULE if schedule is None else schedule)
+        self.burst = burst
+        self.address = address
+        self.port = port
+        self.sent = 0  # Packets sent so far
+        self.stopped = threading.Event()
+        self.thread = None
+        magicPacket(mac)  # Raise ValueError now instead of in thread
+
+    def start(self):
+        """ Send first burst in background thread and return """
+        self.thread = threading.Thread(target=self.worker, name="wakeonlan")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def worker(self):
+        """ Sleep until each scheduled time then send a burst """
+        start = time.time()
+        for offset in self.schedule:
+            if self.stopped.wait(max(start + offset - time.time(), 0.0)):
+                return  # self.stop()
+            self.sent += send(self.mac, self.burst, self.address, self.port)
+
+    def done(self):
+        """ Return True when schedule finished or stopped """
+        return self.thread is None or not self.thread.is_alive()
+
+    def stop(self):
+        """ Don't send any more bursts """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(1.0)
+
+    def duration(self):
+        """ Seconds from start() to last burst """
+        return self.schedule[-1] if self.schedule else 0.0
+
+
+# End of wol.py
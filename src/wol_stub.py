@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Author: Pippim
+License: GNU GPLv3
+Source: This repository
+Description: HomA - Home Automation - wol.py checks against a local socket
+"""
+
+from __future__ import print_function  # Must be first import
+from __future__ import with_statement  # Error handling for file opens
+
+# ==============================================================================
+#
+#       wol_stub.py - Check wol.py without waking a device
+#
+#       2026-10-18 - WakeOnLan() bursts, packet bytes, bad MAC and stop().
+#
+# ==============================================================================
+
+"""
+    Binds a UDP socket on 127.0.0.1 and captures the magic packets that
+    wol.WakeOnLan() sends to it instead of the broadcast address:
+
+        python wol_stub.py       # Prints each check. Exit code 1 on failure
+"""
+
+import socket  # Capture packets
+import sys
+import time  # Wait for schedule
+
+import wol
+
+MAC = "c0:79:82:41:2f:1f"  # Any MAC address. Nothing is woken.
+
+failures = []  # Names of checks that failed
+
+
+def check(name, ok, detail=""):
+    """ Print check result and remember failures """
+    print("PASS" if ok else "FAIL", name, detail)
+    if not ok:
+        failures.append(name)
+
+
+def capture(sock, wait):
+    """ Return packets received on sock within wait seconds """
+    packets = []
+    deadline = time.time() + wait
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        sock.settimeout(remaining)
+        try:
+            packets.append(sock.recvfrom(1024)[0])
+        except socket.timeout:
+            break
+    return packets
+
+
+def checkWakeOnLan(mac):
+    """ WakeOnLan() sends burst at each schedule time to local socket """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+    waker = wol.WakeOnLan(mac, [0.0, 0.2], burst=2, address="127.0.0.1",
+                          port=port)
+    waker.start()
+    packets = capture(sock, 0.6)
+    check("packet count " + mac, len(packets) == 4 and waker.sent == 4,
+          str(len(packets)) + " packets")
+    check("packet bytes " + mac, packets and len(packets[0]) == 102 and
+          all(packet == wol.magicPacket(MAC) for packet in packets))
+    check("schedule done " + mac, waker.done())
+
+    waker = wol.WakeOnLan(mac, [0.0, 0.3, 0.6], burst=2, address="127.0.0.1",
+                          port=port)
+    waker.start()
+    time.sleep(0.1)
+    waker.stop()
+    packets = capture(sock, 0.8)
+    check("stop " + mac, len(packets) == 2 and waker.done(),
+          str(len(packets)) + " packets")
+    sock.close()
+
+
+def main():
+    checkWakeOnLan(MAC)
+    checkWakeOnLan(MAC.replace(":", "-"))
+    for bad in ("c0:79:82:41:2f", "c0:79:82:41:2f:zz"):
+        try:
+            wol.WakeOnLan(bad)
+            check("bad MAC " + bad, False, "No error")
+        except ValueError as err:
+            check("bad MAC " + bad, True, str(err))
+    print(len(failures), "failed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# End of wol_stub.py